@@ -0,0 +1,237 @@
+import asyncio
+import logging
+from functools import partial
+from typing import Callable, Optional
+
+from solana.rpc.types import TxOpts
+
+from solders.hash import Hash  # type: ignore
+from solders.keypair import Keypair  # type: ignore
+
+from config import async_client, payer_keypair, AUTO_COMPUTE_UNITS, DYNAMIC_PRIORITY_FEE, PERSISTENT_WSOL
+from blockhash_cache import blockhash_cache
+from pool_cache import pool_state_cache
+from constants import *
+from common_utils import async_confirm_txn, async_get_token_accounts
+from pool_utils import *
+from swap_instructions import build_unwrap_instructions, build_wrap_instructions, get_fee_pcts
+from compute_profile import compute_profiler
+from fee_oracle import fee_oracle
+from swap_template import SwapTemplate, get_swap_template, sign_instructions
+from spans import traced, tracer
+from wsol_account import WsolAccount, get_wsol_account
+
+logger = logging.getLogger(__name__)
+
+rent_exempt_lamports: Optional[int] = None
+
+async def async_get_rent_exempt_lamports() -> int:
+    global rent_exempt_lamports
+    if rent_exempt_lamports is None:
+        response = await async_client.get_minimum_balance_for_rent_exemption(ACCOUNT_SPACE)
+        rent_exempt_lamports = response.value
+    return rent_exempt_lamports
+
+async def async_wsol_account_open(wsol_account: WsolAccount) -> bool:
+    if wsol_account.opened is None:
+        await wsol_account.async_refresh()
+    return wsol_account.opened
+
+@traced("fetch")
+async def prefetch(pool_str: str, payer: Keypair = payer_keypair) -> tuple:
+    pool_state, token_accounts, balance_needed, _ = await asyncio.gather(
+        pool_state_cache.async_get(pool_str),
+        async_get_token_accounts(payer.pubkey()),
+        async_wsol_account_open(get_wsol_account(payer)) if PERSISTENT_WSOL else async_get_rent_exempt_lamports(),
+        blockhash_cache.async_get(),
+    )
+    return pool_state, token_accounts, balance_needed
+
+async def send_and_confirm(sign_transaction: Callable[[Hash], tuple], max_rebuilds: int = 2) -> bool:
+    for _ in range(max_rebuilds + 1):
+        blockhash, last_valid_block_height = await blockhash_cache.async_get()
+
+        with tracer.span("sign"):
+            txn, _ = sign_transaction(blockhash)
+
+        with tracer.span("send"):
+            txn_sig = (await async_client.send_raw_transaction(txn, opts=TxOpts(skip_preflight=False))).value
+        logger.info("Transaction Signature: %s", txn_sig)
+
+        with tracer.span("confirm"):
+            confirmed = await async_confirm_txn(txn_sig, last_valid_block_height=last_valid_block_height)
+        if confirmed is not None:
+            logger.info("Transaction confirmed: %s", confirmed)
+            return confirmed
+
+        if not await blockhash_cache.async_wait_for_expiry(last_valid_block_height):
+            break
+
+        status = (await async_client.get_signature_statuses([txn_sig], search_transaction_history=True)).value[0]
+        if status is not None:
+            logger.info("Transaction confirmed: %s", status.err is None)
+            return status.err is None
+
+        logger.warning("Blockhash expired before the transaction landed, rebuilding...")
+
+    logger.info("Transaction confirmed: None")
+    return None
+
+async def send_template(template: SwapTemplate, amount: int, other_amount_threshold: int, lamports: int) -> bool:
+    unit_price = fee_oracle.get(template.pool, accounts=template.fee_accounts) if DYNAMIC_PRIORITY_FEE else None
+    sign_transaction = partial(template.sign, amount, other_amount_threshold, lamports, unit_price=unit_price)
+    if AUTO_COMPUTE_UNITS:
+        blockhash, _ = await blockhash_cache.async_get()
+        with tracer.span("simulate"):
+            await compute_profiler.async_ensure(template, sign_transaction, blockhash)
+    return await send_and_confirm(sign_transaction)
+
+async def async_wrap_sol(sol_amount: float = 0, payer: Keypair = payer_keypair) -> bool:
+    lamports = int(sol_amount * 1e9)
+    confirmed = await send_and_confirm(partial(sign_instructions, build_wrap_instructions(lamports, payer), payer=payer))
+    get_wsol_account(payer).settle(confirmed, credit=lamports)
+    return confirmed
+
+async def async_unwrap_sol(payer: Keypair = payer_keypair) -> bool:
+    confirmed = await send_and_confirm(partial(sign_instructions, build_unwrap_instructions(payer), payer=payer))
+    get_wsol_account(payer).settle_unwrap(confirmed)
+    return confirmed
+
+@traced("trade")
+async def async_buy(pool_str: str, sol_in: float = 0.1, slippage: int = 5, payer: Keypair = payer_keypair) -> bool:
+    try:
+        logger.info("Starting buy transaction for pool: %s", pool_str)
+
+        pool_state, token_accounts, balance_needed = await prefetch(pool_str, payer)
+
+        if pool_state is None:
+            logger.warning("No pool state found, aborting transaction.")
+            return False
+
+        if pool_state.status != 0:
+            logger.warning("This pool is no longer tradable on Launch Lab - it has migrated to Raydium CPMM...")
+            return False
+
+        if pool_state.global_config != GLOBAL_CONFIG:
+            logger.warning("Only Constant Product Curve is supported at this time...")
+            return False
+
+        token_decimal = 10 ** pool_state.base_decimals
+        slippage_adjustment = 1 - (slippage / 100)
+        amount_in = int(sol_in * 1e9)
+
+        protocol_fee_pct, platform_fee_pct = get_fee_pcts(pool_state)
+
+        with tracer.span("quote"):
+            raw_amount_out = constant_product_buy_exact_in(
+                pool_state.virtual_base,
+                pool_state.virtual_quote,
+                pool_state.real_base,
+                pool_state.real_quote,
+                amount_in,
+                protocol_fee_pct,
+                platform_fee_pct,
+                0
+            )
+
+        minimum_amount_out = int(raw_amount_out * slippage_adjustment)
+        logger.info("Minimum amount out (after %s%% slippage): %s", slippage, minimum_amount_out / token_decimal)
+
+        token_account, _ = token_accounts.get(pool_state.base_mint, (None, 0))
+
+        if not PERSISTENT_WSOL:
+            with tracer.span("build"):
+                template = get_swap_template(pool_state, BUY_EXACT_IN, token_account, payer=payer)
+            return await send_template(template, amount_in, minimum_amount_out, balance_needed + amount_in)
+
+        wsol_account = get_wsol_account(payer)
+        if not wsol_account.opened and not await async_wrap_sol(payer=payer):
+            logger.warning("Could not open the WSOL account, aborting transaction.")
+            return False
+
+        top_up = await wsol_account.async_reserve(amount_in)
+        confirmed = None
+        try:
+            with tracer.span("build"):
+                template = get_swap_template(
+                    pool_state, BUY_EXACT_IN, token_account, payer=payer, persistent_wsol=True, top_up=top_up > 0
+                )
+            confirmed = await send_template(template, amount_in, minimum_amount_out, top_up)
+        finally:
+            wsol_account.settle(confirmed, refund=amount_in - top_up, reserved=True)
+        return confirmed
+    except Exception as e:
+        logger.error("Error occurred during transaction: %s", e)
+        return False
+
+@traced("trade")
+async def async_sell(pool_str: str, percentage: int = 100, slippage: int = 5, payer: Keypair = payer_keypair) -> bool:
+    try:
+        logger.info("Starting sell transaction for pool: %s", pool_str)
+
+        if not (1 <= percentage <= 100):
+            logger.warning("Percentage must be between 1 and 100.")
+            return False
+
+        pool_state, token_accounts, balance_needed = await prefetch(pool_str, payer)
+
+        if pool_state is None:
+            logger.warning("No pool state found, aborting transaction.")
+            return False
+
+        if pool_state.status != 0:
+            logger.warning("This pool is no longer tradable on Launch Lab - it has migrated to Raydium CPMM...")
+            return False
+
+        if pool_state.global_config != GLOBAL_CONFIG:
+            logger.warning("Only Constant Product Curve is supported at this time...")
+            return False
+
+        _, token_balance = token_accounts.get(pool_state.base_mint, (None, 0))
+        if not token_balance:
+            logger.warning("Token balance is zero. Nothing to sell.")
+            return False
+
+        slippage_adjustment = 1 - (slippage / 100)
+        amount_in = int(token_balance * (percentage / 100))
+
+        protocol_fee_pct, platform_fee_pct = get_fee_pcts(pool_state)
+
+        with tracer.span("quote"):
+            raw_amount_out = constant_product_sell_exact_in(
+                pool_state.virtual_base,
+                pool_state.virtual_quote,
+                pool_state.real_base,
+                pool_state.real_quote,
+                amount_in,
+                protocol_fee_pct,
+                platform_fee_pct,
+                0
+            )
+
+        min_amount_out = int(raw_amount_out * slippage_adjustment)
+        logger.info("Minimum quote out (after %s%% slippage): %s", slippage, min_amount_out / 1e9)
+
+        if not PERSISTENT_WSOL:
+            with tracer.span("build"):
+                template = get_swap_template(
+                    pool_state, SELL_EXACT_IN, close_token_account=percentage == 100, payer=payer
+                )
+            return await send_template(template, amount_in, min_amount_out, balance_needed)
+
+        wsol_account = get_wsol_account(payer)
+        if not wsol_account.opened and not await async_wrap_sol(payer=payer):
+            logger.warning("Could not open the WSOL account, aborting transaction.")
+            return False
+
+        with tracer.span("build"):
+            template = get_swap_template(
+                pool_state, SELL_EXACT_IN, close_token_account=percentage == 100, payer=payer, persistent_wsol=True
+            )
+
+        confirmed = await send_template(template, amount_in, min_amount_out, 0)
+        wsol_account.settle(confirmed, credit=min_amount_out)
+        return confirmed
+    except Exception as e:
+        logger.error("Error occurred during transaction: %s", e)
+        return False
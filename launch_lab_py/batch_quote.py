@@ -0,0 +1,81 @@
+import numpy as np
+
+# Lanes inside these bounds are computed with a float64 estimate plus an exact
+# wrapping-int64 remainder correction; everything else takes the exact path.
+MAX_FLOAT_EXACT = 1 << 53
+MAX_QUOTIENT = 1 << 52
+MAX_DIVISOR = 1 << 61
+
+def as_int64(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.int64)
+
+def mul_div_floor(a, b, c) -> np.ndarray:
+    a, b, c = np.broadcast_arrays(*np.atleast_1d(as_int64(a), as_int64(b), as_int64(c)))
+
+    fast = (
+        (a >= 0) & (a < MAX_FLOAT_EXACT)
+        & (b >= 0) & (b < MAX_FLOAT_EXACT)
+        & (c > 0) & (c < MAX_DIVISOR)
+    )
+    estimate = np.floor(a.astype(np.float64) * b.astype(np.float64) / np.where(fast, c, 1).astype(np.float64))
+    fast &= estimate < MAX_QUOTIENT
+
+    q = np.where(fast, estimate, 0).astype(np.int64)
+    ua, ub, uc = a.view(np.uint64), b.view(np.uint64), c.view(np.uint64)
+    r = (ua * ub - q.view(np.uint64) * uc).view(np.int64)
+
+    low = fast & (r < 0)
+    q -= low
+    r += np.where(low, c, 0)
+    high = fast & (r >= c)
+    q += high
+
+    if not fast.all():
+        for i in zip(*np.nonzero(~fast)):
+            q[i] = (int(a[i]) * int(b[i])) // int(c[i])
+    return q
+
+def batch_constant_product_buy_exact_in(
+    virtual_base, virtual_quote, real_base, real_quote,
+    amount_in,
+    protocol_fee_pct=0.25,
+    platform_fee_pct=1.0,
+    share_fee_pct=0.0
+) -> np.ndarray:
+    input_reserve = as_int64(virtual_quote) + as_int64(real_quote)
+    output_reserve = as_int64(virtual_base) - as_int64(real_base)
+
+    total_fee_pct = np.asarray(protocol_fee_pct, dtype=np.float64) + platform_fee_pct + share_fee_pct
+    effective_input = np.trunc(as_int64(amount_in).astype(np.float64) * (1 - total_fee_pct / 100)).astype(np.int64)
+
+    return mul_div_floor(effective_input, output_reserve, input_reserve + effective_input)
+
+def batch_constant_product_sell_exact_in(
+    virtual_base, virtual_quote, real_base, real_quote,
+    amount_in,
+    protocol_fee_pct=0.25,
+    platform_fee_pct=1.0,
+    share_fee_pct=0.0
+) -> np.ndarray:
+    amount_in = as_int64(amount_in)
+    input_reserve = as_int64(virtual_base) - as_int64(real_base)
+    output_reserve = as_int64(virtual_quote) + as_int64(real_quote)
+
+    gross_out = mul_div_floor(amount_in, output_reserve, input_reserve + amount_in)
+
+    protocol_fee = mul_div_floor(gross_out, fee_bps(protocol_fee_pct), 10000)
+    platform_fee = mul_div_floor(gross_out, fee_bps(platform_fee_pct), 10000)
+    share_fee = mul_div_floor(gross_out, fee_bps(share_fee_pct), 10000)
+
+    return gross_out - protocol_fee - platform_fee - share_fee
+
+def fee_bps(fee_pct) -> np.ndarray:
+    return np.trunc(np.asarray(fee_pct, dtype=np.float64) * 100).astype(np.int64)
+
+def pool_reserves(pool_states: list) -> tuple:
+    return (
+        as_int64([pool_state.virtual_base for pool_state in pool_states]),
+        as_int64([pool_state.virtual_quote for pool_state in pool_states]),
+        as_int64([pool_state.real_base for pool_state in pool_states]),
+        as_int64([pool_state.real_quote for pool_state in pool_states]),
+    )
@@ -0,0 +1,39 @@
+import random
+import time
+
+import numpy as np
+
+from batch_quote import batch_constant_product_buy_exact_in, batch_constant_product_sell_exact_in
+from pool_utils import constant_product_buy_exact_in, constant_product_sell_exact_in
+
+def random_quotes(count: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        virtual_base = rng.randint(10**14, 1_100_000_000_000_000)
+        real_base = rng.randint(0, virtual_base - 1)
+        virtual_quote = rng.randint(10**9, 10**11)
+        real_quote = rng.randint(0, 10**11)
+        amount_in = rng.randint(1, 10**12)
+        rows.append((virtual_base, virtual_quote, real_base, real_quote, amount_in))
+    return rows
+
+def run(name: str, scalar, batch, rows: list, columns: list) -> None:
+    start = time.perf_counter()
+    expected = [scalar(*row, 0.25, 1.0, 0) for row in rows]
+    scalar_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = batch(*columns, 0.25, 1.0, 0)
+    batch_elapsed = time.perf_counter() - start
+
+    assert result.tolist() == expected, f"{name}: batch result differs from scalar result"
+    print(f"{name:<5} scalar {scalar_elapsed * 1e3:8.2f} ms  batch {batch_elapsed * 1e3:8.2f} ms  ({scalar_elapsed / batch_elapsed:.1f}x)")
+
+if __name__ == "__main__":
+    rows = random_quotes(100_000)
+    columns = [np.array(column, dtype=np.int64) for column in zip(*rows)]
+    print(f"Quoting {len(rows)} (pool, amount) pairs")
+    run("buy", constant_product_buy_exact_in, batch_constant_product_buy_exact_in, rows, columns)
+    run("sell", constant_product_sell_exact_in, batch_constant_product_sell_exact_in, rows, columns)
+    print("Batch results match the scalar functions.")
@@ -0,0 +1,76 @@
+import asyncio
+import base64
+import sys
+import time
+from functools import partial
+
+from solders.hash import Hash  # type: ignore
+from solders.pubkey import Pubkey  # type: ignore
+
+from bench_end_to_end import start_mock
+from bench_swap_template import RENT
+from config import COMPUTE_UNIT_MARGIN, UNIT_BUDGET
+from constants import BUY_EXACT_IN, BUY_EXACT_OUT, SELL_EXACT_IN
+from mock_rpc import NetworkProfile
+
+def main(units: int) -> None:
+    mock, fixtures = start_mock(NetworkProfile(units_consumed=units))
+    # Imported after start_mock so the profiler binds the mock clients.
+    import compute_profile
+    from compute_profile import ComputeProfiler
+    from pool_state import decode_pool_state
+    from swap_template import get_swap_template
+
+    pool_state = decode_pool_state(Pubkey.from_string(fixtures["pool"]), base64.b64decode(fixtures["pool_state"]))
+    amount, threshold = 10_000_000, 12_345
+    blockhash = Hash.new_unique()
+    compute_profile.PROFILE_RETRY_DELAY = 0.2
+    try:
+        # A failed simulation leaves the template unprofiled and is retried after the backoff.
+        profiler = ComputeProfiler()
+        template = get_swap_template(pool_state, BUY_EXACT_IN)
+        sign_transaction = partial(template.sign, amount, threshold, RENT + amount)
+        mock.profile.error_rate = 1.0
+        assert profiler.ensure(template, sign_transaction, blockhash) == UNIT_BUDGET
+        assert not template.profiled
+        simulations = mock.stats.requests.get("simulateTransaction", 0)
+        profiler.ensure(template, sign_transaction, blockhash)
+        assert mock.stats.requests.get("simulateTransaction", 0) == simulations, "retried before the backoff"
+
+        mock.profile.error_rate = 0.0
+        time.sleep(compute_profile.PROFILE_RETRY_DELAY)
+        limit = profiler.ensure(template, sign_transaction, blockhash)
+        expected = int(units * (1 + COMPUTE_UNIT_MARGIN))
+        assert limit == expected and template.profiled, (limit, expected)
+        print(f"profiled {units} CU -> limit {limit}")
+
+        # Concurrent first trades of one shape share a single simulation.
+        mock.profile.latency = 0.05
+        template = get_swap_template(pool_state, BUY_EXACT_OUT)
+        sign_transaction = partial(template.sign, amount, threshold, RENT + amount)
+        simulations = mock.stats.requests.get("simulateTransaction", 0)
+
+        async def first_trades() -> list:
+            return await asyncio.gather(*(profiler.async_ensure(template, sign_transaction, blockhash) for _ in range(20)))
+
+        limits = asyncio.run(first_trades())
+        simulated = mock.stats.requests.get("simulateTransaction", 0) - simulations
+        assert simulated == 1 and limits.count(expected) == 1, (simulated, limits)
+        print(f"20 concurrent first trades -> {simulated} simulation")
+        mock.profile.latency = 0.0
+
+        # After PROFILE_ATTEMPTS failures the template keeps the default limit.
+        compute_profile.PROFILE_RETRY_DELAY = 0
+        mock.profile.error_rate = 1.0
+        template = get_swap_template(pool_state, SELL_EXACT_IN)
+        sign_transaction = partial(template.sign, amount, threshold, RENT)
+        for _ in range(compute_profile.PROFILE_ATTEMPTS):
+            profiler.ensure(template, sign_transaction, blockhash)
+        assert template.profiled and template.unit_limit == UNIT_BUDGET
+        print(f"gave up after {compute_profile.PROFILE_ATTEMPTS} attempts -> limit {template.unit_limit}")
+    finally:
+        mock.stop()
+
+if __name__ == "__main__":
+    # python bench_compute_profile.py [units_consumed]
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 60_000)
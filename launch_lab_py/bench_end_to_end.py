@@ -0,0 +1,118 @@
+import asyncio
+import json
+import os
+import sys
+import time
+
+from solana.rpc.api import Client
+from solana.rpc.async_api import AsyncClient
+
+import config
+from mock_rpc import MockSolana, NetworkProfile
+from spans import HistogramSink, tracer
+
+FIXTURES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_fixtures.json")
+
+def start_mock(profile: NetworkProfile) -> tuple:
+    with open(FIXTURES_PATH) as f:
+        fixtures = json.load(f)
+    mock = MockSolana(fixtures, profile)
+    mock.start()
+    # Modules bind the config clients at import time, so point config at the mock before importing them.
+    config.RPC, config.WSS = mock.rpc, mock.wss
+    config.client = Client(mock.rpc)
+    config.async_client = AsyncClient(mock.rpc)
+    return mock, fixtures
+
+def percentile(values: list, percent: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+def report(name: str, count: int, elapsed: float, latencies: list, failed: int) -> None:
+    line = f"{name:<10} {count / elapsed:8.1f}/s"
+    if latencies:
+        line += "  p50 {:7.1f} ms  p90 {:7.1f} ms  p99 {:7.1f} ms".format(
+            *(percentile(latencies, percent) * 1000 for percent in (50, 90, 99))
+        )
+    print(f"{line}  failed {failed}")
+
+async def bench_trades(pool_str: str, count: int, concurrency: int) -> None:
+    from async_launch_lab import async_buy
+    from blockhash_cache import blockhash_cache
+    from confirmation import signature_confirmer
+
+    signature_confirmer.start()
+    await blockhash_cache.async_refresh()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failed = 0
+
+    async def trade() -> None:
+        nonlocal failed
+        async with semaphore:
+            started_at = time.perf_counter()
+            confirmed = await async_buy(pool_str, 0.01, 5)
+            if confirmed:
+                latencies.append(time.perf_counter() - started_at)
+            else:
+                failed += 1
+
+    tracer.sink = HistogramSink()
+    started_at = time.perf_counter()
+    await asyncio.gather(*(trade() for _ in range(count)))
+    report("buy", count, time.perf_counter() - started_at, latencies, failed)
+    print(tracer.sink.report())
+    tracer.sink = None
+    signature_confirmer.stop()
+
+async def bench_listener(mock: MockSolana, fixtures: dict, count: int) -> None:
+    from launchlab_ws import LaunchLabListener
+
+    logs = fixtures["trade_notification"]["params"]["result"]["value"]["logs"]
+    done = asyncio.Event()
+    latencies = []
+    sent_at = {}
+
+    def on_trade(event: dict) -> None:
+        latencies.append(time.perf_counter() - sent_at[event["signature"]])
+        if len(latencies) == count:
+            done.set()
+
+    listener = LaunchLabListener(wss=mock.wss, on_trade=on_trade, metrics_interval=0)
+    task = asyncio.create_task(listener.run())
+    while not mock._logs_subscribers:
+        await asyncio.sleep(0.01)
+
+    started_at = time.perf_counter()
+    for i in range(count):
+        signature = f"bench{i}"
+        sent_at[signature] = time.perf_counter()
+        mock.publish_logs(signature, logs)
+    try:
+        await asyncio.wait_for(done.wait(), 30)
+    except asyncio.TimeoutError:
+        pass
+    report("listener", count, time.perf_counter() - started_at, latencies, count - len(latencies))
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+async def main(count: int, profile: NetworkProfile) -> None:
+    mock, fixtures = start_mock(profile)
+    try:
+        await bench_trades(fixtures["pool"], count, concurrency=min(count, 32))
+        await bench_listener(mock, fixtures, count * 10)
+    finally:
+        mock.stop()
+    print(f"rpc requests {sum(mock.stats.requests.values())}  errors {mock.stats.errors}  rate limited {mock.stats.rate_limited}")
+
+if __name__ == "__main__":
+    # python bench_end_to_end.py [count] [latency_ms] [jitter_ms] [error_rate] [rate_limit]
+    args = [float(arg) for arg in sys.argv[1:]]
+    count = int(args[0]) if args else 100
+    profile = NetworkProfile(
+        latency=args[1] / 1000 if len(args) > 1 else 0.02,
+        jitter=args[2] / 1000 if len(args) > 2 else 0.01,
+        error_rate=args[3] if len(args) > 3 else 0.0,
+        rate_limit=args[4] if len(args) > 4 else None,
+    )
+    asyncio.run(main(count, profile))
@@ -0,0 +1,35 @@
+import sys
+
+from solders.hash import Hash  # type: ignore
+from solders.transaction import VersionedTransaction  # type: ignore
+
+from config import client
+from constants import *
+from bench_swap_template import RENT, random_pool_state
+from pool_utils import fetch_pool_state
+from swap_template import get_swap_template
+
+def shapes(pool_state) -> list:
+    amount, threshold = 10_000_000, 12_345
+    return [
+        ("buy seeded", get_swap_template(pool_state, BUY_EXACT_IN), (amount, threshold, RENT + amount)),
+        ("buy persistent", get_swap_template(pool_state, BUY_EXACT_IN, persistent_wsol=True), (amount, threshold, 0)),
+        ("buy top-up", get_swap_template(pool_state, BUY_EXACT_IN, persistent_wsol=True, top_up=True), (amount, threshold, amount)),
+        ("sell seeded", get_swap_template(pool_state, SELL_EXACT_IN), (amount, threshold, RENT)),
+        ("sell persistent", get_swap_template(pool_state, SELL_EXACT_IN, persistent_wsol=True), (amount, threshold, 0)),
+    ]
+
+if __name__ == "__main__":
+    # With a pool address the transactions are simulated to report compute units as well.
+    pool_state = fetch_pool_state(sys.argv[1]) if len(sys.argv) > 1 else random_pool_state()
+    blockhash = client.get_latest_blockhash().value.blockhash if len(sys.argv) > 1 else Hash.new_unique()
+
+    for name, template, args in shapes(pool_state):
+        raw, _ = template.sign(*args, blockhash)
+        line = f"{name:<16} {len(raw):5d} bytes"
+        if len(sys.argv) > 1:
+            result = client.simulate_transaction(
+                VersionedTransaction.from_bytes(raw), sig_verify=False, replace_recent_blockhash=True
+            ).value
+            line += f"  {result.units_consumed} CU  err={result.err}"
+        print(line)
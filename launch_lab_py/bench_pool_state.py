@@ -0,0 +1,142 @@
+import os
+import time
+import tracemalloc
+from dataclasses import dataclass
+
+from construct import Struct, Int8ul, Int64ul, Bytes, Array, Padding
+
+from solders.pubkey import Pubkey  # type: ignore
+
+from pool_state import POOL_STATE_SIZE, decode_pool_state
+
+POOL_STATE_LAYOUT = Struct(
+    Padding(8),
+    "epoch" / Int64ul,
+    "auth_bump" / Int8ul,
+    "status" / Int8ul,
+    "base_decimals" / Int8ul,
+    "quote_decimals" / Int8ul,
+    "migrate_type" / Int8ul,
+    "supply" / Int64ul,
+    "total_base_sell" / Int64ul,
+    "virtual_base" / Int64ul,
+    "virtual_quote" / Int64ul,
+    "real_base" / Int64ul,
+    "real_quote" / Int64ul,
+    "total_quote_fund_raising" / Int64ul,
+    "quote_protocol_fee" / Int64ul,
+    "platform_fee" / Int64ul,
+    "migrate_fee" / Int64ul,
+    "vesting_total_locked_amount" / Int64ul,
+    "vesting_cliff_period" / Int64ul,
+    "vesting_unlock_period" / Int64ul,
+    "vesting_start_time" / Int64ul,
+    "vesting_allocated_share_amount" / Int64ul,
+    "global_config" / Bytes(32),
+    "platform_config" / Bytes(32),
+    "base_mint" / Bytes(32),
+    "quote_mint" / Bytes(32),
+    "base_vault" / Bytes(32),
+    "quote_vault" / Bytes(32),
+    "creator" / Bytes(32),
+    "padding" / Array(8, Int64ul)
+)
+
+@dataclass
+class ConstructPoolState:
+    pool: Pubkey
+    epoch: int
+    auth_bump: int
+    status: int
+    base_decimals: int
+    quote_decimals: int
+    migrate_type: int
+    supply: int
+    total_base_sell: int
+    virtual_base: int
+    virtual_quote: int
+    real_base: int
+    real_quote: int
+    total_quote_fund_raising: int
+    quote_protocol_fee: int
+    platform_fee: int
+    migrate_fee: int
+    vesting_total_locked_amount: int
+    vesting_cliff_period: int
+    vesting_unlock_period: int
+    vesting_start_time: int
+    vesting_allocated_share_amount: int
+    global_config: Pubkey
+    platform_config: Pubkey
+    base_mint: Pubkey
+    quote_mint: Pubkey
+    base_vault: Pubkey
+    quote_vault: Pubkey
+    creator: Pubkey
+
+def construct_decode_pool_state(pool_pubkey: Pubkey, data: bytes) -> ConstructPoolState:
+    decoded = POOL_STATE_LAYOUT.parse(data)
+
+    return ConstructPoolState(
+        pool=pool_pubkey,
+        epoch=decoded.epoch,
+        auth_bump=decoded.auth_bump,
+        status=decoded.status,
+        base_decimals=decoded.base_decimals,
+        quote_decimals=decoded.quote_decimals,
+        migrate_type=decoded.migrate_type,
+        supply=decoded.supply,
+        total_base_sell=decoded.total_base_sell,
+        virtual_base=decoded.virtual_base,
+        virtual_quote=decoded.virtual_quote,
+        real_base=decoded.real_base,
+        real_quote=decoded.real_quote,
+        total_quote_fund_raising=decoded.total_quote_fund_raising,
+        quote_protocol_fee=decoded.quote_protocol_fee,
+        platform_fee=decoded.platform_fee,
+        migrate_fee=decoded.migrate_fee,
+        vesting_total_locked_amount=decoded.vesting_total_locked_amount,
+        vesting_cliff_period=decoded.vesting_cliff_period,
+        vesting_unlock_period=decoded.vesting_unlock_period,
+        vesting_start_time=decoded.vesting_start_time,
+        vesting_allocated_share_amount=decoded.vesting_allocated_share_amount,
+        global_config=Pubkey.from_bytes(decoded.global_config),
+        platform_config=Pubkey.from_bytes(decoded.platform_config),
+        base_mint=Pubkey.from_bytes(decoded.base_mint),
+        quote_mint=Pubkey.from_bytes(decoded.quote_mint),
+        base_vault=Pubkey.from_bytes(decoded.base_vault),
+        quote_vault=Pubkey.from_bytes(decoded.quote_vault),
+        creator=Pubkey.from_bytes(decoded.creator),
+    )
+
+def random_pool_accounts(count: int) -> list:
+    accounts = []
+    for _ in range(count):
+        data = bytearray(os.urandom(POOL_STATE_SIZE))
+        data[16:21] = bytes([255, 0, 6, 9, 1])
+        accounts.append((Pubkey.from_bytes(os.urandom(32)), bytes(data)))
+    return accounts
+
+def run(name: str, decode, accounts: list) -> list:
+    start = time.perf_counter()
+    pools = [decode(pool, data) for pool, data in accounts]
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    retained = [decode(pool, data) for pool, data in accounts]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del retained
+
+    print(f"{name:<10} {elapsed * 1e6 / len(accounts):8.2f} us/pool  {size / len(accounts):8.0f} bytes/pool")
+    return pools
+
+if __name__ == "__main__":
+    accounts = random_pool_accounts(20_000)
+    print(f"Decoding {len(accounts)} PoolState accounts")
+    old = run("construct", construct_decode_pool_state, accounts)
+    new = run("struct", decode_pool_state, accounts)
+
+    for a, b in zip(old, new):
+        assert (a.virtual_base, a.real_quote, a.base_mint, a.creator) == (b.virtual_base, b.real_quote, b.base_mint, b.creator)
+    print("Decoded fields match.")
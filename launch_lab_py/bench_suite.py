@@ -0,0 +1,187 @@
+import base64
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from solders.hash import Hash  # type: ignore
+from solders.message import MessageV0  # type: ignore
+from solders.pubkey import Pubkey  # type: ignore
+from solders.signature import Signature  # type: ignore
+from solders.transaction import VersionedTransaction  # type: ignore
+
+from bench_swap_template import RENT
+from config import client, payer_keypair
+from constants import BUY_EXACT_IN, SELL_EXACT_IN
+from event_decoder import PROGRAM_DATA, decode_event, events_from_inner_instructions
+from idl_decoders import decode_pool_state_account
+from launchlab_ws import LaunchLabListener
+from pool_state import decode_pool_state
+from pool_utils import (
+    constant_product_buy_exact_in,
+    constant_product_buy_exact_out,
+    constant_product_sell_exact_in,
+)
+from swap_instructions import build_buy_instructions, build_sell_instructions
+from swap_template import get_swap_template
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_PATH = os.path.join(BASE_DIR, "bench_fixtures.json")
+RESULTS_PATH = os.path.join(BASE_DIR, "bench_results.json")
+REGRESSION_THRESHOLD = 0.10
+TARGET_TIME = 0.2
+REPEAT = 5
+
+def load_fixtures(path: str = FIXTURES_PATH) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+def program_data(logs: list) -> bytes:
+    return next(base64.b64decode(log[len(PROGRAM_DATA):]) for log in logs if log.startswith(PROGRAM_DATA))
+
+def run_sync(coro):
+    # The trade path of the listener never suspends, so it can be driven without an event loop.
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("Coroutine suspended")
+
+def benchmarks(fixtures: dict) -> dict:
+    pool = Pubkey.from_string(fixtures["pool"])
+    account_data = base64.b64decode(fixtures["pool_state"])
+    pool_state = decode_pool_state(pool, account_data)
+    reserves = (pool_state.virtual_base, pool_state.virtual_quote, pool_state.real_base, pool_state.real_quote)
+    trade_message = json.dumps(fixtures["trade_notification"])
+    trade_data = program_data(fixtures["trade_notification"]["params"]["result"]["value"]["logs"])
+    create_data = program_data(fixtures["create_notification"]["params"]["result"]["value"]["logs"])
+    create_meta = fixtures["create_transaction"]["meta"]
+    blockhash = Hash.new_unique()
+    amount, threshold = 10_000_000, 12_345
+    buy_instructions = build_buy_instructions(pool_state, amount, threshold, None, amount)
+    buy_template = get_swap_template(pool_state, BUY_EXACT_IN)
+    sell_template = get_swap_template(pool_state, SELL_EXACT_IN)
+    listener = LaunchLabListener(wss="", metrics_interval=0)
+
+    return {
+        "decode_pool_state": lambda: decode_pool_state(pool, account_data),
+        "decode_pool_state_account": lambda: decode_pool_state_account(account_data),
+        "quote_buy_exact_in": lambda: constant_product_buy_exact_in(*reserves, amount),
+        "quote_sell_exact_in": lambda: constant_product_sell_exact_in(*reserves, amount),
+        "quote_buy_exact_out": lambda: constant_product_buy_exact_out(*reserves, amount),
+        "decode_trade_event": lambda: decode_event(trade_data),
+        "decode_pool_create_event": lambda: decode_event(create_data),
+        "events_from_inner_instructions": lambda: events_from_inner_instructions(create_meta),
+        "build_buy_instructions": lambda: build_buy_instructions(pool_state, amount, threshold, None, amount),
+        "build_sell_instructions": lambda: build_sell_instructions(pool_state, amount, threshold, RENT),
+        "compile_and_sign": lambda: bytes(VersionedTransaction(
+            MessageV0.try_compile(payer_keypair.pubkey(), buy_instructions, [], blockhash), [payer_keypair]
+        )),
+        "template_sign_buy": lambda: buy_template.sign(amount, threshold, RENT + amount, blockhash, 1),
+        "template_sign_sell": lambda: sell_template.sign(amount, threshold, RENT, blockhash, 1),
+        "listener_trade_message": lambda: run_sync(listener._handle(trade_message, 0.0)),
+    }
+
+def measure(function) -> float:
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= TARGET_TIME / REPEAT:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(TARGET_TIME / REPEAT / elapsed) + 1))
+
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - start) / number)
+    return statistics.median(timings) * 1e6
+
+def git_revision() -> str:
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(["git", "diff", "--quiet", "HEAD"], cwd=BASE_DIR).returncode != 0
+        return revision + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def load_results(path: str = RESULTS_PATH) -> list:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+def save_results(runs: list, path: str = RESULTS_PATH) -> None:
+    with open(path, "w") as f:
+        json.dump(runs, f, indent=2)
+
+def run(name_filter: str = "") -> dict:
+    runs = load_results()
+    revision = git_revision()
+    previous = next((entry for entry in reversed(runs) if entry["revision"] != revision), None)
+
+    results = {}
+    for name, function in benchmarks(load_fixtures()).items():
+        if name_filter not in name:
+            continue
+        function()
+        results[name] = measure(function)
+        line = f"{name:<32} {results[name]:10.2f} us"
+        baseline = previous["results"].get(name) if previous else None
+        if baseline:
+            change = results[name] / baseline - 1
+            line += f"  {change:+7.1%} vs {previous['revision']}"
+            if change > REGRESSION_THRESHOLD:
+                line += "  REGRESSION"
+        print(line)
+
+    runs = [entry for entry in runs if entry["revision"] != revision]
+    runs.append({"revision": revision, "time": int(time.time()), "python": sys.version.split()[0], "results": results})
+    save_results(runs)
+    return results
+
+def notification(slot: int, signature: str, logs: list) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "method": "logsNotification",
+        "params": {
+            "result": {"context": {"slot": slot}, "value": {"signature": signature, "err": None, "logs": logs}},
+            "subscription": 0,
+        },
+    }
+
+def get_transaction(signature: str):
+    response = client.get_transaction(
+        Signature.from_string(signature), encoding="json", commitment="confirmed", max_supported_transaction_version=0
+    )
+    return response.value
+
+def record(pool_str: str, trade_sig: str, create_sig: str, path: str = FIXTURES_PATH) -> None:
+    account = client.get_account_info(Pubkey.from_string(pool_str)).value
+    trade = get_transaction(trade_sig)
+    create = get_transaction(create_sig)
+    fixtures = {
+        "pool": pool_str,
+        "pool_state": base64.b64encode(bytes(account.data)).decode(),
+        "trade_notification": notification(trade.slot, trade_sig, trade.transaction.meta.log_messages),
+        "create_notification": notification(create.slot, create_sig, create.transaction.meta.log_messages),
+        "create_transaction": {"meta": json.loads(create.transaction.meta.to_json())},
+    }
+    with open(path, "w") as f:
+        json.dump(fixtures, f, indent=2)
+    print(f"Recorded fixtures to {path}")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "record":
+        record(*sys.argv[2:5])
+    else:
+        run(sys.argv[1] if len(sys.argv) > 1 else "")
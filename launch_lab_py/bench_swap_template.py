@@ -0,0 +1,60 @@
+import os
+import time
+
+from solders.hash import Hash  # type: ignore
+from solders.message import MessageV0  # type: ignore
+from solders.pubkey import Pubkey  # type: ignore
+from solders.transaction import VersionedTransaction  # type: ignore
+
+from config import payer_keypair
+from constants import *
+from pool_state import POOL_STATE_SIZE, decode_pool_state
+from swap_instructions import build_buy_instructions, build_sell_instructions
+from swap_template import get_swap_template
+
+RENT = 2039280
+
+def random_pool_state():
+    data = bytearray(os.urandom(POOL_STATE_SIZE))
+    data[16:21] = bytes([255, 0, 6, 9, 1])
+    data[141:173] = bytes(GLOBAL_CONFIG)
+    data[237:269] = bytes(WSOL)
+    return decode_pool_state(Pubkey.from_bytes(os.urandom(32)), bytes(data))
+
+def full_build(pool_state, discriminator, amount, threshold, lamports, blockhash) -> bytes:
+    if discriminator in (BUY_EXACT_IN, BUY_EXACT_OUT):
+        instructions = build_buy_instructions(
+            pool_state, amount, threshold, None, lamports - RENT, exact_out=discriminator == BUY_EXACT_OUT
+        )
+    else:
+        instructions = build_sell_instructions(
+            pool_state, amount, threshold, lamports, exact_out=discriminator == SELL_EXACT_OUT
+        )
+    message = MessageV0.try_compile(payer_keypair.pubkey(), instructions, [], blockhash)
+    return bytes(VersionedTransaction(message, [payer_keypair]))
+
+def run(name: str, sign, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        sign()
+    elapsed = (time.perf_counter() - start) * 1e6 / count
+    print(f"{name:<10} {elapsed:8.2f} us/txn")
+    return elapsed
+
+if __name__ == "__main__":
+    count = 5_000
+    pool_state = random_pool_state()
+    blockhash = Hash.new_unique()
+
+    for discriminator, name in [(BUY_EXACT_IN, "buy"), (SELL_EXACT_IN, "sell")]:
+        amount, threshold = 10_000_000, 12_345
+        lamports = RENT + amount if name == "buy" else RENT
+        template = get_swap_template(pool_state, discriminator)
+
+        raw, _ = template.sign(amount, threshold, lamports, blockhash)
+        assert len(raw) == len(full_build(pool_state, discriminator, amount, threshold, lamports, blockhash))
+
+        print(f"Signing {count} {name} transactions")
+        full = run("full", lambda: full_build(pool_state, discriminator, amount, threshold, lamports, blockhash), count)
+        patched = run("template", lambda: template.sign(amount, threshold, lamports, blockhash), count)
+        print(f"Speedup: {full / patched:.1f}x")
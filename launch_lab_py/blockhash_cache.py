@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+from typing import Optional
+
+from solana.rpc.commitment import Confirmed
+from solders.hash import Hash  # type: ignore
+
+from config import client, async_client, BLOCKHASH_REFRESH_INTERVAL, BLOCKHASH_MAX_AGE
+
+class BlockhashCache:
+    def __init__(self, refresh_interval: float = BLOCKHASH_REFRESH_INTERVAL, max_age: float = BLOCKHASH_MAX_AGE):
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.blockhash: Optional[Hash] = None
+        self.last_valid_block_height = 0
+        self.block_height = 0
+        self.updated_at = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="blockhash-cache", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Error refreshing blockhash: {e}")
+            self._stop.wait(self.refresh_interval)
+
+    def _update(self, blockhash: Hash, last_valid_block_height: int, block_height: int) -> None:
+        with self._lock:
+            self.blockhash = blockhash
+            self.last_valid_block_height = last_valid_block_height
+            self.block_height = max(self.block_height, block_height)
+            self.updated_at = time.monotonic()
+
+    def refresh(self) -> None:
+        latest = client.get_latest_blockhash(Confirmed).value
+        block_height = client.get_block_height(Confirmed).value
+        self._update(latest.blockhash, latest.last_valid_block_height, block_height)
+
+    async def async_refresh(self) -> None:
+        latest, block_height = await asyncio.gather(
+            async_client.get_latest_blockhash(Confirmed),
+            async_client.get_block_height(Confirmed),
+        )
+        self._update(latest.value.blockhash, latest.value.last_valid_block_height, block_height.value)
+
+    def is_fresh(self) -> bool:
+        return self.blockhash is not None and time.monotonic() - self.updated_at <= self.max_age
+
+    def get(self) -> tuple:
+        if not self.is_fresh():
+            self.refresh()
+        with self._lock:
+            return self.blockhash, self.last_valid_block_height
+
+    async def async_get(self) -> tuple:
+        if not self.is_fresh():
+            await self.async_refresh()
+        with self._lock:
+            return self.blockhash, self.last_valid_block_height
+
+    def is_expired(self, last_valid_block_height: int) -> bool:
+        if not self.is_fresh():
+            self.refresh()
+        return self.block_height > last_valid_block_height
+
+    async def async_is_expired(self, last_valid_block_height: int) -> bool:
+        if not self.is_fresh():
+            await self.async_refresh()
+        return self.block_height > last_valid_block_height
+
+    def wait_for_expiry(self, last_valid_block_height: int, timeout: float = 90) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.is_expired(last_valid_block_height):
+                return True
+            time.sleep(self.refresh_interval)
+        return False
+
+    async def async_wait_for_expiry(self, last_valid_block_height: int, timeout: float = 90) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if await self.async_is_expired(last_valid_block_height):
+                return True
+            await asyncio.sleep(self.refresh_interval)
+        return False
+
+blockhash_cache = BlockhashCache()
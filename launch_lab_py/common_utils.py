@@ -1,54 +1,81 @@
-import json
-import time
-
-from solana.rpc.commitment import Confirmed, Processed
-from solana.rpc.types import TokenAccountOpts
-
-from solders.signature import Signature #type: ignore
-from solders.pubkey import Pubkey  # type: ignore
-
-from config import client, payer_keypair
-
-def get_token_balance(mint: Pubkey) -> float | None:
-    response = client.get_token_accounts_by_owner_json_parsed(
-        payer_keypair.pubkey(),
-        TokenAccountOpts(mint=mint),
-        commitment=Processed
-    )
-
-    if response.value:
-        accounts = response.value
-        if accounts:
-            token_amount = accounts[0].account.data.parsed['info']['tokenAmount']['amount']
-            if token_amount:
-                return int(token_amount)
-    return None
-
-def confirm_txn(txn_sig: Signature, max_retries: int = 20, retry_interval: int = 3) -> bool:
-    retries = 1
-    
-    while retries < max_retries:
-        try:
-            txn_res = client.get_transaction(
-                txn_sig, 
-                encoding="json", 
-                commitment=Confirmed, 
-                max_supported_transaction_version=0)
-            
-            txn_json = json.loads(txn_res.value.transaction.meta.to_json())
-            
-            if txn_json['err'] is None:
-                print("Transaction confirmed... try count:", retries)
-                return True
-            
-            print("Error: Transaction not confirmed. Retrying...")
-            if txn_json['err']:
-                print("Transaction failed.")
-                return False
-        except Exception as e:
-            print("Awaiting confirmation... try count:", retries)
-            retries += 1
-            time.sleep(retry_interval)
-    
-    print("Max retries reached. Transaction confirmation failed.")
-    return None
+import logging
+from typing import Optional
+
+from solana.rpc.commitment import Processed
+from solana.rpc.types import TokenAccountOpts
+
+from solders.signature import Signature #type: ignore
+from solders.pubkey import Pubkey  # type: ignore
+
+from config import client, async_client, payer_keypair
+from confirmation import Confirmation, signature_confirmer
+from constants import TOKEN_PROGRAM_ID
+
+logger = logging.getLogger(__name__)
+
+def get_token_balance(mint: Pubkey, owner: Optional[Pubkey] = None) -> float | None:
+    response = client.get_token_accounts_by_owner_json_parsed(
+        owner or payer_keypair.pubkey(),
+        TokenAccountOpts(mint=mint),
+        commitment=Processed
+    )
+
+    if response.value:
+        accounts = response.value
+        if accounts:
+            token_amount = accounts[0].account.data.parsed['info']['tokenAmount']['amount']
+            if token_amount:
+                return int(token_amount)
+    return None
+
+def report_confirmation(confirmation: Confirmation) -> Optional[bool]:
+    if confirmation.success is None:
+        logger.warning("Transaction not confirmed after %.2fs (%s).", confirmation.elapsed, confirmation.source)
+    elif confirmation.success:
+        logger.info("Transaction confirmed in slot %s after %.3fs (%s).", confirmation.slot, confirmation.elapsed, confirmation.source)
+    else:
+        logger.warning("Transaction failed in slot %s after %.3fs: %s", confirmation.slot, confirmation.elapsed, confirmation.err)
+    return confirmation.success
+
+def confirm_txn(
+    txn_sig: Signature,
+    max_retries: int = 20,
+    retry_interval: int = 3,
+    last_valid_block_height: Optional[int] = None,
+) -> bool:
+    return report_confirmation(signature_confirmer.confirm(
+        txn_sig, "confirmed", max_retries * retry_interval, last_valid_block_height
+    ))
+
+def parse_token_accounts(response) -> dict:
+    token_accounts = {}
+    for account in response.value or []:
+        info = account.account.data.parsed['info']
+        mint = Pubkey.from_string(info['mint'])
+        if mint not in token_accounts:
+            token_accounts[mint] = (account.pubkey, int(info['tokenAmount']['amount']))
+    return token_accounts
+
+def get_token_accounts(owner: Pubkey) -> dict:
+    return parse_token_accounts(client.get_token_accounts_by_owner_json_parsed(
+        owner,
+        TokenAccountOpts(program_id=TOKEN_PROGRAM_ID),
+        commitment=Processed
+    ))
+
+async def async_get_token_accounts(owner: Pubkey) -> dict:
+    return parse_token_accounts(await async_client.get_token_accounts_by_owner_json_parsed(
+        owner,
+        TokenAccountOpts(program_id=TOKEN_PROGRAM_ID),
+        commitment=Processed
+    ))
+
+async def async_confirm_txn(
+    txn_sig: Signature,
+    max_retries: int = 20,
+    retry_interval: int = 3,
+    last_valid_block_height: Optional[int] = None,
+) -> bool:
+    return report_confirmation(await signature_confirmer.async_confirm(
+        txn_sig, "confirmed", max_retries * retry_interval, last_valid_block_height
+    ))
@@ -0,0 +1,122 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from solana.rpc.commitment import Processed
+
+from solders.hash import Hash  # type: ignore
+from solders.transaction import VersionedTransaction  # type: ignore
+
+from config import client, async_client, COMPUTE_UNIT_MARGIN
+from constants import MAX_COMPUTE_UNIT_LIMIT
+from swap_template import SwapTemplate
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ATTEMPTS = 3
+PROFILE_RETRY_DELAY = 2
+
+class ComputeProfiler:
+    def __init__(self, client=client, async_client=async_client, margin: float = COMPUTE_UNIT_MARGIN):
+        self.client = client
+        self.async_client = async_client
+        self.margin = margin
+        self.profiles: Dict[tuple, int] = {}
+        self.failures: Dict[tuple, Tuple[int, float]] = {}
+        self._profiling: set = set()
+        self._lock = threading.Lock()
+
+    def key(self, template: SwapTemplate) -> tuple:
+        return template.shape + (template.platform_config,)
+
+    def limit(self, units: int) -> int:
+        return min(MAX_COMPUTE_UNIT_LIMIT, int(units * (1 + self.margin)))
+
+    def apply(self, template: SwapTemplate) -> bool:
+        units = self.profiles.get(self.key(template))
+        if units is None:
+            return False
+        template.set_unit_limit(self.limit(units))
+        template.profiled = True
+        return True
+
+    def due(self, template: SwapTemplate) -> bool:
+        attempts, retry_at = self.failures.get(self.key(template), (0, 0.0))
+        if attempts >= PROFILE_ATTEMPTS:
+            template.profiled = True
+            return False
+        return time.monotonic() >= retry_at
+
+    def _claim(self, template: SwapTemplate) -> bool:
+        if template.profiled or self.apply(template) or not self.due(template):
+            return False
+        # One simulation per shape; concurrent first trades keep the current limit instead of waiting on it.
+        with self._lock:
+            key = self.key(template)
+            if key in self._profiling:
+                return False
+            self._profiling.add(key)
+            return True
+
+    def _release(self, template: SwapTemplate) -> None:
+        with self._lock:
+            self._profiling.discard(self.key(template))
+
+    def _failed(self, template: SwapTemplate) -> None:
+        # Simulations fail transiently (429s, timeouts), so retry with a backoff before settling on the default limit.
+        key = self.key(template)
+        attempts = self.failures.get(key, (0, 0.0))[0] + 1
+        self.failures[key] = (attempts, time.monotonic() + PROFILE_RETRY_DELAY * 2 ** (attempts - 1))
+        if attempts >= PROFILE_ATTEMPTS:
+            template.profiled = True
+            logger.warning("Giving up profiling after %s attempts, keeping compute unit limit %s", attempts, template.unit_limit)
+
+    def _prepare(self, template: SwapTemplate, sign_transaction: Callable[[Hash], tuple], blockhash: Hash):
+        # Simulate at the maximum limit so the profile is never capped by the current one.
+        previous = template.unit_limit
+        template.set_unit_limit(MAX_COMPUTE_UNIT_LIMIT)
+        raw, _ = sign_transaction(blockhash)
+        template.set_unit_limit(previous)
+        return VersionedTransaction.from_bytes(raw)
+
+    def _record(self, template: SwapTemplate, response) -> Optional[int]:
+        result = response.value
+        if result.err is not None or not result.units_consumed:
+            logger.warning("Simulation failed, keeping compute unit limit %s: %s", template.unit_limit, result.err)
+            self._failed(template)
+            return None
+
+        self.profiles[self.key(template)] = result.units_consumed
+        self.failures.pop(self.key(template), None)
+        self.apply(template)
+        logger.info("Profiled %s compute units, limit set to %s", result.units_consumed, template.unit_limit)
+        return template.unit_limit
+
+    def ensure(self, template: SwapTemplate, sign_transaction: Callable[[Hash], tuple], blockhash: Hash) -> int:
+        if not self._claim(template):
+            return template.unit_limit
+        try:
+            txn = self._prepare(template, sign_transaction, blockhash)
+            self._record(template, self.client.simulate_transaction(txn, commitment=Processed))
+        except Exception as e:
+            logger.error("Error occurred during simulation: %s", e)
+            self._failed(template)
+        finally:
+            self._release(template)
+        return template.unit_limit
+
+    async def async_ensure(self, template: SwapTemplate, sign_transaction: Callable[[Hash], tuple], blockhash: Hash) -> int:
+        if not self._claim(template):
+            return template.unit_limit
+        try:
+            txn = self._prepare(template, sign_transaction, blockhash)
+            self._record(template, await self.async_client.simulate_transaction(txn, commitment=Processed))
+        except Exception as e:
+            logger.error("Error occurred during simulation: %s", e)
+            self._failed(template)
+        finally:
+            self._release(template)
+        return template.unit_limit
+
+compute_profiler = ComputeProfiler()
@@ -1,9 +1,30 @@
-from solana.rpc.api import Client
-from solders.keypair import Keypair #type: ignore
-
-PRIV_KEY = "base58_priv_str_here"
-RPC = "rpc_url_here"
-UNIT_BUDGET =  100_000
-UNIT_PRICE =  1_000_000
-client = Client(RPC)
-payer_keypair = Keypair.from_base58_string(PRIV_KEY)
+from solana.rpc.api import Client
+from solana.rpc.async_api import AsyncClient
+from solders.keypair import Keypair #type: ignore
+
+PRIV_KEY = "base58_priv_str_here"
+RPC = "rpc_url_here"
+WSS = "wss_url_here"
+UNIT_BUDGET =  100_000
+UNIT_PRICE =  1_000_000
+BLOCKHASH_REFRESH_INTERVAL = 0.4
+BLOCKHASH_MAX_AGE = 5
+POOL_CACHE_MAX_SUBSCRIPTIONS = 500
+MAX_CONCURRENT_REQUESTS = 8
+PERSISTENT_WSOL = False
+AUTO_COMPUTE_UNITS = False
+COMPUTE_UNIT_MARGIN = 0.1
+DYNAMIC_PRIORITY_FEE = True
+PRIORITY_FEE_PERCENTILE = 75
+PRIORITY_FEE_REFRESH_INTERVAL = 2.0
+PRIORITY_FEE_WINDOW = 150
+PRIORITY_FEE_MAX_POOLS = 20
+MIN_UNIT_PRICE = 1_000_000
+MAX_UNIT_PRICE = 10_000_000
+CONFIRM_POLL_INTERVAL = 0.4
+WALLET_KEYS = []
+WALLET_WORKERS = 4
+WALLET_FEE_RESERVE = 0.01
+client = Client(RPC)
+async_client = AsyncClient(RPC)
+payer_keypair = Keypair.from_base58_string(PRIV_KEY)
@@ -0,0 +1,178 @@
+import asyncio
+import itertools
+import json
+import threading
+import time
+from concurrent.futures import CancelledError, TimeoutError as FutureTimeoutError
+from typing import Dict, Optional
+
+import websocket
+
+from solders.signature import Signature  # type: ignore
+
+from config import WSS
+from tx_tracker import Confirmation, TxTracker, tx_tracker
+
+class SignatureConfirmer:
+    def __init__(self, wss: str = WSS, tracker: TxTracker = tx_tracker):
+        self.wss = wss
+        self.tracker = tracker
+        self.commitments: Dict[Signature, str] = {}
+        self.subscriptions: dict = {}
+        self.subscription_signatures: dict = {}
+        self.pending: dict = {}
+        self._request_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._ws: Optional[websocket.WebSocketApp] = None
+        self._thread: Optional[threading.Thread] = None
+        self._connected = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._ws = websocket.WebSocketApp(
+            self.wss,
+            on_open=self._on_open,
+            on_reconnect=self._on_open,
+            on_message=self._on_message,
+            on_error=self._on_error,
+            on_close=self._on_close,
+        )
+        self._thread = threading.Thread(
+            target=self._ws.run_forever, kwargs={"reconnect": 5}, name="signature-confirmer", daemon=True
+        )
+        self._thread.start()
+        self._connected.wait(10)
+
+    def stop(self) -> None:
+        if self._ws:
+            self._ws.close()
+        if self._thread:
+            self._thread.join()
+        self._ws = None
+        self._thread = None
+        self._connected.clear()
+
+    def confirm(
+        self,
+        signature: Signature,
+        commitment: str = "confirmed",
+        timeout: float = 60,
+        last_valid_block_height: Optional[int] = None,
+    ) -> Confirmation:
+        started_at = time.monotonic()
+        future = self.tracker.track(signature, last_valid_block_height, commitment)
+        self._register(signature, commitment)
+        try:
+            return future.result(timeout)
+        except (FutureTimeoutError, CancelledError):
+            return Confirmation(signature, None, None, None, time.monotonic() - started_at, "timeout")
+        finally:
+            self._unregister(signature)
+
+    async def async_confirm(
+        self,
+        signature: Signature,
+        commitment: str = "confirmed",
+        timeout: float = 60,
+        last_valid_block_height: Optional[int] = None,
+    ) -> Confirmation:
+        started_at = time.monotonic()
+        future = self.tracker.async_track(signature, last_valid_block_height, commitment)
+        self._register(signature, commitment)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            return Confirmation(signature, None, None, None, time.monotonic() - started_at, "timeout")
+        finally:
+            self._unregister(signature)
+
+    def _register(self, signature: Signature, commitment: str) -> None:
+        with self._lock:
+            self.commitments[signature] = commitment
+            if self.running and self._connected.is_set():
+                self._subscribe(signature, commitment)
+
+    def _unregister(self, signature: Signature) -> None:
+        self.tracker.untrack(signature)
+        with self._lock:
+            self.commitments.pop(signature, None)
+            subscription_id = self.subscriptions.pop(signature, None)
+            if subscription_id is not None:
+                self.subscription_signatures.pop(subscription_id, None)
+                self._send("signatureUnsubscribe", [subscription_id])
+
+    def _subscribe(self, signature: Signature, commitment: str) -> None:
+        request_id = self._send(
+            "signatureSubscribe",
+            [str(signature), {"commitment": commitment}],
+        )
+        if request_id is not None:
+            self.pending[request_id] = signature
+
+    def _send(self, method: str, params: list) -> Optional[int]:
+        request_id = next(self._request_ids)
+        try:
+            self._ws.send(json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}))
+            return request_id
+        except Exception as e:
+            print(f"Error sending {method} request: {e}")
+            return None
+
+    def _on_open(self, ws) -> None:
+        with self._lock:
+            self.subscriptions.clear()
+            self.subscription_signatures.clear()
+            self.pending.clear()
+            for signature, commitment in self.commitments.items():
+                self._subscribe(signature, commitment)
+        self._connected.set()
+
+    def _on_message(self, ws, message) -> None:
+        try:
+            payload = json.loads(message)
+        except json.JSONDecodeError as e:
+            print(f"JSON decode error: {e}")
+            return
+
+        if payload.get("method") == "signatureNotification":
+            params = payload.get("params", {})
+            result = params.get("result", {})
+            value = result.get("value")
+            if not isinstance(value, dict):
+                return
+            with self._lock:
+                signature = self.subscription_signatures.pop(params.get("subscription"), None)
+                if signature is None:
+                    return
+                self.subscriptions.pop(signature, None)
+            err = value.get("err")
+            self.tracker.resolve(signature, err is None, err, result.get("context", {}).get("slot"), "websocket")
+            return
+
+        request_id = payload.get("id")
+        if request_id is None:
+            return
+        with self._lock:
+            signature = self.pending.pop(request_id, None)
+            if signature is None:
+                return
+            if "result" in payload and signature in self.commitments:
+                self.subscriptions[signature] = payload["result"]
+                self.subscription_signatures[payload["result"]] = signature
+            elif "result" in payload:
+                self._send("signatureUnsubscribe", [payload["result"]])
+            else:
+                print(f"Error subscribing to {signature}: {payload.get('error')}")
+
+    def _on_error(self, ws, error) -> None:
+        print(f"WebSocket error: {error}")
+
+    def _on_close(self, ws, close_status_code, close_msg) -> None:
+        self._connected.clear()
+
+signature_confirmer = SignatureConfirmer()
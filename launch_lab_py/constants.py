@@ -1,12 +1,21 @@
-from solders.pubkey import Pubkey  # type: ignore
-
-AUTHORITY = Pubkey.from_string("WLHv2UAZm6z4KyaaELi5pjdbJh6RESMva1Rnn8pJVVh")
-EVENT_AUTH = Pubkey.from_string("2DPAtwB8L12vrMRExbLuyGnC7n2J5LNoZQSejeQGpwkr")
-GLOBAL_CONFIG = Pubkey.from_string("6s1xP3hpbAfFoNtUNF8mfHsjr2Bd97JxFJRWLbL6aHuX")
-PROGRAM_ID = Pubkey.from_string("LanMV9sAd7wArD4vJFi2qDdfnVhFxYSUg6eADduJ3uj")
-RAYDIUM_PLATFORM = Pubkey.from_string("4Bu96XjU84XjPDSpveTVf6LYGCkfW5FK7SNkREWcEfV4")
-TOKEN_PROGRAM_ID = Pubkey.from_string("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA")
-
-ACCOUNT_SPACE = 165
-WSOL = Pubkey.from_string("So11111111111111111111111111111111111111112")
-QUOTE_MINT = "So11111111111111111111111111111111111111112"
\ No newline at end of file
+from solders.pubkey import Pubkey  # type: ignore
+
+AUTHORITY = Pubkey.from_string("WLHv2UAZm6z4KyaaELi5pjdbJh6RESMva1Rnn8pJVVh")
+EVENT_AUTH = Pubkey.from_string("2DPAtwB8L12vrMRExbLuyGnC7n2J5LNoZQSejeQGpwkr")
+GLOBAL_CONFIG = Pubkey.from_string("6s1xP3hpbAfFoNtUNF8mfHsjr2Bd97JxFJRWLbL6aHuX")
+PROGRAM_ID = Pubkey.from_string("LanMV9sAd7wArD4vJFi2qDdfnVhFxYSUg6eADduJ3uj")
+RAYDIUM_PLATFORM = Pubkey.from_string("4Bu96XjU84XjPDSpveTVf6LYGCkfW5FK7SNkREWcEfV4")
+TOKEN_PROGRAM_ID = Pubkey.from_string("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA")
+
+ACCOUNT_SPACE = 165
+WSOL = Pubkey.from_string("So11111111111111111111111111111111111111112")
+QUOTE_MINT = "So11111111111111111111111111111111111111112"
+MAX_MULTIPLE_ACCOUNTS = 100
+MAX_SIGNATURE_STATUSES = 256
+MAX_COMPUTE_UNIT_LIMIT = 1_400_000
+MAX_TRANSACTION_SIZE = 1232
+
+BUY_EXACT_IN = bytes.fromhex("faea0d7bd59c13ec")
+SELL_EXACT_IN = bytes.fromhex("9527de9bd37c981a")
+BUY_EXACT_OUT = bytes.fromhex("18d3742869039938")
+SELL_EXACT_OUT = bytes.fromhex("5fc8472208090ba6")
@@ -0,0 +1,55 @@
+import base64
+import struct
+from typing import Optional
+
+import base58
+
+from idl_decoders import EVENT_DECODERS, EVENT_DISCRIMINATORS
+
+# Anchor prefixes self-CPI (emit_cpi!) event data with this tag before the event discriminator.
+EVENT_IX_TAG = bytes.fromhex("e445a52e51cb9a1d")
+PROGRAM_DATA = "Program data: "
+LOG_TRUNCATED = "Log truncated"
+
+def decode_event(data: bytes) -> Optional[tuple]:
+    offset = 8 if data[:8] == EVENT_IX_TAG else 0
+    name = EVENT_DISCRIMINATORS.get(data[offset:offset + 8])
+    if name is None:
+        return None
+    try:
+        return name, EVENT_DECODERS[name](data, offset + 8)
+    except (ValueError, IndexError, struct.error) as e:
+        print(f"Error decoding {name}: {e}")
+        return None
+
+def logs_truncated(logs: list) -> bool:
+    return any(log.startswith(LOG_TRUNCATED) for log in logs)
+
+def events_from_logs(logs: list) -> list:
+    events = []
+    for log in logs:
+        if not log.startswith(PROGRAM_DATA):
+            continue
+        try:
+            data = base64.b64decode(log[len(PROGRAM_DATA):])
+        except ValueError:
+            continue
+        event = decode_event(data)
+        if event:
+            events.append(event)
+    return events
+
+def events_from_inner_instructions(txn_json: dict) -> list:
+    events = []
+    for inner_instruction in txn_json.get("innerInstructions", []):
+        for instruction in inner_instruction.get("instructions", []):
+            try:
+                data = base58.b58decode(instruction["data"])
+            except (KeyError, ValueError):
+                continue
+            if data[:8] != EVENT_IX_TAG:
+                continue
+            event = decode_event(data)
+            if event:
+                events.append(event)
+    return events
@@ -0,0 +1,127 @@
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+import httpx
+
+from solders.pubkey import Pubkey  # type: ignore
+
+from config import (
+    RPC,
+    UNIT_PRICE,
+    MIN_UNIT_PRICE,
+    MAX_UNIT_PRICE,
+    PRIORITY_FEE_PERCENTILE,
+    PRIORITY_FEE_REFRESH_INTERVAL,
+    PRIORITY_FEE_WINDOW,
+    PRIORITY_FEE_MAX_POOLS,
+)
+from pool_state import PoolState
+
+def fee_accounts(pool_state: PoolState) -> list:
+    # Fees are only reported for write-locked accounts; the Launch Lab program id never is, so its window reads ~0.
+    return [pool_state.pool, pool_state.base_vault, pool_state.quote_vault]
+
+class FeeWindow:
+    def __init__(self, accounts: list, window: int = PRIORITY_FEE_WINDOW):
+        self.accounts = accounts
+        self.window = window
+        self.fees: "OrderedDict[int, int]" = OrderedDict()
+        self.sorted_fees: List[int] = []
+
+    def update(self, samples: list) -> None:
+        fees = OrderedDict(self.fees)
+        for sample in samples:
+            fees[sample["slot"]] = sample["prioritizationFee"]
+        fees = OrderedDict(sorted(fees.items())[-self.window:])
+        # Swap in complete structures so readers never see a half-updated window.
+        self.sorted_fees = sorted(fees.values())
+        self.fees = fees
+
+    def percentile(self, percentile: float) -> Optional[int]:
+        sorted_fees = self.sorted_fees
+        if not sorted_fees:
+            return None
+        index = min(len(sorted_fees) - 1, int(len(sorted_fees) * percentile / 100))
+        return sorted_fees[index]
+
+class FeeOracle:
+    def __init__(
+        self,
+        rpc: str = RPC,
+        refresh_interval: float = PRIORITY_FEE_REFRESH_INTERVAL,
+        percentile: float = PRIORITY_FEE_PERCENTILE,
+        max_pools: int = PRIORITY_FEE_MAX_POOLS,
+    ):
+        self.rpc = rpc
+        self.refresh_interval = refresh_interval
+        self.percentile = percentile
+        self.max_pools = max_pools
+        self.pool_fees: "OrderedDict[Pubkey, FeeWindow]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="fee-oracle", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        with httpx.Client(timeout=10) as http:
+            while not self._stop.is_set():
+                try:
+                    self.refresh(http)
+                except Exception as e:
+                    print(f"Error refreshing priority fees: {e}")
+                self._stop.wait(self.refresh_interval)
+
+    def fetch(self, http: httpx.Client, accounts: list) -> list:
+        response = http.post(self.rpc, json={
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "getRecentPrioritizationFees",
+            "params": [[str(account) for account in accounts]],
+        })
+        response.raise_for_status()
+        return response.json()["result"]
+
+    def refresh(self, http: httpx.Client) -> None:
+        with self._lock:
+            windows = list(self.pool_fees.values())
+        for fees in windows:
+            fees.update(self.fetch(http, fees.accounts))
+
+    def watch(self, pool: Pubkey, accounts: Optional[list] = None) -> None:
+        with self._lock:
+            if pool in self.pool_fees:
+                self.pool_fees.move_to_end(pool)
+                return
+            self.pool_fees[pool] = FeeWindow(accounts or [pool])
+            if len(self.pool_fees) > self.max_pools:
+                self.pool_fees.popitem(last=False)
+
+    def get(self, pool: Optional[Pubkey] = None, percentile: Optional[float] = None, accounts: Optional[list] = None) -> int:
+        if percentile is None:
+            percentile = self.percentile
+
+        fee = None
+        if pool is not None:
+            fees = self.pool_fees.get(pool)
+            if fees is None:
+                self.watch(pool, accounts)
+            else:
+                fee = fees.percentile(percentile)
+        if fee is None:
+            return UNIT_PRICE
+        return max(MIN_UNIT_PRICE, min(fee, MAX_UNIT_PRICE))
+
+fee_oracle = FeeOracle()
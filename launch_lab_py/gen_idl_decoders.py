@@ -0,0 +1,253 @@
+import json
+import os
+import re
+import struct
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+IDL_PATH = os.path.join(BASE_DIR, "idl.json")
+OUTPUT_PATH = os.path.join(BASE_DIR, "idl_decoders.py")
+
+PRIMITIVES = {
+    "bool": "?",
+    "u8": "B",
+    "i8": "b",
+    "u16": "H",
+    "i16": "h",
+    "u32": "I",
+    "i32": "i",
+    "u64": "Q",
+    "i64": "q",
+}
+
+def snake(name: str) -> str:
+    return re.sub(r"(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])", "_", name).lower()
+
+def const(name: str) -> str:
+    return snake(name).upper()
+
+def dict_source(items: list, indent: str) -> str:
+    return "{\n" + "".join(f"{indent}    {item},\n" for item in items) + indent + "}"
+
+class Layout:
+    def __init__(self, var: str):
+        self.var = var
+        self.fmt = ""
+        self.count = 0
+
+    def field(self, code: str) -> str:
+        self.fmt += code
+        self.count += 1
+        return f"{self.var}[{self.count - 1}]"
+
+    def skip(self, size: int) -> None:
+        self.fmt += f"{size}x"
+
+class Generator:
+    def __init__(self, idl: dict):
+        self.types = {t["name"]: t["type"] for t in idl["types"]}
+        self.accounts = idl["accounts"]
+        self.events = idl["events"]
+        self.structs = []
+        self.enums = []
+        self.readers = []
+        self.emitted = set()
+
+    def defined(self, type_) -> dict:
+        name = type_["defined"]["name"] if isinstance(type_["defined"], dict) else type_["defined"]
+        return name, self.types[name]
+
+    def size(self, type_) -> int:
+        if isinstance(type_, str) and type_ in PRIMITIVES:
+            return struct.calcsize("<" + PRIMITIVES[type_])
+        if type_ == "pubkey":
+            return 32
+        if isinstance(type_, dict) and "array" in type_:
+            item, length = type_["array"]
+            return self.size(item) * length
+        if isinstance(type_, dict) and "defined" in type_:
+            _, definition = self.defined(type_)
+            if definition["kind"] == "struct":
+                sizes = [self.size(field["type"]) for field in definition["fields"]]
+                return None if None in sizes else sum(sizes)
+            if all("fields" not in variant for variant in definition["variants"]):
+                return 1
+        return None
+
+    def is_fixed(self, type_) -> bool:
+        try:
+            return self.size(type_) is not None
+        except KeyError:
+            raise ValueError(f"Unknown IDL type {type_}")
+
+    def unit_enum(self, name: str, definition: dict) -> str:
+        constant = const(name)
+        if name not in self.emitted:
+            self.emitted.add(name)
+            variants = ", ".join(f'"{variant["name"]}"' for variant in definition["variants"])
+            self.enums.append(f"{constant} = ({variants}{',' if len(definition['variants']) == 1 else ''})")
+        return constant
+
+    def fixed_expr(self, type_, layout: Layout, pubkey: str) -> str:
+        if isinstance(type_, str) and type_ in PRIMITIVES:
+            return layout.field(PRIMITIVES[type_])
+        if type_ == "pubkey":
+            return pubkey.format(layout.field("32s"))
+        if "array" in type_:
+            item, length = type_["array"]
+            if item == "u8":
+                return layout.field(f"{length}s")
+            return "[" + ", ".join(self.fixed_expr(item, layout, pubkey) for _ in range(length)) + "]"
+        name, definition = self.defined(type_)
+        if definition["kind"] == "enum":
+            return f"{self.unit_enum(name, definition)}[{layout.field('B')}]"
+        return "{" + ", ".join(self.fixed_items(definition["fields"], layout, pubkey)) + "}"
+
+    def fixed_items(self, fields: list, layout: Layout, pubkey: str) -> list:
+        items = []
+        for field in fields:
+            if field["name"] == "padding":
+                layout.skip(self.size(field["type"]))
+                continue
+            items.append(f'"{field["name"]}": {self.fixed_expr(field["type"], layout, pubkey)}')
+        return items
+
+    def body(self, fields: list, prefix: str, pubkey: str, lines: list, indent: str, returns_offset: bool = True) -> list:
+        # Consecutive fixed-size fields are read with one precompiled struct.
+        runs = [[]]
+        for field in fields:
+            if self.is_fixed(field["type"]):
+                runs[-1].append(field)
+            else:
+                runs += [field, []]
+        runs = [run for run in runs if run]
+        fixed_count = sum(isinstance(run, list) for run in runs)
+
+        items = []
+        index = 0
+        for position, run in enumerate(runs):
+            if isinstance(run, dict):
+                var = run["name"]
+                lines.append(f"{indent}{var}, offset = {self.reader(run['type'], pubkey)}(data, offset)")
+                items.append(f'"{var}": {var}')
+                continue
+            var = f"v{index}"
+            struct_name = f"{prefix}_STRUCT" if fixed_count == 1 else f"{prefix}_STRUCT_{index}"
+            layout = Layout(var)
+            items += self.fixed_items(run, layout, pubkey)
+            self.structs.append(f'{struct_name} = struct.Struct("<{layout.fmt}")')
+            lines.append(f"{indent}{var} = {struct_name}.unpack_from(data, offset)")
+            if returns_offset or position < len(runs) - 1:
+                lines.append(f"{indent}offset += {struct_name}.size")
+            index += 1
+        return items
+
+    def reader(self, type_, pubkey: str) -> str:
+        if type_ == "string":
+            return "read_string"
+        if not isinstance(type_, dict) or "defined" not in type_:
+            raise ValueError(f"Unsupported IDL type {type_}")
+
+        name, definition = self.defined(type_)
+        function = f"read_{snake(name)}"
+        if function in self.emitted:
+            return function
+        self.emitted.add(function)
+
+        lines = [f"def {function}(data, offset: int) -> tuple:"]
+        if definition["kind"] == "struct":
+            items = self.body(definition["fields"], const(name), pubkey, lines, "    ")
+            lines.append(f"    return {dict_source(items, '    ')}, offset")
+        else:
+            lines.append("    variant = data[offset]")
+            lines.append("    offset += 1")
+            for index, variant in enumerate(definition["variants"]):
+                fields = variant.get("fields", [])
+                if any(not isinstance(field, dict) or "name" not in field for field in fields):
+                    raise ValueError(f"Unsupported tuple variant {name}::{variant['name']}")
+                # A single struct payload is flattened next to the variant name.
+                if len(fields) == 1 and isinstance(fields[0]["type"], dict) and "defined" in fields[0]["type"]:
+                    _, payload = self.defined(fields[0]["type"])
+                    if payload["kind"] == "struct":
+                        fields = payload["fields"]
+                lines.append(f"    if variant == {index}:")
+                items = self.body(fields, f"{const(name)}_{const(variant['name'])}", pubkey, lines, "        ")
+                items.insert(0, f'"variant": "{variant["name"]}"')
+                lines.append(f"        return {dict_source(items, '        ')}, offset")
+            lines.append(f'    raise ValueError(f"Unknown {name} variant {{variant}}")')
+        self.readers.append("\n".join(lines))
+        return function
+
+    def decoder(self, name: str, function: str, header: int, pubkey: str) -> str:
+        definition = self.types[name]
+        lines = [f"def {function}(data, offset: int = {header}) -> dict:"]
+        items = self.body(definition["fields"], const(name), pubkey, lines, "    ", returns_offset=False)
+        lines.append(f"    return {dict_source(items, '    ')}")
+        self.readers.append("\n".join(lines))
+        return function
+
+    def generate(self) -> str:
+        accounts = [
+            (account, self.decoder(account["name"], f"decode_{snake(account['name'])}_account", 8, "Pubkey.from_bytes({})"))
+            for account in self.accounts
+        ]
+        events = [
+            (event, self.decoder(event["name"], f"decode_{snake(event['name'])}", 0, "str(Pubkey.from_bytes({}))"))
+            for event in self.events
+        ]
+
+        def table(name: str, entries: list) -> list:
+            lines = [f"{name}_DISCRIMINATORS = {{"]
+            lines += [f'    bytes({entry["discriminator"]}): "{entry["name"]}",' for entry, _ in entries]
+            lines += ["}", "", f"{name}_DECODERS = {{"]
+            lines += [f'    "{entry["name"]}": {function},' for entry, function in entries]
+            lines += ["}"]
+            return lines
+
+        return "\n".join([
+            "# Generated by gen_idl_decoders.py from idl.json. Do not edit.",
+            "import struct",
+            "from typing import Optional",
+            "",
+            "from solders.pubkey import Pubkey  # type: ignore",
+            "",
+            *self.enums,
+            "",
+            *self.structs,
+            "",
+            "def read_string(data, offset: int) -> tuple:",
+            '    (length,) = struct.unpack_from("<I", data, offset)',
+            "    offset += 4",
+            "    if offset + length > len(data):",
+            '        raise ValueError(f"String length {length} exceeds buffer")',
+            '    return bytes(data[offset:offset + length]).decode("utf-8", errors="replace"), offset + length',
+            "",
+            "\n\n".join(self.readers),
+            "",
+            *table("ACCOUNT", accounts),
+            "",
+            *table("EVENT", events),
+            "",
+            "def decode_account(data) -> Optional[tuple]:",
+            "    name = ACCOUNT_DISCRIMINATORS.get(bytes(data[:8]))",
+            "    if name is None:",
+            "        return None",
+            "    return name, ACCOUNT_DECODERS[name](data)",
+            "",
+            "def decode_event(data, offset: int = 0) -> Optional[tuple]:",
+            "    name = EVENT_DISCRIMINATORS.get(bytes(data[offset:offset + 8]))",
+            "    if name is None:",
+            "        return None",
+            "    return name, EVENT_DECODERS[name](data, offset + 8)",
+            "",
+        ])
+
+def main(idl_path: str = IDL_PATH, output_path: str = OUTPUT_PATH) -> None:
+    with open(idl_path) as f:
+        source = Generator(json.load(f)).generate()
+    with open(output_path, "w", newline="\r\n") as f:
+        f.write(source)
+    print(f"Wrote {output_path}")
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,241 @@
+# Generated by gen_idl_decoders.py from idl.json. Do not edit.
+import struct
+from typing import Optional
+
+from solders.pubkey import Pubkey  # type: ignore
+
+TRADE_DIRECTION = ("Buy", "Sell")
+POOL_STATUS = ("Fund", "Migrate", "Trade")
+
+GLOBAL_CONFIG_STRUCT = struct.Struct("<QBHQQQQQQQQ32s32s32s32s32s128x")
+PLATFORM_CONFIG_STRUCT = struct.Struct("<Q32s32sQQQQ64s256s256s256x")
+POOL_STATE_STRUCT = struct.Struct("<QBBBBBQQQQQQQQQQQQQQQ32s32s32s32s32s32s32s64x")
+VESTING_RECORD_STRUCT = struct.Struct("<Q32s32sQQ64x")
+CLAIM_VESTED_EVENT_STRUCT = struct.Struct("<32s32sQ")
+CREATE_VESTING_EVENT_STRUCT = struct.Struct("<32s32sQ")
+POOL_CREATE_EVENT_STRUCT_0 = struct.Struct("<32s32s32s")
+MINT_PARAMS_STRUCT = struct.Struct("<B")
+CURVE_PARAMS_CONSTANT_STRUCT = struct.Struct("<QQQB")
+CURVE_PARAMS_FIXED_STRUCT = struct.Struct("<QQB")
+CURVE_PARAMS_LINEAR_STRUCT = struct.Struct("<QQB")
+POOL_CREATE_EVENT_STRUCT_1 = struct.Struct("<QQQ")
+TRADE_EVENT_STRUCT = struct.Struct("<32sQQQQQQQQQQQQBB")
+
+def read_string(data, offset: int) -> tuple:
+    (length,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    if offset + length > len(data):
+        raise ValueError(f"String length {length} exceeds buffer")
+    return bytes(data[offset:offset + length]).decode("utf-8", errors="replace"), offset + length
+
+def decode_global_config_account(data, offset: int = 8) -> dict:
+    v0 = GLOBAL_CONFIG_STRUCT.unpack_from(data, offset)
+    return {
+        "epoch": v0[0],
+        "curve_type": v0[1],
+        "index": v0[2],
+        "migrate_fee": v0[3],
+        "trade_fee_rate": v0[4],
+        "max_share_fee_rate": v0[5],
+        "min_base_supply": v0[6],
+        "max_lock_rate": v0[7],
+        "min_base_sell_rate": v0[8],
+        "min_base_migrate_rate": v0[9],
+        "min_quote_fund_raising": v0[10],
+        "quote_mint": Pubkey.from_bytes(v0[11]),
+        "protocol_fee_owner": Pubkey.from_bytes(v0[12]),
+        "migrate_fee_owner": Pubkey.from_bytes(v0[13]),
+        "migrate_to_amm_wallet": Pubkey.from_bytes(v0[14]),
+        "migrate_to_cpswap_wallet": Pubkey.from_bytes(v0[15]),
+    }
+
+def decode_platform_config_account(data, offset: int = 8) -> dict:
+    v0 = PLATFORM_CONFIG_STRUCT.unpack_from(data, offset)
+    return {
+        "epoch": v0[0],
+        "platform_fee_wallet": Pubkey.from_bytes(v0[1]),
+        "platform_nft_wallet": Pubkey.from_bytes(v0[2]),
+        "platform_scale": v0[3],
+        "creator_scale": v0[4],
+        "burn_scale": v0[5],
+        "fee_rate": v0[6],
+        "name": v0[7],
+        "web": v0[8],
+        "img": v0[9],
+    }
+
+def decode_pool_state_account(data, offset: int = 8) -> dict:
+    v0 = POOL_STATE_STRUCT.unpack_from(data, offset)
+    return {
+        "epoch": v0[0],
+        "auth_bump": v0[1],
+        "status": v0[2],
+        "base_decimals": v0[3],
+        "quote_decimals": v0[4],
+        "migrate_type": v0[5],
+        "supply": v0[6],
+        "total_base_sell": v0[7],
+        "virtual_base": v0[8],
+        "virtual_quote": v0[9],
+        "real_base": v0[10],
+        "real_quote": v0[11],
+        "total_quote_fund_raising": v0[12],
+        "quote_protocol_fee": v0[13],
+        "platform_fee": v0[14],
+        "migrate_fee": v0[15],
+        "vesting_schedule": {"total_locked_amount": v0[16], "cliff_period": v0[17], "unlock_period": v0[18], "start_time": v0[19], "allocated_share_amount": v0[20]},
+        "global_config": Pubkey.from_bytes(v0[21]),
+        "platform_config": Pubkey.from_bytes(v0[22]),
+        "base_mint": Pubkey.from_bytes(v0[23]),
+        "quote_mint": Pubkey.from_bytes(v0[24]),
+        "base_vault": Pubkey.from_bytes(v0[25]),
+        "quote_vault": Pubkey.from_bytes(v0[26]),
+        "creator": Pubkey.from_bytes(v0[27]),
+    }
+
+def decode_vesting_record_account(data, offset: int = 8) -> dict:
+    v0 = VESTING_RECORD_STRUCT.unpack_from(data, offset)
+    return {
+        "epoch": v0[0],
+        "pool": Pubkey.from_bytes(v0[1]),
+        "beneficiary": Pubkey.from_bytes(v0[2]),
+        "claimed_amount": v0[3],
+        "token_share_amount": v0[4],
+    }
+
+def decode_claim_vested_event(data, offset: int = 0) -> dict:
+    v0 = CLAIM_VESTED_EVENT_STRUCT.unpack_from(data, offset)
+    return {
+        "pool_state": str(Pubkey.from_bytes(v0[0])),
+        "beneficiary": str(Pubkey.from_bytes(v0[1])),
+        "claim_amount": v0[2],
+    }
+
+def decode_create_vesting_event(data, offset: int = 0) -> dict:
+    v0 = CREATE_VESTING_EVENT_STRUCT.unpack_from(data, offset)
+    return {
+        "pool_state": str(Pubkey.from_bytes(v0[0])),
+        "beneficiary": str(Pubkey.from_bytes(v0[1])),
+        "share_amount": v0[2],
+    }
+
+def read_mint_params(data, offset: int) -> tuple:
+    v0 = MINT_PARAMS_STRUCT.unpack_from(data, offset)
+    offset += MINT_PARAMS_STRUCT.size
+    name, offset = read_string(data, offset)
+    symbol, offset = read_string(data, offset)
+    uri, offset = read_string(data, offset)
+    return {
+        "decimals": v0[0],
+        "name": name,
+        "symbol": symbol,
+        "uri": uri,
+    }, offset
+
+def read_curve_params(data, offset: int) -> tuple:
+    variant = data[offset]
+    offset += 1
+    if variant == 0:
+        v0 = CURVE_PARAMS_CONSTANT_STRUCT.unpack_from(data, offset)
+        offset += CURVE_PARAMS_CONSTANT_STRUCT.size
+        return {
+            "variant": "Constant",
+            "supply": v0[0],
+            "total_base_sell": v0[1],
+            "total_quote_fund_raising": v0[2],
+            "migrate_type": v0[3],
+        }, offset
+    if variant == 1:
+        v0 = CURVE_PARAMS_FIXED_STRUCT.unpack_from(data, offset)
+        offset += CURVE_PARAMS_FIXED_STRUCT.size
+        return {
+            "variant": "Fixed",
+            "supply": v0[0],
+            "total_quote_fund_raising": v0[1],
+            "migrate_type": v0[2],
+        }, offset
+    if variant == 2:
+        v0 = CURVE_PARAMS_LINEAR_STRUCT.unpack_from(data, offset)
+        offset += CURVE_PARAMS_LINEAR_STRUCT.size
+        return {
+            "variant": "Linear",
+            "supply": v0[0],
+            "total_quote_fund_raising": v0[1],
+            "migrate_type": v0[2],
+        }, offset
+    raise ValueError(f"Unknown CurveParams variant {variant}")
+
+def decode_pool_create_event(data, offset: int = 0) -> dict:
+    v0 = POOL_CREATE_EVENT_STRUCT_0.unpack_from(data, offset)
+    offset += POOL_CREATE_EVENT_STRUCT_0.size
+    base_mint_param, offset = read_mint_params(data, offset)
+    curve_param, offset = read_curve_params(data, offset)
+    v1 = POOL_CREATE_EVENT_STRUCT_1.unpack_from(data, offset)
+    return {
+        "pool_state": str(Pubkey.from_bytes(v0[0])),
+        "creator": str(Pubkey.from_bytes(v0[1])),
+        "config": str(Pubkey.from_bytes(v0[2])),
+        "base_mint_param": base_mint_param,
+        "curve_param": curve_param,
+        "vesting_param": {"total_locked_amount": v1[0], "cliff_period": v1[1], "unlock_period": v1[2]},
+    }
+
+def decode_trade_event(data, offset: int = 0) -> dict:
+    v0 = TRADE_EVENT_STRUCT.unpack_from(data, offset)
+    return {
+        "pool_state": str(Pubkey.from_bytes(v0[0])),
+        "total_base_sell": v0[1],
+        "virtual_base": v0[2],
+        "virtual_quote": v0[3],
+        "real_base_before": v0[4],
+        "real_quote_before": v0[5],
+        "real_base_after": v0[6],
+        "real_quote_after": v0[7],
+        "amount_in": v0[8],
+        "amount_out": v0[9],
+        "protocol_fee": v0[10],
+        "platform_fee": v0[11],
+        "share_fee": v0[12],
+        "trade_direction": TRADE_DIRECTION[v0[13]],
+        "pool_status": POOL_STATUS[v0[14]],
+    }
+
+ACCOUNT_DISCRIMINATORS = {
+    bytes([149, 8, 156, 202, 160, 252, 176, 217]): "GlobalConfig",
+    bytes([160, 78, 128, 0, 248, 83, 230, 160]): "PlatformConfig",
+    bytes([247, 237, 227, 245, 215, 195, 222, 70]): "PoolState",
+    bytes([106, 243, 221, 205, 230, 126, 85, 83]): "VestingRecord",
+}
+
+ACCOUNT_DECODERS = {
+    "GlobalConfig": decode_global_config_account,
+    "PlatformConfig": decode_platform_config_account,
+    "PoolState": decode_pool_state_account,
+    "VestingRecord": decode_vesting_record_account,
+}
+
+EVENT_DISCRIMINATORS = {
+    bytes([21, 194, 114, 87, 120, 211, 226, 32]): "ClaimVestedEvent",
+    bytes([150, 152, 11, 179, 52, 210, 191, 125]): "CreateVestingEvent",
+    bytes([151, 215, 226, 9, 118, 161, 115, 174]): "PoolCreateEvent",
+    bytes([189, 219, 127, 211, 78, 230, 97, 238]): "TradeEvent",
+}
+
+EVENT_DECODERS = {
+    "ClaimVestedEvent": decode_claim_vested_event,
+    "CreateVestingEvent": decode_create_vesting_event,
+    "PoolCreateEvent": decode_pool_create_event,
+    "TradeEvent": decode_trade_event,
+}
+
+def decode_account(data) -> Optional[tuple]:
+    name = ACCOUNT_DISCRIMINATORS.get(bytes(data[:8]))
+    if name is None:
+        return None
+    return name, ACCOUNT_DECODERS[name](data)
+
+def decode_event(data, offset: int = 0) -> Optional[tuple]:
+    name = EVENT_DISCRIMINATORS.get(bytes(data[offset:offset + 8]))
+    if name is None:
+        return None
+    return name, EVENT_DECODERS[name](data, offset + 8)
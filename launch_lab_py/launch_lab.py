@@ -1,370 +1,577 @@
-import base64
-import os
-import struct
-from typing import Optional
-
-from solana.rpc.commitment import Processed
-from solana.rpc.types import TokenAccountOpts, TxOpts
-
-from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price  # type: ignore
-from solders.instruction import AccountMeta, Instruction  # type: ignore
-from solders.message import MessageV0  # type: ignore
-from solders.pubkey import Pubkey  # type: ignore
-from solders.system_program import CreateAccountWithSeedParams, create_account_with_seed  # type: ignore
-from solders.transaction import VersionedTransaction  # type: ignore
-
-from spl.token.client import Token
-from spl.token.instructions import (
-    CloseAccountParams,
-    InitializeAccountParams,
-    close_account,
-    create_associated_token_account,
-    get_associated_token_address,
-    initialize_account,
-)
-
-from config import client, payer_keypair, UNIT_BUDGET, UNIT_PRICE
-from constants import *
-from common_utils import confirm_txn, get_token_balance
-from pool_utils import *
-
-
-def buy(pool_str: str, sol_in: float = 0.1, slippage: int = 5) -> bool:
-    try:
-        print(f"Starting buy transaction for pool: {pool_str}")
-
-        print("Fetching pool state...")
-        pool_state: Optional[PoolState] = fetch_pool_state(pool_str)
-        
-        if pool_state is None:
-            print("No pool state found, aborting transaction.")
-            return False
-        print("Pool state fetched successfully.")
-
-        if pool_state.status != 0:
-            print("This pool is no longer tradable on Launch Lab - it has migrated to Raydium CPMM...")
-            return
-        
-        if pool_state.global_config != GLOBAL_CONFIG:
-            print("Only Constant Product Curve is supported at this time...")
-            return
-
-        print("Calculating transaction amounts...")
-        sol_decimal = 1e9
-        token_decimal = 10 ** pool_state.base_decimals
-        slippage_adjustment = 1 - (slippage / 100)
-        
-        amount_in = int(sol_in * sol_decimal)
-        print(f"Amount in (SOL): {sol_in} | Lamports: {amount_in}")
-
-        # Fee setup
-        if pool_state.platform_config == RAYDIUM_PLATFORM:
-            protocol_fee_pct = 0.25
-            platform_fee_pct = 0.75
-        else:
-            protocol_fee_pct = 0.25
-            platform_fee_pct = 1  
-
-        raw_amount_out = constant_product_buy_exact_in(
-            pool_state.virtual_base, 
-            pool_state.virtual_quote, 
-            pool_state.real_base, 
-            pool_state.real_quote, 
-            amount_in,
-            protocol_fee_pct, 
-            platform_fee_pct,
-            0
-        )
-
-        minimum_amount_out = int(raw_amount_out * slippage_adjustment)
-
-        print(f"Expected amount out (before slippage): {raw_amount_out / token_decimal}")
-        print(f"Minimum amount out (after {slippage}% slippage): {minimum_amount_out / token_decimal}")
-
-        print("Checking for existing token account...")
-        token_account_check = client.get_token_accounts_by_owner(
-            payer_keypair.pubkey(), 
-            TokenAccountOpts(pool_state.base_mint), 
-            Processed
-            )
-        
-        if token_account_check.value:
-            token_account = token_account_check.value[0].pubkey
-            token_account_instruction = None
-            print("Existing token account found.")
-        else:
-            token_account = get_associated_token_address(payer_keypair.pubkey(), pool_state.base_mint)
-            token_account_instruction = create_associated_token_account(
-                payer_keypair.pubkey(), 
-                payer_keypair.pubkey(), 
-                pool_state.base_mint
-                )
-            print("No existing token account found; creating associated token account.")
-
-        print("Generating seed for WSOL account...")
-        seed = base64.urlsafe_b64encode(os.urandom(24)).decode("utf-8")
-        wsol_token_account = Pubkey.create_with_seed(payer_keypair.pubkey(), seed, TOKEN_PROGRAM_ID)
-        balance_needed = Token.get_min_balance_rent_for_exempt_for_account(client)
-
-        print("Creating and initializing WSOL account...")
-        create_wsol_account_instruction = create_account_with_seed(
-            CreateAccountWithSeedParams(
-                from_pubkey=payer_keypair.pubkey(),
-                to_pubkey=wsol_token_account,
-                base=payer_keypair.pubkey(),
-                seed=seed,
-                lamports=int(balance_needed + amount_in),
-                space=ACCOUNT_SPACE,
-                owner=TOKEN_PROGRAM_ID,
-            )
-        )
-
-        init_wsol_account_instruction = initialize_account(
-            InitializeAccountParams(
-                program_id=TOKEN_PROGRAM_ID,
-                account=wsol_token_account,
-                mint=WSOL,
-                owner=payer_keypair.pubkey(),
-            )
-        )
-
-        print("Creating swap instructions...")
-        accounts = [
-            AccountMeta(payer_keypair.pubkey(), True, True),
-            AccountMeta(AUTHORITY, False, False),
-            AccountMeta(pool_state.global_config, False, False),
-            AccountMeta(pool_state.platform_config, False, False),
-            AccountMeta(pool_state.pool, False, True),
-            AccountMeta(token_account, False, True),
-            AccountMeta(wsol_token_account, False, True),
-            AccountMeta(pool_state.base_vault, False, True),
-            AccountMeta(pool_state.quote_vault, False, True),
-            AccountMeta(pool_state.base_mint, False, False),
-            AccountMeta(pool_state.quote_mint, False, False),
-            AccountMeta(TOKEN_PROGRAM_ID, False, False),  
-            AccountMeta(TOKEN_PROGRAM_ID, False, False),
-            AccountMeta(EVENT_AUTH, False, False),
-            AccountMeta(PROGRAM_ID, False, False),
-        ]
-
-        data = bytearray()
-        data.extend(bytes.fromhex("faea0d7bd59c13ec"))
-        data.extend(struct.pack('<Q', amount_in))
-        data.extend(struct.pack('<Q', minimum_amount_out))
-        data.extend(struct.pack('<Q', 0))
-        swap_instruction = Instruction(PROGRAM_ID, bytes(data), accounts)
-
-        print("Preparing to close WSOL account after swap...")
-        close_wsol_account_instruction = close_account(
-            CloseAccountParams(
-                program_id=TOKEN_PROGRAM_ID,
-                account=wsol_token_account,
-                dest=payer_keypair.pubkey(),
-                owner=payer_keypair.pubkey(),
-            )
-        )
-
-        instructions = [
-            set_compute_unit_limit(UNIT_BUDGET),
-            set_compute_unit_price(UNIT_PRICE),
-            create_wsol_account_instruction,
-            init_wsol_account_instruction,
-        ]
-
-        if token_account_instruction:
-            instructions.append(token_account_instruction)
-
-        instructions.append(swap_instruction)
-        instructions.append(close_wsol_account_instruction)
-        
-        print("Compiling transaction message...")
-        compiled_message = MessageV0.try_compile(
-            payer_keypair.pubkey(),
-            instructions,
-            [],
-            client.get_latest_blockhash().value.blockhash,
-        )
-
-        print("Sending transaction...")
-        txn_sig = client.send_transaction(txn=VersionedTransaction(compiled_message, [payer_keypair]), opts=TxOpts(skip_preflight=False)).value
-        print(f"Transaction Signature: {txn_sig}")
-        
-        print("Confirming transaction...")
-        confirmed = confirm_txn(txn_sig)
-        
-        print(f"Transaction confirmed: {confirmed}")
-        return confirmed
-    except Exception as e:
-        print("Error occurred during transaction:", e)
-        return False
-
-def sell(pool_str: str, percentage: int = 100, slippage: int = 5) -> bool:
-    try:
-        print(f"Starting sell transaction for pool: {pool_str}")
-
-        print("Fetching pool state...")
-        pool_state: Optional[PoolState] = fetch_pool_state(pool_str)
-        if pool_state is None:
-            print("No pool state found, aborting transaction.")
-            return False
-        print("Pool state fetched successfully.")
-
-        if pool_state.status != 0:
-            print("This pool is no longer tradable on Launch Lab - it has migrated to Raydium CPMM...")
-            return
-        
-        if pool_state.global_config != GLOBAL_CONFIG:
-            print("Only Constant Product Curve is supported at this time...")
-            return
-
-        if not (1 <= percentage <= 100):
-            print("Percentage must be between 1 and 100.")
-            return False
-
-        print("Retrieving token balance...")
-        token_balance = get_token_balance(pool_state.base_mint)
-        if token_balance is None or token_balance == 0:
-            print("Token balance is zero. Nothing to sell.")
-            return False
-
-        print("Calculating transaction amounts...")
-        sol_decimal = 1e9
-        token_decimal = 10 ** pool_state.base_decimals
-        slippage_adjustment = 1 - (slippage / 100)
-
-        amount_in = int(token_balance * (percentage / 100))
-        print(f"Base amount in (tokens): {amount_in / token_decimal}")
-
-        if pool_state.platform_config == RAYDIUM_PLATFORM:
-            protocol_fee_pct = 0.25
-            platform_fee_pct = 0.75
-        else:
-            protocol_fee_pct = 0.25
-            platform_fee_pct = 1  
-
-        raw_amount_out = constant_product_sell_exact_in(
-            pool_state.virtual_base,
-            pool_state.virtual_quote,
-            pool_state.real_base,
-            pool_state.real_quote,
-            amount_in,
-            protocol_fee_pct,
-            platform_fee_pct,
-            0
-        )
-
-        min_amount_out = int(raw_amount_out * slippage_adjustment)
-        print(f"Expected amount out (before slippage): {raw_amount_out / sol_decimal}")
-        print(f"Minimum quote out (after {slippage}% slippage): {min_amount_out / sol_decimal}")
-
-        print("Checking for associated token account...")
-        token_account = get_associated_token_address(payer_keypair.pubkey(), pool_state.base_mint)
-
-        print("Generating seed for WSOL account...")
-        seed = base64.urlsafe_b64encode(os.urandom(24)).decode("utf-8")
-        wsol_token_account = Pubkey.create_with_seed(payer_keypair.pubkey(), seed, TOKEN_PROGRAM_ID)
-        balance_needed = Token.get_min_balance_rent_for_exempt_for_account(client)
-
-        print("Creating and initializing WSOL account...")
-        create_wsol_account_instruction = create_account_with_seed(
-            CreateAccountWithSeedParams(
-                from_pubkey=payer_keypair.pubkey(),
-                to_pubkey=wsol_token_account,
-                base=payer_keypair.pubkey(),
-                seed=seed,
-                lamports=int(balance_needed),
-                space=ACCOUNT_SPACE,
-                owner=TOKEN_PROGRAM_ID,
-            )
-        )
-
-        init_wsol_account_instruction = initialize_account(
-            InitializeAccountParams(
-                program_id=TOKEN_PROGRAM_ID,
-                account=wsol_token_account,
-                mint=WSOL,
-                owner=payer_keypair.pubkey(),
-            )
-        )
-
-        print("Creating swap instruction...")
-        accounts = [
-            AccountMeta(payer_keypair.pubkey(), True, True),
-            AccountMeta(AUTHORITY, False, False),
-            AccountMeta(pool_state.global_config, False, False),
-            AccountMeta(pool_state.platform_config, False, False),
-            AccountMeta(pool_state.pool, False, True),
-            AccountMeta(token_account, False, True),
-            AccountMeta(wsol_token_account, False, True),
-            AccountMeta(pool_state.base_vault, False, True),
-            AccountMeta(pool_state.quote_vault, False, True),
-            AccountMeta(pool_state.base_mint, False, False),
-            AccountMeta(pool_state.quote_mint, False, False),
-            AccountMeta(TOKEN_PROGRAM_ID, False, False),
-            AccountMeta(TOKEN_PROGRAM_ID, False, False),
-            AccountMeta(EVENT_AUTH, False, False),
-            AccountMeta(PROGRAM_ID, False, False),
-        ]
-
-        data = bytearray()
-        data.extend(bytes.fromhex("9527de9bd37c981a")) 
-        data.extend(struct.pack('<Q', amount_in))
-        data.extend(struct.pack('<Q', min_amount_out))
-        data.extend(struct.pack('<Q', 0))
-        swap_instruction = Instruction(PROGRAM_ID, bytes(data), accounts)
-
-        print("Preparing to close WSOL account after swap...")
-        close_wsol_account_instruction = close_account(
-            CloseAccountParams(
-                program_id=TOKEN_PROGRAM_ID,
-                account=wsol_token_account,
-                dest=payer_keypair.pubkey(),
-                owner=payer_keypair.pubkey(),
-            )
-        )
-
-        instructions = [
-            set_compute_unit_limit(UNIT_BUDGET),
-            set_compute_unit_price(UNIT_PRICE),
-            create_wsol_account_instruction,
-            init_wsol_account_instruction,
-            swap_instruction,
-            close_wsol_account_instruction,
-        ]
-
-        if percentage == 100:
-            print("Preparing to close token account (100% sell)...")
-            close_token_account_instruction = close_account(
-                CloseAccountParams(
-                    TOKEN_PROGRAM_ID,
-                    token_account,
-                    payer_keypair.pubkey(),
-                    payer_keypair.pubkey(),
-                )
-            )
-            instructions.append(close_token_account_instruction)
-
-        print("Compiling transaction message...")
-        compiled_message = MessageV0.try_compile(
-            payer_keypair.pubkey(),
-            instructions,
-            [],
-            client.get_latest_blockhash().value.blockhash,
-        )
-
-        print("Sending transaction...")
-        txn_sig = client.send_transaction(
-            txn=VersionedTransaction(compiled_message, [payer_keypair]),
-            opts=TxOpts(skip_preflight=False)
-        ).value
-        print(f"Transaction Signature: {txn_sig}")
-
-        print("Confirming transaction...")
-        confirmed = confirm_txn(txn_sig)
-
-        print(f"Transaction confirmed: {confirmed}")
-        return confirmed
-    
-    except Exception as e:
-        print("Error occurred during transaction:", e)
-        return False
\ No newline at end of file
+import logging
+from functools import partial
+from typing import Callable, Dict, Optional
+
+from solana.rpc.commitment import Finalized, Processed
+from solana.rpc.types import TokenAccountOpts, TxOpts
+
+from solders.hash import Hash  # type: ignore
+from solders.keypair import Keypair  # type: ignore
+from solders.address_lookup_table_account import LOOKUP_TABLE_MAX_ADDRESSES  # type: ignore
+from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price  # type: ignore
+from solders.pubkey import Pubkey  # type: ignore
+
+from spl.token.client import Token
+
+from config import client, payer_keypair, AUTO_COMPUTE_UNITS, DYNAMIC_PRIORITY_FEE, PERSISTENT_WSOL, UNIT_BUDGET, UNIT_PRICE
+from blockhash_cache import blockhash_cache
+from pool_cache import pool_state_cache
+from constants import *
+from common_utils import confirm_txn, get_token_accounts, get_token_balance
+from pool_utils import *
+from swap_instructions import (
+    build_sell_swap_instructions,
+    build_unwrap_instructions,
+    build_wrap_instructions,
+    create_wsol_instructions,
+    get_fee_pcts,
+    get_wsol_ata,
+)
+from compute_profile import compute_profiler
+from fee_oracle import fee_accounts, fee_oracle
+from lookup_table import (
+    MAX_EXTEND_ADDRESSES,
+    STATIC_ADDRESSES,
+    build_create_lookup_table_instruction,
+    build_extend_lookup_table_instruction,
+    lookup_table_cache,
+    pool_addresses,
+)
+from swap_template import SwapTemplate, assemble_instructions, get_swap_template, pack_instructions, sign_instructions
+from spans import traced, tracer
+from wsol_account import get_wsol_account
+
+logger = logging.getLogger(__name__)
+
+def send_and_confirm(sign_transaction: Callable[[Hash], tuple], max_rebuilds: int = 2) -> bool:
+    for _ in range(max_rebuilds + 1):
+        blockhash, last_valid_block_height = blockhash_cache.get()
+
+        logger.debug("Signing transaction...")
+        with tracer.span("sign"):
+            txn, _ = sign_transaction(blockhash)
+
+        logger.debug("Sending transaction...")
+        with tracer.span("send"):
+            txn_sig = client.send_raw_transaction(txn, opts=TxOpts(skip_preflight=False)).value
+        logger.info("Transaction Signature: %s", txn_sig)
+
+        logger.debug("Confirming transaction...")
+        with tracer.span("confirm"):
+            confirmed = confirm_txn(txn_sig, last_valid_block_height=last_valid_block_height)
+        if confirmed is not None:
+            logger.info("Transaction confirmed: %s", confirmed)
+            return confirmed
+
+        if not blockhash_cache.wait_for_expiry(last_valid_block_height):
+            break
+
+        status = client.get_signature_statuses([txn_sig], search_transaction_history=True).value[0]
+        if status is not None:
+            logger.info("Transaction confirmed: %s", status.err is None)
+            return status.err is None
+
+        logger.warning("Blockhash expired before the transaction landed, rebuilding...")
+
+    logger.info("Transaction confirmed: None")
+    return None
+
+def send_template(template: SwapTemplate, amount: int, other_amount_threshold: int, lamports: int) -> bool:
+    unit_price = fee_oracle.get(template.pool, accounts=template.fee_accounts) if DYNAMIC_PRIORITY_FEE else None
+    sign_transaction = partial(template.sign, amount, other_amount_threshold, lamports, unit_price=unit_price)
+    if AUTO_COMPUTE_UNITS:
+        blockhash, _ = blockhash_cache.get()
+        with tracer.span("simulate"):
+            compute_profiler.ensure(template, sign_transaction, blockhash)
+    return send_and_confirm(sign_transaction)
+
+def wrap_sol(sol_amount: float = 0, payer: Keypair = payer_keypair) -> bool:
+    lamports = int(sol_amount * 1e9)
+    wsol_account = get_wsol_account(payer)
+    logger.info("Wrapping %s SOL into %s...", sol_amount, wsol_account.address)
+    confirmed = send_and_confirm(partial(sign_instructions, build_wrap_instructions(lamports, payer), payer=payer))
+    wsol_account.settle(confirmed, credit=lamports)
+    return confirmed
+
+def unwrap_sol(payer: Keypair = payer_keypair) -> bool:
+    wsol_account = get_wsol_account(payer)
+    logger.info("Unwrapping all SOL from %s...", wsol_account.address)
+    confirmed = send_and_confirm(partial(sign_instructions, build_unwrap_instructions(payer), payer=payer))
+    wsol_account.settle_unwrap(confirmed)
+    return confirmed
+
+def send_lookup_table_instruction(instruction, payer: Keypair = payer_keypair) -> bool:
+    # Table management transactions never load accounts through a lookup table themselves.
+    instructions = [set_compute_unit_limit(UNIT_BUDGET), set_compute_unit_price(UNIT_PRICE), instruction]
+    return send_and_confirm(partial(sign_instructions, instructions, payer=payer, lookup_tables=[]))
+
+def extend_lookup_table(addresses: list = (), pool_strs: list = (), payer: Keypair = payer_keypair) -> bool:
+    lookup_table_cache.ensure_loaded()
+    table = lookup_table_cache.address
+    if table is None:
+        logger.warning("No lookup table found, create one with create_lookup_table() first.")
+        return False
+
+    addresses = list(addresses)
+    for pool_state in fetch_pool_states(pool_strs).values() if pool_strs else []:
+        if pool_state is not None:
+            addresses.extend(pool_addresses(pool_state))
+
+    missing = lookup_table_cache.missing(addresses)
+    room = LOOKUP_TABLE_MAX_ADDRESSES - len(lookup_table_cache.addresses)
+    if len(missing) > room:
+        logger.warning("Lookup table is full, adding only %s of %s addresses.", room, len(missing))
+        missing = missing[:room]
+
+    for start in range(0, len(missing), MAX_EXTEND_ADDRESSES):
+        chunk = missing[start:start + MAX_EXTEND_ADDRESSES]
+        logger.info("Extending lookup table %s with %s addresses...", table, len(chunk))
+        instruction = build_extend_lookup_table_instruction(table, payer.pubkey(), payer.pubkey(), chunk)
+        if not send_lookup_table_instruction(instruction, payer):
+            logger.warning("Could not extend lookup table %s.", table)
+            return False
+        lookup_table_cache.set(table, lookup_table_cache.addresses + chunk)
+        lookup_table_cache.save()
+    return True
+
+def create_lookup_table(pool_strs: list = (), payer: Keypair = payer_keypair) -> Optional[Pubkey]:
+    recent_slot = client.get_slot(commitment=Finalized).value
+    table, instruction = build_create_lookup_table_instruction(payer.pubkey(), payer.pubkey(), recent_slot)
+    logger.info("Creating lookup table %s...", table)
+    if not send_lookup_table_instruction(instruction, payer):
+        logger.warning("Could not create lookup table %s.", table)
+        return None
+
+    lookup_table_cache.set(table, [])
+    lookup_table_cache.save()
+    extend_lookup_table(STATIC_ADDRESSES, pool_strs, payer)
+    return table
+
+def send_buy(
+    pool_state: PoolState,
+    discriminator: bytes,
+    amount: int,
+    other_amount_threshold: int,
+    max_amount_in: int,
+    token_account: Optional[Pubkey],
+    payer: Keypair = payer_keypair,
+) -> bool:
+    if not PERSISTENT_WSOL:
+        with tracer.span("fetch"):
+            balance_needed = Token.get_min_balance_rent_for_exempt_for_account(client)
+        with tracer.span("build"):
+            template = get_swap_template(pool_state, discriminator, token_account, payer=payer)
+        return send_template(template, amount, other_amount_threshold, balance_needed + max_amount_in)
+
+    wsol_account = get_wsol_account(payer)
+    if not wsol_account.is_open() and not wrap_sol(payer=payer):
+        logger.warning("Could not open the WSOL account, aborting transaction.")
+        return False
+
+    top_up = wsol_account.reserve(max_amount_in)
+    if top_up:
+        logger.info("Topping up WSOL account with %s SOL...", top_up / 1e9)
+    confirmed = None
+    try:
+        with tracer.span("build"):
+            template = get_swap_template(
+                pool_state, discriminator, token_account, payer=payer, persistent_wsol=True, top_up=top_up > 0
+            )
+        confirmed = send_template(template, amount, other_amount_threshold, top_up)
+    finally:
+        wsol_account.settle(confirmed, refund=max_amount_in - top_up, reserved=True)
+    return confirmed
+
+def send_sell(
+    pool_state: PoolState,
+    discriminator: bytes,
+    amount: int,
+    other_amount_threshold: int,
+    min_amount_out: int,
+    close_token_account: bool = False,
+    payer: Keypair = payer_keypair,
+) -> bool:
+    if not PERSISTENT_WSOL:
+        with tracer.span("fetch"):
+            balance_needed = Token.get_min_balance_rent_for_exempt_for_account(client)
+        with tracer.span("build"):
+            template = get_swap_template(pool_state, discriminator, close_token_account=close_token_account, payer=payer)
+        return send_template(template, amount, other_amount_threshold, balance_needed)
+
+    wsol_account = get_wsol_account(payer)
+    if not wsol_account.is_open() and not wrap_sol(payer=payer):
+        logger.warning("Could not open the WSOL account, aborting transaction.")
+        return False
+
+    with tracer.span("build"):
+        template = get_swap_template(
+            pool_state, discriminator, close_token_account=close_token_account, payer=payer, persistent_wsol=True
+        )
+
+    confirmed = send_template(template, amount, other_amount_threshold, 0)
+    wsol_account.settle(confirmed, credit=min_amount_out)
+    return confirmed
+
+@traced("trade")
+def buy(pool_str: str, sol_in: float = 0.1, slippage: int = 5, payer: Keypair = payer_keypair) -> bool:
+    try:
+        logger.info("Starting buy transaction for pool: %s", pool_str)
+
+        logger.debug("Fetching pool state...")
+        with tracer.span("fetch"):
+            pool_state: Optional[PoolState] = pool_state_cache.get(pool_str)
+        
+        if pool_state is None:
+            logger.warning("No pool state found, aborting transaction.")
+            return False
+        logger.debug("Pool state fetched successfully.")
+
+        if pool_state.status != 0:
+            logger.warning("This pool is no longer tradable on Launch Lab - it has migrated to Raydium CPMM...")
+            return
+        
+        if pool_state.global_config != GLOBAL_CONFIG:
+            logger.warning("Only Constant Product Curve is supported at this time...")
+            return
+
+        logger.debug("Calculating transaction amounts...")
+        sol_decimal = 1e9
+        token_decimal = 10 ** pool_state.base_decimals
+        slippage_adjustment = 1 - (slippage / 100)
+        
+        amount_in = int(sol_in * sol_decimal)
+        logger.info("Amount in (SOL): %s | Lamports: %s", sol_in, amount_in)
+
+        protocol_fee_pct, platform_fee_pct = get_fee_pcts(pool_state)
+
+        with tracer.span("quote"):
+            raw_amount_out = constant_product_buy_exact_in(
+                pool_state.virtual_base, 
+                pool_state.virtual_quote, 
+                pool_state.real_base, 
+                pool_state.real_quote, 
+                amount_in,
+                protocol_fee_pct, 
+                platform_fee_pct,
+                0
+            )
+
+        minimum_amount_out = int(raw_amount_out * slippage_adjustment)
+
+        logger.info("Expected amount out (before slippage): %s", raw_amount_out / token_decimal)
+        logger.info("Minimum amount out (after %s%% slippage): %s", slippage, minimum_amount_out / token_decimal)
+
+        logger.debug("Checking for existing token account...")
+        with tracer.span("fetch"):
+            token_account_check = client.get_token_accounts_by_owner(
+                payer.pubkey(), 
+                TokenAccountOpts(pool_state.base_mint), 
+                Processed
+                )
+        
+        if token_account_check.value:
+            token_account = token_account_check.value[0].pubkey
+            logger.debug("Existing token account found.")
+        else:
+            token_account = None
+            logger.debug("No existing token account found; creating associated token account.")
+
+        logger.debug("Preparing swap transaction...")
+        return send_buy(pool_state, BUY_EXACT_IN, amount_in, minimum_amount_out, amount_in, token_account, payer)
+    except Exception as e:
+        logger.error("Error occurred during transaction: %s", e)
+        return False
+
+@traced("trade")
+def sell(pool_str: str, percentage: int = 100, slippage: int = 5, payer: Keypair = payer_keypair) -> bool:
+    try:
+        logger.info("Starting sell transaction for pool: %s", pool_str)
+
+        logger.debug("Fetching pool state...")
+        with tracer.span("fetch"):
+            pool_state: Optional[PoolState] = pool_state_cache.get(pool_str)
+        if pool_state is None:
+            logger.warning("No pool state found, aborting transaction.")
+            return False
+        logger.debug("Pool state fetched successfully.")
+
+        if pool_state.status != 0:
+            logger.warning("This pool is no longer tradable on Launch Lab - it has migrated to Raydium CPMM...")
+            return
+        
+        if pool_state.global_config != GLOBAL_CONFIG:
+            logger.warning("Only Constant Product Curve is supported at this time...")
+            return
+
+        if not (1 <= percentage <= 100):
+            logger.warning("Percentage must be between 1 and 100.")
+            return False
+
+        logger.debug("Retrieving token balance...")
+        with tracer.span("fetch"):
+            token_balance = get_token_balance(pool_state.base_mint, payer.pubkey())
+        if token_balance is None or token_balance == 0:
+            logger.warning("Token balance is zero. Nothing to sell.")
+            return False
+
+        logger.debug("Calculating transaction amounts...")
+        sol_decimal = 1e9
+        token_decimal = 10 ** pool_state.base_decimals
+        slippage_adjustment = 1 - (slippage / 100)
+
+        amount_in = int(token_balance * (percentage / 100))
+        logger.info("Base amount in (tokens): %s", amount_in / token_decimal)
+
+        protocol_fee_pct, platform_fee_pct = get_fee_pcts(pool_state)
+
+        with tracer.span("quote"):
+            raw_amount_out = constant_product_sell_exact_in(
+                pool_state.virtual_base,
+                pool_state.virtual_quote,
+                pool_state.real_base,
+                pool_state.real_quote,
+                amount_in,
+                protocol_fee_pct,
+                platform_fee_pct,
+                0
+            )
+
+        min_amount_out = int(raw_amount_out * slippage_adjustment)
+        logger.info("Expected amount out (before slippage): %s", raw_amount_out / sol_decimal)
+        logger.info("Minimum quote out (after %s%% slippage): %s", slippage, min_amount_out / sol_decimal)
+
+        logger.debug("Preparing swap transaction...")
+        if percentage == 100:
+            logger.debug("Preparing to close token account (100% sell)...")
+        return send_sell(
+            pool_state, SELL_EXACT_IN, amount_in, min_amount_out, min_amount_out, percentage == 100, payer
+        )
+    
+    except Exception as e:
+        logger.error("Error occurred during transaction: %s", e)
+        return False
+
+@traced("trade")
+def buy_exact_out(pool_str: str, token_amount: float, slippage: int = 5, payer: Keypair = payer_keypair) -> bool:
+    try:
+        logger.info("Starting exact-out buy transaction for pool: %s", pool_str)
+
+        logger.debug("Fetching pool state...")
+        with tracer.span("fetch"):
+            pool_state: Optional[PoolState] = pool_state_cache.get(pool_str)
+        if pool_state is None:
+            logger.warning("No pool state found, aborting transaction.")
+            return False
+        logger.debug("Pool state fetched successfully.")
+
+        if pool_state.status != 0:
+            logger.warning("This pool is no longer tradable on Launch Lab - it has migrated to Raydium CPMM...")
+            return False
+
+        if pool_state.global_config != GLOBAL_CONFIG:
+            logger.warning("Only Constant Product Curve is supported at this time...")
+            return False
+
+        logger.debug("Calculating transaction amounts...")
+        sol_decimal = 1e9
+        token_decimal = 10 ** pool_state.base_decimals
+
+        amount_out = int(token_amount * token_decimal)
+        protocol_fee_pct, platform_fee_pct = get_fee_pcts(pool_state)
+
+        with tracer.span("quote"):
+            amount_in = constant_product_buy_exact_out(
+                pool_state.virtual_base,
+                pool_state.virtual_quote,
+                pool_state.real_base,
+                pool_state.real_quote,
+                amount_out,
+                protocol_fee_pct,
+                platform_fee_pct,
+                0
+            )
+        if amount_in is None:
+            logger.warning("Requested amount exceeds what the pool can provide.")
+            return False
+
+        maximum_amount_in = int(amount_in * (1 + slippage / 100))
+        logger.info("Amount out (tokens): %s", amount_out / token_decimal)
+        logger.info("Expected amount in (SOL): %s", amount_in / sol_decimal)
+        logger.info("Maximum amount in (after %s%% slippage): %s", slippage, maximum_amount_in / sol_decimal)
+
+        logger.debug("Checking for existing token account...")
+        with tracer.span("fetch"):
+            token_account_check = client.get_token_accounts_by_owner(
+                payer.pubkey(),
+                TokenAccountOpts(pool_state.base_mint),
+                Processed
+                )
+        token_account = token_account_check.value[0].pubkey if token_account_check.value else None
+
+        logger.debug("Preparing swap transaction...")
+        return send_buy(
+            pool_state, BUY_EXACT_OUT, amount_out, maximum_amount_in, maximum_amount_in, token_account, payer
+        )
+    except Exception as e:
+        logger.error("Error occurred during transaction: %s", e)
+        return False
+
+@traced("trade")
+def sell_exact_out(pool_str: str, sol_out: float, slippage: int = 5, payer: Keypair = payer_keypair) -> bool:
+    try:
+        logger.info("Starting exact-out sell transaction for pool: %s", pool_str)
+
+        logger.debug("Fetching pool state...")
+        with tracer.span("fetch"):
+            pool_state: Optional[PoolState] = pool_state_cache.get(pool_str)
+        if pool_state is None:
+            logger.warning("No pool state found, aborting transaction.")
+            return False
+        logger.debug("Pool state fetched successfully.")
+
+        if pool_state.status != 0:
+            logger.warning("This pool is no longer tradable on Launch Lab - it has migrated to Raydium CPMM...")
+            return False
+
+        if pool_state.global_config != GLOBAL_CONFIG:
+            logger.warning("Only Constant Product Curve is supported at this time...")
+            return False
+
+        logger.debug("Retrieving token balance...")
+        with tracer.span("fetch"):
+            token_balance = get_token_balance(pool_state.base_mint, payer.pubkey())
+        if token_balance is None or token_balance == 0:
+            logger.warning("Token balance is zero. Nothing to sell.")
+            return False
+
+        logger.debug("Calculating transaction amounts...")
+        sol_decimal = 1e9
+        token_decimal = 10 ** pool_state.base_decimals
+
+        amount_out = int(sol_out * sol_decimal)
+        protocol_fee_pct, platform_fee_pct = get_fee_pcts(pool_state)
+
+        with tracer.span("quote"):
+            amount_in = constant_product_sell_exact_out(
+                pool_state.virtual_base,
+                pool_state.virtual_quote,
+                pool_state.real_base,
+                pool_state.real_quote,
+                amount_out,
+                protocol_fee_pct,
+                platform_fee_pct,
+                0
+            )
+        if amount_in is None or amount_in > token_balance:
+            logger.warning("Token balance is too low for the requested amount out.")
+            return False
+
+        maximum_amount_in = min(int(amount_in * (1 + slippage / 100)), token_balance)
+        logger.info("Amount out (SOL): %s", amount_out / sol_decimal)
+        logger.info("Expected amount in (tokens): %s", amount_in / token_decimal)
+        logger.info("Maximum amount in (after %s%% slippage): %s", slippage, maximum_amount_in / token_decimal)
+
+        logger.debug("Preparing swap transaction...")
+        return send_sell(pool_state, SELL_EXACT_OUT, amount_out, maximum_amount_in, amount_out, payer=payer)
+    except Exception as e:
+        logger.error("Error occurred during transaction: %s", e)
+        return False
+
+@traced("trade")
+def sell_many(pool_strs: list, percentage: int = 100, slippage: int = 5, payer: Keypair = payer_keypair) -> Dict[str, Optional[bool]]:
+    try:
+        if not (1 <= percentage <= 100):
+            logger.warning("Percentage must be between 1 and 100.")
+            return {}
+
+        logger.debug("Fetching pool states and token balances...")
+        with tracer.span("fetch"):
+            pool_states = fetch_pool_states(pool_strs)
+            token_accounts = get_token_accounts(payer.pubkey())
+
+        sells = []
+        for pool_str, pool_state in pool_states.items():
+            if pool_state is None:
+                logger.warning("No pool state found for %s, skipping.", pool_str)
+                continue
+            if pool_state.status != 0 or pool_state.global_config != GLOBAL_CONFIG:
+                logger.warning("Pool %s is not tradable on the constant product curve, skipping.", pool_str)
+                continue
+            token_account, token_balance = token_accounts.get(pool_state.base_mint, (None, 0))
+            if not token_balance:
+                logger.info("Token balance is zero for %s, skipping.", pool_str)
+                continue
+
+            amount_in = int(token_balance * (percentage / 100))
+            protocol_fee_pct, platform_fee_pct = get_fee_pcts(pool_state)
+            with tracer.span("quote"):
+                raw_amount_out = constant_product_sell_exact_in(
+                    pool_state.virtual_base,
+                    pool_state.virtual_quote,
+                    pool_state.real_base,
+                    pool_state.real_quote,
+                    amount_in,
+                    protocol_fee_pct,
+                    platform_fee_pct,
+                    0
+                )
+            sells.append((pool_str, pool_state, token_account, amount_in, int(raw_amount_out * (1 - slippage / 100))))
+
+        if not sells:
+            logger.warning("Nothing to sell.")
+            return {}
+
+        if DYNAMIC_PRIORITY_FEE:
+            unit_price = max(fee_oracle.get(pool_state.pool, accounts=fee_accounts(pool_state)) for _, pool_state, _, _, _ in sells)
+        else:
+            unit_price = UNIT_PRICE
+        price_instruction = set_compute_unit_price(unit_price)
+        if PERSISTENT_WSOL:
+            wsol_account = get_wsol_account(payer)
+            if not wsol_account.is_open() and not wrap_sol(payer=payer):
+                logger.warning("Could not open the WSOL account, aborting transaction.")
+                return {}
+        else:
+            with tracer.span("fetch"):
+                balance_needed = Token.get_min_balance_rent_for_exempt_for_account(client)
+
+        def open_transaction() -> tuple:
+            if PERSISTENT_WSOL:
+                return get_wsol_ata(payer), [price_instruction], []
+            # Every transaction gets its own seeded WSOL account, so one that lands late or is resent
+            # can never collide with the next one.
+            wsol_token_account, create_wsol, init_wsol, close_wsol = create_wsol_instructions(balance_needed, payer)
+            return wsol_token_account, [price_instruction, create_wsol, init_wsol], [close_wsol]
+
+        def build_groups(wsol_token_account: Pubkey, indexes) -> list:
+            return [
+                build_sell_swap_instructions(
+                    sells[index][1], sells[index][2], wsol_token_account, sells[index][3], sells[index][4],
+                    percentage == 100, payer,
+                )
+                for index in indexes
+            ]
+
+        with tracer.span("build"):
+            wsol_token_account, header, footer = open_transaction()
+            transactions = pack_instructions(build_groups(wsol_token_account, range(len(sells))), header, footer, payer=payer)
+        logger.info("Selling %s positions in %s transactions.", len(sells), len(transactions))
+
+        results = {}
+        for number, (instructions, indexes) in enumerate(transactions):
+            if number and not PERSISTENT_WSOL:
+                # Seeds have a fixed length, so the transaction keeps the size it was packed at.
+                with tracer.span("build"):
+                    wsol_token_account, header, footer = open_transaction()
+                    instructions = assemble_instructions(
+                        build_groups(wsol_token_account, indexes), header, footer, UNIT_BUDGET * len(indexes)
+                    )
+            confirmed = send_and_confirm(partial(sign_instructions, instructions, payer=payer))
+            if PERSISTENT_WSOL:
+                wsol_account.settle(confirmed, credit=sum(sells[index][4] for index in indexes))
+            for index in indexes:
+                results[sells[index][0]] = confirmed
+        return results
+    except Exception as e:
+        logger.error("Error occurred during transaction: %s", e)
+        return {}
@@ -1,220 +1,305 @@
-from datetime import datetime
-import json
-import struct
-import time
-
-import base58
-import websocket
-
-from solana.rpc.api import Client
-from solders.pubkey import Pubkey  # type: ignore
-from solders.signature import Signature  # type: ignore
-
-API_KEY = ""
-WSS = "wss://mainnet.helius-rpc.com/?api-key=" + API_KEY
-RPC = "https://mainnet.helius-rpc.com/?api-key=" + API_KEY
-CLIENT = Client(RPC)
-
-def decode_pool_create_event(hex_data: str):
-    
-    data = bytes.fromhex(hex_data)
-    offset = 16
-
-    def read_pubkey() -> str:
-        nonlocal offset
-        pk_bytes = data[offset:offset + 32]
-        offset += 32
-        return str(Pubkey.from_bytes(pk_bytes))
-
-    def read_u8() -> int:
-        nonlocal offset
-        val = data[offset]
-        offset += 1
-        return val
-
-    def read_u64() -> int:
-        nonlocal offset
-        (val,) = struct.unpack_from("<Q", data, offset)
-        offset += 8
-        return val
-
-    def read_length_prefixed_string() -> str:
-        nonlocal offset
-        if offset + 4 > len(data):
-            raise ValueError("Not enough data for string length")
-        (length,) = struct.unpack_from("<I", data, offset)
-        offset += 4
-        if offset + length > len(data):
-            raise ValueError(f"String length {length} exceeds buffer")
-        raw = data[offset:offset + length]
-        offset += length
-        return raw.decode("utf-8", errors="replace")
-
-    pool_state = read_pubkey()
-    creator = read_pubkey()
-    config = read_pubkey()
-
-    decimals = read_u8()
-    name = read_length_prefixed_string()
-    symbol = read_length_prefixed_string()
-    uri = read_length_prefixed_string()
-
-    curve_variant = read_u8()
-
-    curve_variants = {
-        0: "Constant",
-        1: "Fixed",
-        2: "Linear"
-    }
-    
-    variant = curve_variants.get(curve_variant, {})
-
-    curve_supply = read_u64()
-    curve_total_base_sell = read_u64()
-    curve_total_quote_fund_raising = read_u64()
-    curve_migrate_type = read_u8()
-
-    total_locked_amount = read_u64()
-    cliff_period = read_u64()
-    unlock_period = read_u64()
-
-    return {
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
-        "pool_state": pool_state,
-        "creator": creator,
-        "config": config,
-        "mint_params": {
-            "decimals": decimals,
-            "name": name,
-            "symbol": symbol,
-            "uri": uri,
-        },
-        "curve_params": {
-            "variant": variant,
-            "supply": curve_supply,
-            "total_base_sell": curve_total_base_sell,
-            "total_quote_fund_raising": curve_total_quote_fund_raising,
-            "migrate_type": curve_migrate_type
-        },
-        "vesting_params": {
-            "total_locked_amount": total_locked_amount,
-            "cliff_period": cliff_period,
-            "unlock_period": unlock_period,
-        }
-    }
-
-
-def on_message(ws, message):
-    try:
-        payload = json.loads(message)
-    except json.JSONDecodeError as e:
-        print(f"JSON decode error: {e}")
-        return
-
-    result = payload.get("params", {}).get("result", {}).get("value", {})
-    logs = result.get("logs", [])
-    sig_str = result.get("signature")
-
-    if not sig_str:
-        return
-
-    if not any(log.startswith("Program log: Instruction: InitializeMint2") for log in logs):
-        return
-
-    txn_sig = Signature.from_string(sig_str)
-    print(f"Txn Sig: {txn_sig}")
-
-    txn_data = get_txn(txn_sig=txn_sig)
-    if not txn_data:
-        return
-
-    pool_create_event = None
-
-    try:
-        for inner_instruction in txn_data.get("innerInstructions", []):
-            for instruction in inner_instruction.get("instructions", []):
-                if len(instruction.get("accounts", [])) != 1:
-                    continue
-                try:
-                    decoded = base58.b58decode(instruction["data"])
-                    decoded_hex = decoded.hex()
-                    if len(decoded_hex) > 200:
-                        pool_create_event = decode_pool_create_event(decoded_hex)
-                        if pool_create_event:
-                            raise StopIteration  # exit both loops once we decode successfully
-                except:
-                    continue
-    except StopIteration:
-        pass
-
-    if not pool_create_event:
-        return
-
-    mint = None
-    for post_token_balance in txn_data.get("postTokenBalances", []):
-        mint = post_token_balance.get("mint")
-        if mint != "So11111111111111111111111111111111111111112":
-            break
-
-    if mint:
-        pool_create_event = {"mint": mint, **pool_create_event}
-        print(pool_create_event, "\n")
-
-
-
-def on_error(ws, error):
-    print(f"WebSocket error: {error}")
-
-
-def on_close(ws, close_status_code, close_msg):
-    print("WebSocket connection closed")
-
-
-def on_open(ws):
-    sub_req = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "logsSubscribe",
-        "params": [
-            {"mentions": ["LanMV9sAd7wArD4vJFi2qDdfnVhFxYSUg6eADduJ3uj"]},
-            {"commitment": "confirmed"},
-        ],
-    }
-    try:
-        ws.send(json.dumps(sub_req))
-        print("Subscribed to logs...")
-    except Exception as e:
-        print(f"Error sending subscription request: {e}")
-
-
-def start_websocket():
-    ws = websocket.WebSocketApp(
-        WSS, on_message=on_message, on_error=on_error, on_close=on_close
-    )
-    ws.on_open = on_open
-    ws.run_forever()
-
-def get_txn(txn_sig: Signature, max_retries: int = 20, retry_interval: int = 3) -> bool:
-    retries = 1
-    
-    while retries < max_retries:
-        try:
-            txn_res = CLIENT.get_transaction(txn_sig, encoding="json", commitment="confirmed", max_supported_transaction_version=0)
-            txn_json = json.loads(txn_res.value.transaction.meta.to_json())
-            
-            if txn_json['err'] is None:
-                return txn_json
-            
-            if txn_json['err']:
-                return None
-        except Exception as e:
-            retries += 1
-            time.sleep(retry_interval)
-    
-    return None
-
-if __name__ == "__main__":
-    try:
-        start_websocket()
-    except Exception as e:
-        print(f"Unexpected error in main event loop: {e}")
\ No newline at end of file
+import asyncio
+from collections import deque
+from datetime import datetime
+import json
+import time
+from typing import Callable, Optional
+
+import websockets
+
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.types import DataSliceOpts
+from solders.pubkey import Pubkey  # type: ignore
+from solders.signature import Signature  # type: ignore
+
+from event_decoder import events_from_inner_instructions, events_from_logs, logs_truncated
+from pool_index import PoolIndex
+
+API_KEY = ""
+WSS = "wss://mainnet.helius-rpc.com/?api-key=" + API_KEY
+RPC = "https://mainnet.helius-rpc.com/?api-key=" + API_KEY
+CLIENT = AsyncClient(RPC)
+
+LISTENER_WORKERS = 8
+LISTENER_QUEUE_SIZE = 1000
+LISTENER_METRICS_INTERVAL = 30
+RECONNECT_DELAY = 1
+MAX_RECONNECT_DELAY = 30
+LATENCY_WINDOW = 1000
+POOL_BASE_MINT_OFFSET = 205
+TRADE_INSTRUCTIONS = ("Program log: Instruction: Buy", "Program log: Instruction: Sell")
+
+def mint_from_transaction(txn_data: dict) -> Optional[str]:
+    mint = None
+    for post_token_balance in txn_data.get("postTokenBalances", []):
+        mint = post_token_balance.get("mint")
+        if mint != "So11111111111111111111111111111111111111112":
+            break
+    return mint
+
+async def get_pool_mint(pool_str: str) -> Optional[str]:
+    try:
+        response = await CLIENT.get_account_info(
+            Pubkey.from_string(pool_str),
+            commitment="confirmed",
+            data_slice=DataSliceOpts(offset=POOL_BASE_MINT_OFFSET, length=32),
+        )
+    except Exception as e:
+        print(f"Error fetching base mint for {pool_str}: {e}")
+        return None
+    if response.value is None or len(response.value.data) != 32:
+        return None
+    return str(Pubkey.from_bytes(response.value.data))
+
+async def get_block_time(slot: Optional[int]) -> Optional[int]:
+    if slot is None:
+        return None
+    try:
+        return (await CLIENT.get_block_time(slot)).value
+    except Exception as e:
+        print(f"Error fetching block time for slot {slot}: {e}")
+        return None
+
+async def get_txn(txn_sig: Signature, max_retries: int = 20, retry_interval: int = 3) -> Optional[dict]:
+    retries = 1
+
+    while retries < max_retries:
+        try:
+            txn_res = await CLIENT.get_transaction(txn_sig, encoding="json", commitment="confirmed", max_supported_transaction_version=0)
+            txn_json = json.loads(txn_res.value.transaction.meta.to_json())
+            txn_json["blockTime"] = txn_res.value.block_time
+
+            if txn_json['err'] is None:
+                return txn_json
+
+            if txn_json['err']:
+                return None
+        except Exception as e:
+            retries += 1
+            await asyncio.sleep(retry_interval)
+
+    return None
+
+class ListenerMetrics:
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.received = 0
+        self.enqueued = 0
+        self.decoded = 0
+        self.trades = 0
+        self.from_logs = 0
+        self.from_transaction = 0
+        self.failed = 0
+        self.reconnects = 0
+        self.max_queue_depth = 0
+        self.latencies = deque(maxlen=window)
+
+    def snapshot(self, queue: asyncio.Queue) -> dict:
+        latencies = sorted(self.latencies)
+
+        def percentile(pct: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(len(latencies) * pct / 100))]
+
+        return {
+            "queue_depth": queue.qsize(),
+            "max_queue_depth": self.max_queue_depth,
+            "received": self.received,
+            "enqueued": self.enqueued,
+            "decoded": self.decoded,
+            "trades": self.trades,
+            "from_logs": self.from_logs,
+            "from_transaction": self.from_transaction,
+            "failed": self.failed,
+            "reconnects": self.reconnects,
+            "latency_p50": percentile(50),
+            "latency_p99": percentile(99),
+        }
+
+class LaunchLabListener:
+    def __init__(
+        self,
+        wss: str = WSS,
+        workers: int = LISTENER_WORKERS,
+        queue_size: int = LISTENER_QUEUE_SIZE,
+        on_event: Optional[Callable[[dict], None]] = None,
+        on_trade: Optional[Callable[[dict], None]] = None,
+        on_resubscribe: Optional[Callable[[], None]] = None,
+        metrics_interval: float = LISTENER_METRICS_INTERVAL,
+        pool_index: Optional[PoolIndex] = None,
+    ):
+        self.wss = wss
+        self.workers = workers
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.on_event = on_event
+        self.on_trade = on_trade
+        self.on_resubscribe = on_resubscribe
+        self.metrics_interval = metrics_interval
+        self.metrics = ListenerMetrics()
+        self.pool_index = pool_index
+
+    async def run(self) -> None:
+        tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        if self.metrics_interval:
+            tasks.append(asyncio.create_task(self._report_metrics()))
+        try:
+            await self._listen()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _listen(self) -> None:
+        delay = RECONNECT_DELAY
+        while True:
+            try:
+                async with websockets.connect(self.wss, ping_interval=20) as ws:
+                    await self._subscribe(ws)
+                    delay = RECONNECT_DELAY
+                    # Notifications were missed while disconnected.
+                    if self.metrics.reconnects and self.on_resubscribe:
+                        self.on_resubscribe()
+                    async for message in ws:
+                        await self._handle(message, time.monotonic())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"WebSocket error: {e}")
+
+            self.metrics.reconnects += 1
+            print(f"WebSocket connection closed, reconnecting in {delay}s...")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    async def _subscribe(self, ws) -> None:
+        sub_req = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "logsSubscribe",
+            "params": [
+                {"mentions": ["LanMV9sAd7wArD4vJFi2qDdfnVhFxYSUg6eADduJ3uj"]},
+                {"commitment": "confirmed"},
+            ],
+        }
+        await ws.send(json.dumps(sub_req))
+        print("Subscribed to logs...")
+
+    async def _handle(self, message, received_at: float) -> None:
+        try:
+            payload = json.loads(message)
+        except json.JSONDecodeError as e:
+            print(f"JSON decode error: {e}")
+            return
+
+        result = payload.get("params", {}).get("result", {})
+        value = result.get("value", {})
+        logs = value.get("logs", [])
+        sig_str = value.get("signature")
+
+        if not sig_str or value.get("err") is not None:
+            return
+        self.metrics.received += 1
+
+        slot = result.get("context", {}).get("slot")
+        creates_pool = any(log.startswith("Program log: Instruction: InitializeMint2") for log in logs)
+        if not creates_pool and not logs_truncated(logs):
+            # Trades decode from the logs alone; handling them here keeps them in notification order.
+            events = events_from_logs(logs)
+            if events:
+                self.dispatch(sig_str, slot, events)
+                return
+            # A trade that emits its event through a self-CPI leaves no Program data line, so the transaction is fetched.
+            if not any(log.startswith(TRADE_INSTRUCTIONS) for log in logs):
+                return
+
+        # A full queue blocks the reader, which stops reading the socket until the workers catch up.
+        await self.queue.put((received_at, sig_str, slot, logs))
+        self.metrics.enqueued += 1
+        self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, self.queue.qsize())
+
+    async def _worker(self) -> None:
+        while True:
+            received_at, sig_str, slot, logs = await self.queue.get()
+            try:
+                for name, event in await self.process(sig_str, slot, logs):
+                    if name == "PoolCreateEvent":
+                        self.metrics.decoded += 1
+                        self.metrics.latencies.append(time.monotonic() - received_at)
+            except Exception as e:
+                self.metrics.failed += 1
+                print(f"Error processing {sig_str}: {e}")
+            finally:
+                self.queue.task_done()
+
+    async def process(self, sig_str: str, slot: Optional[int], logs: list) -> list:
+        events = events_from_logs(logs)
+        creates_pool = any(log.startswith("Program log: Instruction: InitializeMint2") for log in logs)
+        mint = None
+        block_time = None
+
+        if logs_truncated(logs) or not events or (creates_pool and not any(name == "PoolCreateEvent" for name, _ in events)):
+            txn_sig = Signature.from_string(sig_str)
+            print(f"Txn Sig: {txn_sig}")
+
+            txn_data = await get_txn(txn_sig=txn_sig)
+            if txn_data:
+                events = events_from_inner_instructions(txn_data) or events
+                mint = mint_from_transaction(txn_data)
+                block_time = txn_data.get("blockTime")
+                self.metrics.from_transaction += 1
+            else:
+                # Still dispatch whatever the logs held, e.g. the trade of a truncated create+buy.
+                self.metrics.from_logs += 1
+        else:
+            self.metrics.from_logs += 1
+
+        handled = self.dispatch(sig_str, slot, events)
+        for name, event in events:
+            if name != "PoolCreateEvent":
+                continue
+            event = {
+                "mint": mint or await get_pool_mint(event["pool_state"]),
+                "signature": sig_str,
+                "slot": slot,
+                "block_time": block_time or await get_block_time(slot),
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
+                **event,
+            }
+            if not event["mint"]:
+                continue
+            if self.pool_index is not None:
+                self.pool_index.apply_pool_create_event(event)
+            print(event, "\n")
+            if self.on_event:
+                self.on_event(event)
+            handled.append((name, event))
+        return handled
+
+    def dispatch(self, sig_str: str, slot: Optional[int], events: list) -> list:
+        handled = []
+        for name, event in events:
+            if name != "TradeEvent":
+                continue
+            event = {"signature": sig_str, "slot": slot, **event}
+            self.metrics.trades += 1
+            if self.on_trade:
+                try:
+                    self.on_trade(event)
+                except Exception as e:
+                    self.metrics.failed += 1
+                    print(f"Error handling trade {sig_str}: {e}")
+            handled.append((name, event))
+        return handled
+
+    async def _report_metrics(self) -> None:
+        while True:
+            await asyncio.sleep(self.metrics_interval)
+            print(f"Listener metrics: {self.metrics.snapshot(self.queue)}")
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(LaunchLabListener(pool_index=PoolIndex()).run())
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"Unexpected error in main event loop: {e}")
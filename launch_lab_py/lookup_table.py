@@ -0,0 +1,154 @@
+import json
+import logging
+import os
+import struct
+import threading
+from typing import List, Optional
+
+from solana.rpc.commitment import Processed
+
+from solders.address_lookup_table_account import (  # type: ignore
+    ID as LOOKUP_TABLE_PROGRAM_ID,
+    AddressLookupTable,
+    AddressLookupTableAccount,
+    derive_lookup_table_address,
+)
+from solders.instruction import AccountMeta, Instruction  # type: ignore
+from solders.pubkey import Pubkey  # type: ignore
+from solders.system_program import ID as SYSTEM_PROGRAM_ID  # type: ignore
+
+from config import client
+from constants import *
+from pool_state import PoolState
+
+logger = logging.getLogger(__name__)
+
+LOOKUP_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lookup_table.json")
+MAX_EXTEND_ADDRESSES = 20
+CREATE_LOOKUP_TABLE = struct.Struct("<IQB")
+EXTEND_LOOKUP_TABLE = struct.Struct("<IQ")
+ACTIVE_DEACTIVATION_SLOT = 2 ** 64 - 1
+
+# Programs an instruction invokes always stay in the static keys, so only passive accounts go in the table.
+# The token program is only passed as an account in persistent WSOL swaps, where it loads from the table.
+STATIC_ADDRESSES = [
+    AUTHORITY,
+    GLOBAL_CONFIG,
+    RAYDIUM_PLATFORM,
+    EVENT_AUTH,
+    WSOL,
+    TOKEN_PROGRAM_ID,
+]
+
+def pool_addresses(pool_state: PoolState) -> list:
+    return [pool_state.pool, pool_state.platform_config, pool_state.base_mint, pool_state.base_vault, pool_state.quote_vault]
+
+def build_create_lookup_table_instruction(authority: Pubkey, payer: Pubkey, recent_slot: int) -> tuple:
+    table, bump = derive_lookup_table_address(authority, recent_slot)
+    accounts = [
+        AccountMeta(table, False, True),
+        AccountMeta(authority, True, False),
+        AccountMeta(payer, True, True),
+        AccountMeta(SYSTEM_PROGRAM_ID, False, False),
+    ]
+    return table, Instruction(LOOKUP_TABLE_PROGRAM_ID, CREATE_LOOKUP_TABLE.pack(0, recent_slot, bump), accounts)
+
+def build_extend_lookup_table_instruction(table: Pubkey, authority: Pubkey, payer: Pubkey, addresses: list) -> Instruction:
+    accounts = [
+        AccountMeta(table, False, True),
+        AccountMeta(authority, True, False),
+        AccountMeta(payer, True, True),
+        AccountMeta(SYSTEM_PROGRAM_ID, False, False),
+    ]
+    data = EXTEND_LOOKUP_TABLE.pack(2, len(addresses)) + b"".join(bytes(address) for address in addresses)
+    return Instruction(LOOKUP_TABLE_PROGRAM_ID, data, accounts)
+
+class LookupTableCache:
+    def __init__(self, path: str = LOOKUP_TABLE_PATH):
+        self.path = path
+        self.address: Optional[Pubkey] = None
+        self.addresses: List[Pubkey] = []
+        self.version = 0
+        self.verified = True
+        self.loaded = False
+        self._tables: list = []
+        self._lock = threading.Lock()
+
+    def set(self, address: Optional[Pubkey], addresses: list, verified: bool = True) -> None:
+        self.address = address
+        self.addresses = list(addresses)
+        self.verified = verified
+        self.loaded = True
+        self._tables = [AddressLookupTableAccount(address, self.addresses)] if address and self.addresses else []
+        self.version += 1
+
+    def ensure_loaded(self) -> None:
+        # Read on first use rather than at import, so importing has no side effects.
+        with self._lock:
+            if not self.loaded:
+                self.loaded = True
+                self.load()
+
+    def tables(self) -> list:
+        self.ensure_loaded()
+        if not self.verified:
+            self.verify()
+        return self._tables
+
+    def verify(self) -> bool:
+        # A table loaded from disk is checked against the chain once before anything compiles against it.
+        with self._lock:
+            if self.verified:
+                return bool(self._tables)
+            address = self.address
+            if not self.refresh():
+                logger.warning("Lookup table %s from %s is not usable, compiling without it.", address, self.path)
+                self.set(None, [])
+            return bool(self._tables)
+
+    def missing(self, addresses: list) -> list:
+        self.ensure_loaded()
+        known = set(self.addresses)
+        return [address for address in dict.fromkeys(addresses) if address not in known]
+
+    def load(self) -> bool:
+        try:
+            with open(self.path) as f:
+                cached = json.load(f)
+            self.set(
+                Pubkey.from_string(cached["address"]),
+                [Pubkey.from_string(address) for address in cached["addresses"]],
+                verified=False,
+            )
+            return True
+        except FileNotFoundError:
+            return False
+        except (KeyError, ValueError) as e:
+            logger.error("Error loading lookup table cache: %s", e)
+            return False
+
+    def save(self) -> None:
+        with open(self.path, "w") as f:
+            json.dump({"address": str(self.address), "addresses": [str(address) for address in self.addresses]}, f, indent=2)
+
+    def refresh(self, address: Optional[Pubkey] = None) -> bool:
+        address = address or self.address
+        if address is None:
+            return False
+        try:
+            account = client.get_account_info(address, commitment=Processed).value
+            if account is None:
+                logger.warning("Lookup table %s not found.", address)
+                return False
+            table = AddressLookupTable.deserialize(bytes(account.data))
+            if table.meta.deactivation_slot != ACTIVE_DEACTIVATION_SLOT:
+                logger.warning("Lookup table %s is deactivated.", address)
+                return False
+            self.set(address, table.addresses)
+            self.save()
+            return True
+        except Exception as e:
+            logger.error("Error fetching lookup table %s: %s", address, e)
+            return False
+
+lookup_table_cache = LookupTableCache()
@@ -0,0 +1,103 @@
+import base58
+import numpy as np
+
+from solana.rpc.commitment import Processed
+from solana.rpc.types import DataSliceOpts, MemcmpOpts
+from solders.pubkey import Pubkey  # type: ignore
+
+from config import client, async_client
+from constants import PROGRAM_ID, QUOTE_MINT, MAX_MULTIPLE_ACCOUNTS
+from pool_state import POOL_STATE_DISCRIMINATOR, POOL_STATE_SIZE
+
+# status .. base_mint of PoolState; the quote mint is matched by a memcmp filter instead.
+SNAPSHOT_OFFSET = 17
+SNAPSHOT_LENGTH = 220
+QUOTE_MINT_OFFSET = 237
+GLOBAL_CONFIG_CURVE_TYPE_OFFSET = 16
+
+SNAPSHOT_SLICE_DTYPE = np.dtype([
+    ("status", "u1"),
+    ("base_decimals", "u1"),
+    ("quote_decimals", "u1"),
+    ("migrate_type", "u1"),
+    ("supply", "<u8"),
+    ("total_base_sell", "<u8"),
+    ("virtual_base", "<u8"),
+    ("virtual_quote", "<u8"),
+    ("real_base", "<u8"),
+    ("real_quote", "<u8"),
+    ("total_quote_fund_raising", "<u8"),
+    ("quote_protocol_fee", "<u8"),
+    ("platform_fee", "<u8"),
+    ("migrate_fee", "<u8"),
+    ("vesting", "V40"),
+    ("global_config", "V32"),
+    ("platform_config", "V32"),
+    ("base_mint", "V32"),
+])
+
+SNAPSHOT_DTYPE = np.dtype([("pool", "V32")] + [
+    (name, SNAPSHOT_SLICE_DTYPE.fields[name][0]) for name in SNAPSHOT_SLICE_DTYPE.names if name != "vesting"
+])
+
+def snapshot_filters(quote_mint: str = QUOTE_MINT) -> list:
+    return [
+        POOL_STATE_SIZE,
+        MemcmpOpts(offset=0, bytes=base58.b58encode(POOL_STATE_DISCRIMINATOR).decode()),
+        MemcmpOpts(offset=QUOTE_MINT_OFFSET, bytes=quote_mint),
+    ]
+
+def decode_snapshot(accounts: list) -> np.ndarray:
+    accounts = [account for account in accounts if len(account.account.data) == SNAPSHOT_LENGTH]
+
+    sliced = np.frombuffer(
+        b"".join(account.account.data for account in accounts), dtype=SNAPSHOT_SLICE_DTYPE
+    )
+    snapshot = np.empty(len(accounts), dtype=SNAPSHOT_DTYPE)
+    snapshot["pool"] = np.frombuffer(b"".join(bytes(account.pubkey) for account in accounts), dtype="V32")
+    for name in SNAPSHOT_DTYPE.names[1:]:
+        snapshot[name] = sliced[name]
+    return snapshot
+
+def fetch_market_snapshot(quote_mint: str = QUOTE_MINT) -> np.ndarray:
+    response = client.get_program_accounts(
+        PROGRAM_ID,
+        commitment=Processed,
+        data_slice=DataSliceOpts(offset=SNAPSHOT_OFFSET, length=SNAPSHOT_LENGTH),
+        filters=snapshot_filters(quote_mint),
+    )
+    return decode_snapshot(response.value)
+
+async def async_fetch_market_snapshot(quote_mint: str = QUOTE_MINT) -> np.ndarray:
+    response = await async_client.get_program_accounts(
+        PROGRAM_ID,
+        commitment=Processed,
+        data_slice=DataSliceOpts(offset=SNAPSHOT_OFFSET, length=SNAPSHOT_LENGTH),
+        filters=snapshot_filters(quote_mint),
+    )
+    return decode_snapshot(response.value)
+
+def snapshot_prices(snapshot: np.ndarray) -> np.ndarray:
+    quote_reserve = snapshot["virtual_quote"].astype(np.float64) + snapshot["real_quote"]
+    base_reserve = snapshot["virtual_base"].astype(np.float64) - snapshot["real_base"]
+    decimals = snapshot["base_decimals"].astype(np.int64) - snapshot["quote_decimals"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return quote_reserve / base_reserve * np.power(10.0, decimals)
+
+def snapshot_pool_strs(snapshot: np.ndarray) -> list:
+    return [base58.b58encode(bytes(pool)).decode() for pool in snapshot["pool"]]
+
+def fetch_curve_types(global_configs) -> dict:
+    pubkeys = [Pubkey.from_bytes(config) for config in global_configs]
+    curve_types = {}
+    for i in range(0, len(pubkeys), MAX_MULTIPLE_ACCOUNTS):
+        chunk = pubkeys[i:i + MAX_MULTIPLE_ACCOUNTS]
+        response = client.get_multiple_accounts(
+            chunk,
+            commitment=Processed,
+            data_slice=DataSliceOpts(offset=GLOBAL_CONFIG_CURVE_TYPE_OFFSET, length=1),
+        )
+        for pubkey, account in zip(chunk, response.value):
+            if account is not None and account.data:
+                curve_types[str(pubkey)] = account.data[0]
+    return curve_types
@@ -0,0 +1,427 @@
+import asyncio
+import base64
+import itertools
+import json
+import random
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+import websockets
+
+from solders.hash import Hash  # type: ignore
+from solders.pubkey import Pubkey  # type: ignore
+from solders.transaction import VersionedTransaction  # type: ignore
+
+from spl.token.instructions import get_associated_token_address
+
+from constants import ACCOUNT_SPACE, PROGRAM_ID, TOKEN_PROGRAM_ID
+
+SLOT_TIME = 0.4
+BLOCKHASH_VALIDITY = 150
+START_SLOT = 300_000_000
+START_BLOCK_HEIGHT = 280_000_000
+RENT_PER_BYTE = 6_960
+DEFAULT_UNITS_CONSUMED = 60_000
+
+@dataclass
+class NetworkProfile:
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    rate_limit: Optional[float] = None
+    confirm_delay: float = 0.4
+    priority_fee: int = 100_000
+    units_consumed: int = DEFAULT_UNITS_CONSUMED
+
+    def delay(self) -> float:
+        return self.latency + random.uniform(0, self.jitter)
+
+@dataclass
+class MockStats:
+    requests: Dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+    rate_limited: int = 0
+    sent: int = 0
+    notifications: int = 0
+
+class TokenBucket:
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+def account_json(data: bytes, owner: Pubkey, lamports: int, data_slice: Optional[dict] = None) -> dict:
+    if data_slice:
+        data = data[data_slice["offset"]:data_slice["offset"] + data_slice["length"]]
+    return {
+        "data": [base64.b64encode(data).decode(), "base64"],
+        "executable": False,
+        "lamports": lamports,
+        "owner": str(owner),
+        "rentEpoch": 0,
+        "space": len(data),
+    }
+
+class MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+class MockSolana:
+    def __init__(self, fixtures: Optional[dict] = None, profile: Optional[NetworkProfile] = None, host: str = "127.0.0.1"):
+        self.profile = profile or NetworkProfile()
+        self.host = host
+        self.stats = MockStats()
+        self.accounts: Dict[str, tuple] = {}
+        self.token_balances: Dict[tuple, int] = {}
+        self.transactions: Dict[str, dict] = {}
+        self.statuses: Dict[str, tuple] = {}
+        self.rpc: Optional[str] = None
+        self.wss: Optional[str] = None
+        self.started_at = time.monotonic()
+        self._bucket = TokenBucket(self.profile.rate_limit) if self.profile.rate_limit else None
+        self._subscription_ids = itertools.count(1)
+        self._logs_subscribers: Dict[object, int] = {}
+        self._signature_subscribers: Dict[str, list] = {}
+        self._lock = threading.Lock()
+        self._http: Optional[MockHTTPServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ws_server = None
+        self._threads: list = []
+        if fixtures:
+            self.load_fixtures(fixtures)
+
+    def load_fixtures(self, fixtures: dict) -> None:
+        if "pool_state" in fixtures:
+            self.add_account(fixtures["pool"], base64.b64decode(fixtures["pool_state"]), PROGRAM_ID)
+        for name in ("trade_notification", "create_notification"):
+            value = fixtures.get(name, {}).get("params", {}).get("result", {}).get("value")
+            if value:
+                meta = fixtures["create_transaction"]["meta"] if name == "create_notification" and "create_transaction" in fixtures else None
+                self.add_transaction(value["signature"], value["logs"], meta)
+
+    def add_account(self, pubkey: str, data: bytes, owner: Pubkey = PROGRAM_ID, lamports: Optional[int] = None) -> None:
+        with self._lock:
+            self.accounts[str(pubkey)] = (bytes(data), owner, lamports if lamports is not None else self.rent(len(data)))
+
+    def set_token_balance(self, owner: Pubkey, mint: Pubkey, amount: int) -> None:
+        with self._lock:
+            self.token_balances[(str(owner), str(mint))] = amount
+
+    def add_transaction(self, signature: str, logs: list, meta: Optional[dict] = None) -> None:
+        meta = dict(meta or {})
+        meta.setdefault("err", None)
+        meta.setdefault("fee", 5000)
+        meta.setdefault("preBalances", [])
+        meta.setdefault("postBalances", [])
+        meta.setdefault("innerInstructions", [])
+        meta.setdefault("preTokenBalances", [])
+        meta.setdefault("postTokenBalances", [])
+        meta["logMessages"] = logs
+        with self._lock:
+            self.transactions[signature] = meta
+            self.statuses[signature] = (self.slot(), None, time.monotonic())
+
+    @property
+    def running(self) -> bool:
+        return self._http is not None
+
+    def start(self) -> None:
+        if self.running:
+            return
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                status, response = mock.handle_http(payload)
+                body = json.dumps(response).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._http = MockHTTPServer((self.host, 0), Handler)
+        self.rpc = f"http://{self.host}:{self._http.server_port}"
+
+        self._loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run_ws():
+            asyncio.set_event_loop(self._loop)
+            self._ws_server = self._loop.run_until_complete(websockets.serve(self._handle_ws, self.host, 0))
+            self.wss = f"ws://{self.host}:{self._ws_server.sockets[0].getsockname()[1]}"
+            ready.set()
+            self._loop.run_forever()
+
+        self._threads = [
+            threading.Thread(target=self._http.serve_forever, name="mock-rpc", daemon=True),
+            threading.Thread(target=run_ws, name="mock-pubsub", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        ready.wait(5)
+
+    def stop(self) -> None:
+        if self._http:
+            self._http.shutdown()
+            self._http.server_close()
+            self._http = None
+        if self._loop:
+            asyncio.run_coroutine_threadsafe(self._close_ws(), self._loop).result(5)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self._loop = None
+
+    async def _close_ws(self) -> None:
+        self._ws_server.close()
+        await self._ws_server.wait_closed()
+
+    def slot(self) -> int:
+        return START_SLOT + int((time.monotonic() - self.started_at) / SLOT_TIME)
+
+    def block_height(self) -> int:
+        return START_BLOCK_HEIGHT + self.slot() - START_SLOT
+
+    def rent(self, space: int) -> int:
+        return (128 + space) * RENT_PER_BYTE
+
+    def context(self) -> dict:
+        return {"slot": self.slot(), "apiVersion": "2.0.0"}
+
+    def handle_http(self, payload) -> tuple:
+        requests = payload if isinstance(payload, list) else [payload]
+        with self._lock:
+            for request in requests:
+                self.stats.requests[request.get("method")] = self.stats.requests.get(request.get("method"), 0) + 1
+        if self._bucket and not self._bucket.take():
+            self.stats.rate_limited += 1
+            return 429, {"jsonrpc": "2.0", "id": requests[0].get("id"), "error": {"code": 429, "message": "Too many requests"}}
+        time.sleep(self.profile.delay())
+        if random.random() < self.profile.error_rate:
+            self.stats.errors += 1
+            return 503, {"jsonrpc": "2.0", "id": requests[0].get("id"), "error": {"code": -32603, "message": "Injected error"}}
+        responses = [self.handle_request(request) for request in requests]
+        return 200, responses if isinstance(payload, list) else responses[0]
+
+    def handle_request(self, request: dict) -> dict:
+        handler = getattr(self, "rpc_" + str(request.get("method")), None)
+        if handler is None:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": -32601, "message": "Method not found"}}
+        try:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "result": handler(*request.get("params", []))}
+        except Exception as e:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": -32602, "message": str(e)}}
+
+    def rpc_getAccountInfo(self, pubkey: str, config: Optional[dict] = None) -> dict:
+        return {"context": self.context(), "value": self._account(pubkey, (config or {}).get("dataSlice"))}
+
+    def rpc_getMultipleAccounts(self, pubkeys: list, config: Optional[dict] = None) -> dict:
+        data_slice = (config or {}).get("dataSlice")
+        return {"context": self.context(), "value": [self._account(pubkey, data_slice) for pubkey in pubkeys]}
+
+    def _account(self, pubkey: str, data_slice: Optional[dict]) -> Optional[dict]:
+        account = self.accounts.get(pubkey)
+        if account is None:
+            return None
+        data, owner, lamports = account
+        return account_json(data, owner, lamports, data_slice)
+
+    def rpc_getBalance(self, pubkey: str, config: Optional[dict] = None) -> dict:
+        account = self.accounts.get(pubkey)
+        return {"context": self.context(), "value": account[2] if account else 0}
+
+    def rpc_getLatestBlockhash(self, config: Optional[dict] = None) -> dict:
+        slot = self.slot()
+        return {
+            "context": {"slot": slot, "apiVersion": "2.0.0"},
+            "value": {
+                "blockhash": str(Hash.hash(struct.pack("<Q", slot))),
+                "lastValidBlockHeight": self.block_height() + BLOCKHASH_VALIDITY,
+            },
+        }
+
+    def rpc_getBlockHeight(self, config: Optional[dict] = None) -> int:
+        return self.block_height()
+
+    def rpc_getSlot(self, config: Optional[dict] = None) -> int:
+        return self.slot()
+
+    def rpc_getMinimumBalanceForRentExemption(self, space: int, config: Optional[dict] = None) -> int:
+        return self.rent(space)
+
+    def rpc_getRecentPrioritizationFees(self, accounts: Optional[list] = None) -> list:
+        slot = self.slot()
+        return [{"slot": slot - i, "prioritizationFee": self.profile.priority_fee} for i in range(BLOCKHASH_VALIDITY)]
+
+    def rpc_getTokenAccountsByOwner(self, owner: str, token_filter: dict, config: Optional[dict] = None) -> dict:
+        value = []
+        for (account_owner, mint), amount in list(self.token_balances.items()):
+            if account_owner != owner or token_filter.get("mint", mint) != mint:
+                continue
+            address = get_associated_token_address(Pubkey.from_string(owner), Pubkey.from_string(mint))
+            value.append({"pubkey": str(address), "account": {
+                "data": {
+                    "program": "spl-token",
+                    "parsed": {"type": "account", "info": {
+                        "isNative": False,
+                        "mint": mint,
+                        "owner": owner,
+                        "state": "initialized",
+                        "tokenAmount": {"amount": str(amount), "decimals": 6, "uiAmount": amount / 1e6, "uiAmountString": str(amount / 1e6)},
+                    }},
+                    "space": ACCOUNT_SPACE,
+                },
+                "executable": False,
+                "lamports": self.rent(ACCOUNT_SPACE),
+                "owner": str(TOKEN_PROGRAM_ID),
+                "rentEpoch": 0,
+                "space": ACCOUNT_SPACE,
+            }})
+        return {"context": self.context(), "value": value}
+
+    def rpc_simulateTransaction(self, txn: str, config: Optional[dict] = None) -> dict:
+        return {"context": self.context(), "value": {
+            "err": None,
+            "logs": [],
+            "accounts": None,
+            "unitsConsumed": self.profile.units_consumed,
+            "returnData": None,
+        }}
+
+    def rpc_sendTransaction(self, txn: str, config: Optional[dict] = None) -> str:
+        signature = str(VersionedTransaction.from_bytes(base64.b64decode(txn)).signatures[0])
+        landed_at = time.monotonic() + self.profile.confirm_delay
+        with self._lock:
+            self.stats.sent += 1
+            self.statuses[signature] = (None, None, landed_at)
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._loop.call_later, self.profile.confirm_delay, self._land, signature)
+        return signature
+
+    def _land(self, signature: str) -> None:
+        with self._lock:
+            _, err, landed_at = self.statuses[signature]
+            self.statuses[signature] = (self.slot(), err, landed_at)
+            subscribers = self._signature_subscribers.pop(signature, [])
+        for ws, subscription in subscribers:
+            self._notify(ws, "signatureNotification", subscription, {"err": err})
+
+    def _status(self, signature: str) -> Optional[dict]:
+        status = self.statuses.get(signature)
+        if status is None or status[0] is None:
+            return None
+        slot, err, _ = status
+        return {
+            "slot": slot,
+            "confirmations": None,
+            "err": err,
+            "status": {"Ok": None} if err is None else {"Err": err},
+            "confirmationStatus": "confirmed",
+        }
+
+    def rpc_getSignatureStatuses(self, signatures: list, config: Optional[dict] = None) -> dict:
+        return {"context": self.context(), "value": [self._status(signature) for signature in signatures]}
+
+    def rpc_getTransaction(self, signature: str, config: Optional[dict] = None) -> Optional[dict]:
+        meta = self.transactions.get(signature)
+        status = self.statuses.get(signature)
+        if meta is None or status is None:
+            return None
+        return {
+            "slot": status[0],
+            "blockTime": int(time.time()),
+            "meta": meta,
+            "transaction": {
+                "signatures": [signature],
+                "message": {
+                    "accountKeys": [str(PROGRAM_ID)],
+                    "header": {"numRequiredSignatures": 1, "numReadonlySignedAccounts": 0, "numReadonlyUnsignedAccounts": 0},
+                    "recentBlockhash": str(Hash.default()),
+                    "instructions": [],
+                },
+            },
+            "version": 0,
+        }
+
+    async def _handle_ws(self, ws) -> None:
+        try:
+            async for message in ws:
+                request = json.loads(message)
+                await asyncio.sleep(self.profile.delay())
+                method, params = request.get("method"), request.get("params", [])
+                status = None
+                if method == "logsSubscribe":
+                    result = next(self._subscription_ids)
+                    self._logs_subscribers[ws] = result
+                elif method == "signatureSubscribe":
+                    result = next(self._subscription_ids)
+                    with self._lock:
+                        status = self._status(params[0])
+                        if status is None:
+                            self._signature_subscribers.setdefault(params[0], []).append((ws, result))
+                elif method in ("logsUnsubscribe", "signatureUnsubscribe"):
+                    result = True
+                else:
+                    await ws.send(json.dumps({"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": -32601, "message": "Method not found"}}))
+                    continue
+                await ws.send(json.dumps({"jsonrpc": "2.0", "id": request.get("id"), "result": result}))
+                if status is not None:
+                    self._notify(ws, "signatureNotification", result, {"err": status["err"]})
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self._logs_subscribers.pop(ws, None)
+
+    def _notify(self, ws, method: str, subscription: int, value) -> None:
+        message = json.dumps({
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": {"result": {"context": {"slot": self.slot()}, "value": value}, "subscription": subscription},
+        })
+        self.stats.notifications += 1
+        self._loop.create_task(self._send(ws, message))
+
+    async def _send(self, ws, message: str) -> None:
+        # Jitter is left out here so notifications keep their order, as on a real connection.
+        if self.profile.latency:
+            await asyncio.sleep(self.profile.latency)
+        try:
+            await ws.send(message)
+        except websockets.ConnectionClosed:
+            pass
+
+    def publish_logs(self, signature: str, logs: list, err=None) -> None:
+        value = {"signature": signature, "err": err, "logs": logs}
+        self._loop.call_soon_threadsafe(self._publish, value)
+
+    def _publish(self, value: dict) -> None:
+        for ws, subscription in list(self._logs_subscribers.items()):
+            self._notify(ws, "logsNotification", subscription, value)
+
+    def drop_connections(self) -> None:
+        for ws in list(self._logs_subscribers):
+            self._loop.call_soon_threadsafe(lambda ws=ws: self._loop.create_task(ws.close()))
@@ -0,0 +1,214 @@
+import base64
+import itertools
+import json
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import websocket
+
+from solders.pubkey import Pubkey  # type: ignore
+
+from config import WSS, POOL_CACHE_MAX_SUBSCRIPTIONS
+from pool_utils import PoolState, async_fetch_pool_state, decode_pool_state, fetch_pool_state, fetch_pool_states
+
+RECONNECT_DELAY = 5
+
+class PoolStateCache:
+    def __init__(self, max_subscriptions: int = POOL_CACHE_MAX_SUBSCRIPTIONS, wss: str = WSS):
+        self.max_subscriptions = max_subscriptions
+        self.wss = wss
+        self.pools: "OrderedDict[str, Optional[PoolState]]" = OrderedDict()
+        self.subscriptions: dict = {}
+        self.subscription_pools: dict = {}
+        self.pending: dict = {}
+        self.stale: set = set()
+        self._request_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._ws: Optional[websocket.WebSocketApp] = None
+        self._thread: Optional[threading.Thread] = None
+        self._connected = threading.Event()
+        self._stopping = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._ws = websocket.WebSocketApp(
+            self.wss,
+            on_open=self._on_open,
+            on_message=self._on_message,
+            on_error=self._on_error,
+            on_close=self._on_close,
+        )
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="pool-state-cache", daemon=True)
+        self._thread.start()
+        self._connected.wait(10)
+
+    def _run(self) -> None:
+        # run_forever's own reconnect skips on_close, so reconnect here and let on_close drop the cached states.
+        while not self._stopping.is_set():
+            self._ws.run_forever()
+            self._stopping.wait(RECONNECT_DELAY)
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._ws:
+            self._ws.close()
+        if self._thread:
+            self._thread.join()
+        self._ws = None
+        self._thread = None
+        self._connected.clear()
+
+    def get(self, pool_str: str) -> Optional[PoolState]:
+        # Without a connection no updates arrive, so cached states cannot be trusted.
+        if not self.running or not self._connected.is_set():
+            return fetch_pool_state(pool_str)
+
+        pool_state = self._lookup(pool_str)
+        if pool_state is not None:
+            return pool_state
+        return self._store(pool_str, fetch_pool_state(pool_str))
+
+    async def async_get(self, pool_str: str) -> Optional[PoolState]:
+        if not self.running or not self._connected.is_set():
+            return await async_fetch_pool_state(pool_str)
+
+        pool_state = self._lookup(pool_str)
+        if pool_state is not None:
+            return pool_state
+        return self._store(pool_str, await async_fetch_pool_state(pool_str))
+
+    def _lookup(self, pool_str: str) -> Optional[PoolState]:
+        with self._lock:
+            pool_state = self.pools.get(pool_str)
+            if pool_state is not None:
+                self.pools.move_to_end(pool_str)
+            return pool_state
+
+    def _store(self, pool_str: str, pool_state: Optional[PoolState]) -> Optional[PoolState]:
+        if pool_state is None:
+            return None
+
+        with self._lock:
+            if pool_str not in self.pools:
+                self._track(pool_str)
+            if self.pools[pool_str] is None:
+                self.pools[pool_str] = pool_state
+            return self.pools[pool_str]
+
+    def watch(self, pool_strs: list) -> None:
+        missing = [pool_str for pool_str in pool_strs if self._lookup(pool_str) is None]
+        for pool_str, pool_state in fetch_pool_states(missing).items():
+            self._store(pool_str, pool_state)
+
+    def _refetch(self, pool_strs: list) -> None:
+        pool_states = fetch_pool_states(pool_strs)
+        with self._lock:
+            for pool_str, pool_state in pool_states.items():
+                # Evicted pools stay evicted, and a notification that arrived first is newer.
+                if pool_state is not None and pool_str in self.pools and self.pools[pool_str] is None:
+                    self.pools[pool_str] = pool_state
+
+    def _track(self, pool_str: str) -> None:
+        while len(self.pools) >= self.max_subscriptions:
+            evicted, _ = self.pools.popitem(last=False)
+            subscription_id = self.subscriptions.pop(evicted, None)
+            if subscription_id is not None:
+                self.subscription_pools.pop(subscription_id, None)
+                self._send("accountUnsubscribe", [subscription_id])
+        self.pools[pool_str] = None
+        self._subscribe(pool_str)
+
+    def _subscribe(self, pool_str: str) -> None:
+        request_id = self._send(
+            "accountSubscribe",
+            [pool_str, {"encoding": "base64", "commitment": "processed"}],
+        )
+        if request_id is not None:
+            self.pending[request_id] = pool_str
+
+    def _send(self, method: str, params: list) -> Optional[int]:
+        request_id = next(self._request_ids)
+        try:
+            self._ws.send(json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}))
+            return request_id
+        except Exception as e:
+            print(f"Error sending {method} request: {e}")
+            return None
+
+    def _invalidate(self) -> None:
+        self.subscriptions.clear()
+        self.subscription_pools.clear()
+        self.pending.clear()
+        for pool_str in self.pools:
+            self.pools[pool_str] = None
+
+    def _on_open(self, ws) -> None:
+        with self._lock:
+            self._invalidate()
+            for pool_str in self.pools:
+                self._subscribe(pool_str)
+        self._connected.set()
+
+    def _on_message(self, ws, message) -> None:
+        try:
+            payload = json.loads(message)
+        except json.JSONDecodeError as e:
+            print(f"JSON decode error: {e}")
+            return
+
+        if payload.get("method") == "accountNotification":
+            params = payload.get("params", {})
+            data = params.get("result", {}).get("value", {}).get("data")
+            if not data:
+                return
+            with self._lock:
+                pool_str = self.subscription_pools.get(params.get("subscription"))
+                if pool_str is None:
+                    return
+                try:
+                    self.pools[pool_str] = decode_pool_state(
+                        Pubkey.from_string(pool_str), base64.b64decode(data[0])
+                    )
+                except Exception as e:
+                    print(f"Error decoding pool state for {pool_str}: {e}")
+            return
+
+        request_id = payload.get("id")
+        if request_id is None:
+            return
+        with self._lock:
+            pool_str = self.pending.pop(request_id, None)
+            if pool_str is None:
+                return
+            if "result" in payload and pool_str in self.pools:
+                self.subscriptions[pool_str] = payload["result"]
+                self.subscription_pools[payload["result"]] = pool_str
+                # Notifications only start with the next change, so a state fetched before this point may be stale.
+                self.pools[pool_str] = None
+                self.stale.add(pool_str)
+            elif "result" in payload:
+                self._send("accountUnsubscribe", [payload["result"]])
+            else:
+                print(f"Error subscribing to {pool_str}: {payload.get('error')}")
+            refetch = list(self.stale) if not self.pending else []
+            if refetch:
+                self.stale.clear()
+        if refetch:
+            threading.Thread(target=self._refetch, args=(refetch,), name="pool-state-refetch", daemon=True).start()
+
+    def _on_error(self, ws, error) -> None:
+        print(f"WebSocket error: {error}")
+
+    def _on_close(self, ws, close_status_code, close_msg) -> None:
+        self._connected.clear()
+        with self._lock:
+            self._invalidate()
+
+pool_state_cache = PoolStateCache()
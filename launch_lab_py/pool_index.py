@@ -0,0 +1,132 @@
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import base58
+
+POOL_INDEX_PATH = "pool_index.sqlite3"
+
+CURVE_TYPES = {
+    "Constant": 0,
+    "Fixed": 1,
+    "Linear": 2,
+}
+
+@dataclass
+class PoolIndexEntry:
+    base_mint: str
+    pool: str
+    global_config: Optional[str]
+    platform_config: Optional[str]
+    curve_type: Optional[int]
+    created_at: Optional[float]
+
+class PoolIndex:
+    def __init__(self, path: str = POOL_INDEX_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pools (
+                base_mint TEXT PRIMARY KEY,
+                pool TEXT NOT NULL,
+                global_config TEXT,
+                platform_config TEXT,
+                curve_type INTEGER,
+                created_at REAL
+            )
+            """
+        )
+        self._conn.commit()
+        self.entries: Dict[str, PoolIndexEntry] = {
+            row[0]: PoolIndexEntry(*row) for row in self._conn.execute("SELECT * FROM pools")
+        }
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, base_mint: str) -> Optional[PoolIndexEntry]:
+        return self.entries.get(base_mint)
+
+    def get_pool(self, base_mint: str) -> Optional[str]:
+        entry = self.entries.get(base_mint)
+        return entry.pool if entry else None
+
+    def add_many(self, entries: list) -> None:
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT INTO pools (base_mint, pool, global_config, platform_config, curve_type, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(base_mint) DO UPDATE SET
+                    pool = excluded.pool,
+                    global_config = COALESCE(excluded.global_config, pools.global_config),
+                    platform_config = COALESCE(excluded.platform_config, pools.platform_config),
+                    curve_type = COALESCE(excluded.curve_type, pools.curve_type),
+                    created_at = COALESCE(pools.created_at, excluded.created_at)
+                """,
+                [
+                    (e.base_mint, e.pool, e.global_config, e.platform_config, e.curve_type, e.created_at)
+                    for e in entries
+                ],
+            )
+            self._conn.commit()
+
+            for entry in entries:
+                current = self.entries.get(entry.base_mint)
+                if current is None:
+                    self.entries[entry.base_mint] = entry
+                    continue
+                current.pool = entry.pool
+                current.global_config = entry.global_config or current.global_config
+                current.platform_config = entry.platform_config or current.platform_config
+                current.curve_type = entry.curve_type if entry.curve_type is not None else current.curve_type
+                current.created_at = current.created_at if current.created_at is not None else entry.created_at
+
+    def add(self, entry: PoolIndexEntry) -> None:
+        self.add_many([entry])
+
+    def seed_from_snapshot(self, snapshot, curve_types: dict) -> int:
+        entries = []
+        for row in snapshot:
+            global_config = base58.b58encode(bytes(row["global_config"])).decode()
+            entries.append(PoolIndexEntry(
+                base_mint=base58.b58encode(bytes(row["base_mint"])).decode(),
+                pool=base58.b58encode(bytes(row["pool"])).decode(),
+                global_config=global_config,
+                platform_config=base58.b58encode(bytes(row["platform_config"])).decode(),
+                curve_type=curve_types.get(global_config),
+                created_at=None,
+            ))
+        self.add_many(entries)
+        return len(entries)
+
+    def apply_pool_create_event(self, event: dict) -> Optional[PoolIndexEntry]:
+        mint = event.get("mint")
+        if not mint:
+            return None
+
+        entry = PoolIndexEntry(
+            base_mint=mint,
+            pool=event["pool_state"],
+            global_config=event.get("config"),
+            platform_config=None,
+            curve_type=CURVE_TYPES.get(event.get("curve_param", {}).get("variant")),
+            # The block time, not the listener's receive time, so every entry uses the chain's clock.
+            created_at=event.get("block_time"),
+        )
+        self.add(entry)
+        return entry
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+if __name__ == "__main__":
+    from market_snapshot import fetch_curve_types, fetch_market_snapshot
+
+    pool_index = PoolIndex()
+    snapshot = fetch_market_snapshot()
+    curve_types = fetch_curve_types({bytes(config) for config in snapshot["global_config"]})
+    print(f"Seeded {pool_index.seed_from_snapshot(snapshot, curve_types)} pools, {len(pool_index)} indexed.")
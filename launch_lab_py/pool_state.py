@@ -0,0 +1,133 @@
+import struct
+
+from solders.pubkey import Pubkey  # type: ignore
+
+# discriminator, epoch, 5 x u8, 15 x u64, 7 x pubkey (kept as one blob), padding [u64; 8]
+POOL_STATE_STRUCT = struct.Struct("<8xQ5B15Q224s64x")
+POOL_STATE_SIZE = POOL_STATE_STRUCT.size
+POOL_STATE_DISCRIMINATOR = bytes([247, 237, 227, 245, 215, 195, 222, 70])
+
+PUBKEY_FIELDS = (
+    "global_config",
+    "platform_config",
+    "base_mint",
+    "quote_mint",
+    "base_vault",
+    "quote_vault",
+    "creator",
+)
+
+FIELDS = (
+    "pool",
+    "epoch",
+    "auth_bump",
+    "status",
+    "base_decimals",
+    "quote_decimals",
+    "migrate_type",
+    "supply",
+    "total_base_sell",
+    "virtual_base",
+    "virtual_quote",
+    "real_base",
+    "real_quote",
+    "total_quote_fund_raising",
+    "quote_protocol_fee",
+    "platform_fee",
+    "migrate_fee",
+    "vesting_total_locked_amount",
+    "vesting_cliff_period",
+    "vesting_unlock_period",
+    "vesting_start_time",
+    "vesting_allocated_share_amount",
+) + PUBKEY_FIELDS
+
+def lazy_pubkey(index: int) -> property:
+    name = "_" + PUBKEY_FIELDS[index]
+    start = index * 32
+    end = start + 32
+
+    def getter(self) -> Pubkey:
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            value = Pubkey.from_bytes(self._pubkeys[start:end])
+            setattr(self, name, value)
+            return value
+
+    def setter(self, value: Pubkey) -> None:
+        setattr(self, name, value)
+
+    return property(getter, setter)
+
+class PoolState:
+    __slots__ = FIELDS[:-len(PUBKEY_FIELDS)] + ("_pubkeys",) + tuple("_" + name for name in PUBKEY_FIELDS)
+
+    def __init__(
+        self,
+        pool,
+        epoch,
+        auth_bump,
+        status,
+        base_decimals,
+        quote_decimals,
+        migrate_type,
+        supply,
+        total_base_sell,
+        virtual_base,
+        virtual_quote,
+        real_base,
+        real_quote,
+        total_quote_fund_raising,
+        quote_protocol_fee,
+        platform_fee,
+        migrate_fee,
+        vesting_total_locked_amount,
+        vesting_cliff_period,
+        vesting_unlock_period,
+        vesting_start_time,
+        vesting_allocated_share_amount,
+        pubkeys,
+    ):
+        self.pool = pool
+        self.epoch = epoch
+        self.auth_bump = auth_bump
+        self.status = status
+        self.base_decimals = base_decimals
+        self.quote_decimals = quote_decimals
+        self.migrate_type = migrate_type
+        self.supply = supply
+        self.total_base_sell = total_base_sell
+        self.virtual_base = virtual_base
+        self.virtual_quote = virtual_quote
+        self.real_base = real_base
+        self.real_quote = real_quote
+        self.total_quote_fund_raising = total_quote_fund_raising
+        self.quote_protocol_fee = quote_protocol_fee
+        self.platform_fee = platform_fee
+        self.migrate_fee = migrate_fee
+        self.vesting_total_locked_amount = vesting_total_locked_amount
+        self.vesting_cliff_period = vesting_cliff_period
+        self.vesting_unlock_period = vesting_unlock_period
+        self.vesting_start_time = vesting_start_time
+        self.vesting_allocated_share_amount = vesting_allocated_share_amount
+        self._pubkeys = pubkeys
+
+    global_config = lazy_pubkey(0)
+    platform_config = lazy_pubkey(1)
+    base_mint = lazy_pubkey(2)
+    quote_mint = lazy_pubkey(3)
+    base_vault = lazy_pubkey(4)
+    quote_vault = lazy_pubkey(5)
+    creator = lazy_pubkey(6)
+
+    def __repr__(self) -> str:
+        return "PoolState(" + ", ".join(f"{name}={getattr(self, name)!r}" for name in FIELDS) + ")"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PoolState):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in FIELDS)
+
+def decode_pool_state(pool_pubkey: Pubkey, data) -> PoolState:
+    return PoolState(pool_pubkey, *POOL_STATE_STRUCT.unpack_from(memoryview(data)))
@@ -0,0 +1,177 @@
+import bisect
+import functools
+import inspect
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+STAGES = ("fetch", "quote", "build", "compile", "simulate", "sign", "send", "confirm", "trade")
+HISTOGRAM_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+HISTOGRAM_WINDOW = 1000
+PROMETHEUS_PORT = 9464
+
+class Histogram:
+    def __init__(self, buckets: tuple = HISTOGRAM_BUCKETS, window: int = HISTOGRAM_WINDOW):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.recent: deque = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.recent.append(seconds)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        recent = sorted(self.recent)
+        if not recent:
+            return None
+        return recent[min(len(recent) - 1, int(len(recent) * percentile / 100))]
+
+class HistogramSink:
+    def __init__(self, buckets: tuple = HISTOGRAM_BUCKETS, window: int = HISTOGRAM_WINDOW):
+        self.buckets = buckets
+        self.window = window
+        self.histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram(self.buckets, self.window)
+            histogram.observe(seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            histograms = list(self.histograms.items())
+        order = {stage: index for index, stage in enumerate(STAGES)}
+        return {
+            stage: {
+                "count": histogram.count,
+                "mean_ms": histogram.sum / histogram.count * 1000,
+                "p50_ms": histogram.percentile(50) * 1000,
+                "p99_ms": histogram.percentile(99) * 1000,
+            }
+            for stage, histogram in sorted(histograms, key=lambda item: order.get(item[0], len(order)))
+        }
+
+    def report(self) -> str:
+        return "\n".join(
+            f"{stage:<10} {stats['count']:6d}  mean {stats['mean_ms']:9.2f} ms  p50 {stats['p50_ms']:9.2f} ms  p99 {stats['p99_ms']:9.2f} ms"
+            for stage, stats in self.snapshot().items()
+        )
+
+class PrometheusSink(HistogramSink):
+    def __init__(self, port: int = PROMETHEUS_PORT, host: str = "127.0.0.1", buckets: tuple = HISTOGRAM_BUCKETS):
+        super().__init__(buckets)
+        self.port = port
+        self.host = host
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def render(self) -> str:
+        lines = [
+            "# HELP launch_lab_stage_seconds Time spent in each trade stage.",
+            "# TYPE launch_lab_stage_seconds histogram",
+        ]
+        with self._lock:
+            for stage, histogram in self.histograms.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'launch_lab_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'launch_lab_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+                lines.append(f'launch_lab_stage_seconds_sum{{stage="{stage}"}} {histogram.sum}')
+                lines.append(f'launch_lab_stage_seconds_count{{stage="{stage}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = sink.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self._server.server_port
+        self._thread = threading.Thread(target=self._server.serve_forever, name="prometheus-sink", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+class Span:
+    __slots__ = ("sink", "stage", "started_at")
+
+    def __init__(self, sink, stage: str):
+        self.sink = sink
+        self.stage = stage
+
+    def __enter__(self) -> "Span":
+        self.started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.sink.record(self.stage, time.perf_counter() - self.started_at)
+
+class NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "NullSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+NULL_SPAN = NullSpan()
+
+class Tracer:
+    def __init__(self, sink=None):
+        self.sink = sink
+
+    def span(self, stage: str):
+        if self.sink is None:
+            return NULL_SPAN
+        return Span(self.sink, stage)
+
+tracer = Tracer()
+
+def traced(stage: str):
+    def decorator(function):
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.span(stage):
+                    return await function(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with tracer.span(stage):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,322 @@
+import base64
+import os
+import struct
+from typing import Optional
+
+from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price  # type: ignore
+from solders.instruction import AccountMeta, Instruction  # type: ignore
+from solders.keypair import Keypair  # type: ignore
+from solders.pubkey import Pubkey  # type: ignore
+from solders.system_program import (  # type: ignore
+    CreateAccountWithSeedParams,
+    TransferParams,
+    create_account_with_seed,
+    transfer,
+)
+
+from spl.token.instructions import (
+    CloseAccountParams,
+    InitializeAccountParams,
+    SyncNativeParams,
+    close_account,
+    create_associated_token_account,
+    create_idempotent_associated_token_account,
+    get_associated_token_address,
+    initialize_account,
+    sync_native,
+)
+
+from config import payer_keypair, UNIT_BUDGET, UNIT_PRICE
+from constants import *
+from pool_state import PoolState
+
+def get_fee_pcts(pool_state: PoolState) -> tuple:
+    if pool_state.platform_config == RAYDIUM_PLATFORM:
+        return 0.25, 0.75
+    return 0.25, 1
+
+def create_wsol_instructions(lamports: int, payer: Keypair = payer_keypair, seed: Optional[str] = None) -> tuple:
+    if seed is None:
+        seed = base64.urlsafe_b64encode(os.urandom(24)).decode("utf-8")
+    wsol_token_account = Pubkey.create_with_seed(payer.pubkey(), seed, TOKEN_PROGRAM_ID)
+
+    create_wsol_account_instruction = create_account_with_seed(
+        CreateAccountWithSeedParams(
+            from_pubkey=payer.pubkey(),
+            to_pubkey=wsol_token_account,
+            base=payer.pubkey(),
+            seed=seed,
+            lamports=int(lamports),
+            space=ACCOUNT_SPACE,
+            owner=TOKEN_PROGRAM_ID,
+        )
+    )
+
+    init_wsol_account_instruction = initialize_account(
+        InitializeAccountParams(
+            program_id=TOKEN_PROGRAM_ID,
+            account=wsol_token_account,
+            mint=WSOL,
+            owner=payer.pubkey(),
+        )
+    )
+
+    close_wsol_account_instruction = close_account(
+        CloseAccountParams(
+            program_id=TOKEN_PROGRAM_ID,
+            account=wsol_token_account,
+            dest=payer.pubkey(),
+            owner=payer.pubkey(),
+        )
+    )
+
+    return wsol_token_account, create_wsol_account_instruction, init_wsol_account_instruction, close_wsol_account_instruction
+
+def get_wsol_ata(payer: Keypair = payer_keypair) -> Pubkey:
+    return get_associated_token_address(payer.pubkey(), WSOL)
+
+def build_top_up_instructions(lamports: int, payer: Keypair = payer_keypair) -> list:
+    wsol_token_account = get_wsol_ata(payer)
+    return [
+        transfer(TransferParams(from_pubkey=payer.pubkey(), to_pubkey=wsol_token_account, lamports=int(lamports))),
+        sync_native(SyncNativeParams(program_id=TOKEN_PROGRAM_ID, account=wsol_token_account)),
+    ]
+
+def build_wrap_instructions(lamports: int, payer: Keypair = payer_keypair) -> list:
+    instructions = [
+        set_compute_unit_limit(UNIT_BUDGET),
+        set_compute_unit_price(UNIT_PRICE),
+        create_idempotent_associated_token_account(payer.pubkey(), payer.pubkey(), WSOL),
+    ]
+    if lamports:
+        instructions.extend(build_top_up_instructions(lamports, payer))
+    return instructions
+
+def build_unwrap_instructions(payer: Keypair = payer_keypair) -> list:
+    return [
+        set_compute_unit_limit(UNIT_BUDGET),
+        set_compute_unit_price(UNIT_PRICE),
+        close_account(
+            CloseAccountParams(
+                program_id=TOKEN_PROGRAM_ID,
+                account=get_wsol_ata(payer),
+                dest=payer.pubkey(),
+                owner=payer.pubkey(),
+            )
+        ),
+    ]
+
+def build_swap_instruction(
+    pool_state: PoolState,
+    token_account: Pubkey,
+    wsol_token_account: Pubkey,
+    discriminator: bytes,
+    amount: int,
+    other_amount_threshold: int,
+    share_fee_rate: int = 0,
+    payer: Keypair = payer_keypair,
+) -> Instruction:
+    accounts = [
+        AccountMeta(payer.pubkey(), True, True),
+        AccountMeta(AUTHORITY, False, False),
+        AccountMeta(pool_state.global_config, False, False),
+        AccountMeta(pool_state.platform_config, False, False),
+        AccountMeta(pool_state.pool, False, True),
+        AccountMeta(token_account, False, True),
+        AccountMeta(wsol_token_account, False, True),
+        AccountMeta(pool_state.base_vault, False, True),
+        AccountMeta(pool_state.quote_vault, False, True),
+        AccountMeta(pool_state.base_mint, False, False),
+        AccountMeta(pool_state.quote_mint, False, False),
+        AccountMeta(TOKEN_PROGRAM_ID, False, False),
+        AccountMeta(TOKEN_PROGRAM_ID, False, False),
+        AccountMeta(EVENT_AUTH, False, False),
+        AccountMeta(PROGRAM_ID, False, False),
+    ]
+
+    data = bytearray()
+    data.extend(discriminator)
+    data.extend(struct.pack('<Q', amount))
+    data.extend(struct.pack('<Q', other_amount_threshold))
+    data.extend(struct.pack('<Q', share_fee_rate))
+    return Instruction(PROGRAM_ID, bytes(data), accounts)
+
+def build_buy_instructions(
+    pool_state: PoolState,
+    amount: int,
+    other_amount_threshold: int,
+    token_account: Optional[Pubkey],
+    balance_needed: int,
+    exact_out: bool = False,
+    payer: Keypair = payer_keypair,
+    seed: Optional[str] = None,
+) -> list:
+    if token_account:
+        token_account_instruction = None
+    else:
+        token_account = get_associated_token_address(payer.pubkey(), pool_state.base_mint)
+        token_account_instruction = create_associated_token_account(
+            payer.pubkey(), 
+            payer.pubkey(), 
+            pool_state.base_mint
+            )
+
+    if exact_out:
+        discriminator, max_amount_in = BUY_EXACT_OUT, other_amount_threshold
+    else:
+        discriminator, max_amount_in = BUY_EXACT_IN, amount
+
+    wsol_token_account, create_wsol_account_instruction, init_wsol_account_instruction, close_wsol_account_instruction = create_wsol_instructions(balance_needed + max_amount_in, payer, seed)
+
+    swap_instruction = build_swap_instruction(
+        pool_state, token_account, wsol_token_account, discriminator, amount, other_amount_threshold, payer=payer
+    )
+
+    instructions = [
+        set_compute_unit_limit(UNIT_BUDGET),
+        set_compute_unit_price(UNIT_PRICE),
+        create_wsol_account_instruction,
+        init_wsol_account_instruction,
+    ]
+
+    if token_account_instruction:
+        instructions.append(token_account_instruction)
+
+    instructions.append(swap_instruction)
+    instructions.append(close_wsol_account_instruction)
+    return instructions
+
+def build_sell_instructions(
+    pool_state: PoolState,
+    amount: int,
+    other_amount_threshold: int,
+    balance_needed: int,
+    close_token_account: bool = False,
+    exact_out: bool = False,
+    payer: Keypair = payer_keypair,
+    seed: Optional[str] = None,
+) -> list:
+    token_account = get_associated_token_address(payer.pubkey(), pool_state.base_mint)
+
+    wsol_token_account, create_wsol_account_instruction, init_wsol_account_instruction, close_wsol_account_instruction = create_wsol_instructions(balance_needed, payer, seed)
+
+    swap_instruction = build_swap_instruction(
+        pool_state,
+        token_account,
+        wsol_token_account,
+        SELL_EXACT_OUT if exact_out else SELL_EXACT_IN,
+        amount,
+        other_amount_threshold,
+        payer=payer,
+    )
+
+    instructions = [
+        set_compute_unit_limit(UNIT_BUDGET),
+        set_compute_unit_price(UNIT_PRICE),
+        create_wsol_account_instruction,
+        init_wsol_account_instruction,
+        swap_instruction,
+        close_wsol_account_instruction,
+    ]
+
+    if close_token_account:
+        close_token_account_instruction = close_account(
+            CloseAccountParams(
+                TOKEN_PROGRAM_ID,
+                token_account,
+                payer.pubkey(),
+                payer.pubkey(),
+            )
+        )
+        instructions.append(close_token_account_instruction)
+    return instructions
+
+def build_sell_swap_instructions(
+    pool_state: PoolState,
+    token_account: Pubkey,
+    wsol_token_account: Pubkey,
+    amount: int,
+    other_amount_threshold: int,
+    close_token_account: bool = False,
+    payer: Keypair = payer_keypair,
+) -> list:
+    instructions = [build_swap_instruction(
+        pool_state, token_account, wsol_token_account, SELL_EXACT_IN, amount, other_amount_threshold, payer=payer
+    )]
+    if close_token_account:
+        instructions.append(close_account(
+            CloseAccountParams(
+                TOKEN_PROGRAM_ID,
+                token_account,
+                payer.pubkey(),
+                payer.pubkey(),
+            )
+        ))
+    return instructions
+
+def build_persistent_buy_instructions(
+    pool_state: PoolState,
+    amount: int,
+    other_amount_threshold: int,
+    token_account: Optional[Pubkey],
+    top_up: int = 0,
+    exact_out: bool = False,
+    payer: Keypair = payer_keypair,
+) -> list:
+    instructions = [
+        set_compute_unit_limit(UNIT_BUDGET),
+        set_compute_unit_price(UNIT_PRICE),
+    ]
+
+    if top_up:
+        instructions.extend(build_top_up_instructions(top_up, payer))
+
+    if not token_account:
+        token_account = get_associated_token_address(payer.pubkey(), pool_state.base_mint)
+        instructions.append(create_associated_token_account(payer.pubkey(), payer.pubkey(), pool_state.base_mint))
+
+    instructions.append(build_swap_instruction(
+        pool_state,
+        token_account,
+        get_wsol_ata(payer),
+        BUY_EXACT_OUT if exact_out else BUY_EXACT_IN,
+        amount,
+        other_amount_threshold,
+        payer=payer,
+    ))
+    return instructions
+
+def build_persistent_sell_instructions(
+    pool_state: PoolState,
+    amount: int,
+    other_amount_threshold: int,
+    close_token_account: bool = False,
+    exact_out: bool = False,
+    payer: Keypair = payer_keypair,
+) -> list:
+    token_account = get_associated_token_address(payer.pubkey(), pool_state.base_mint)
+
+    instructions = [
+        set_compute_unit_limit(UNIT_BUDGET),
+        set_compute_unit_price(UNIT_PRICE),
+        build_swap_instruction(
+            pool_state,
+            token_account,
+            get_wsol_ata(payer),
+            SELL_EXACT_OUT if exact_out else SELL_EXACT_IN,
+            amount,
+            other_amount_threshold,
+            payer=payer,
+        ),
+    ]
+
+    if close_token_account:
+        instructions.append(close_account(
+            CloseAccountParams(
+                TOKEN_PROGRAM_ID,
+                token_account,
+                payer.pubkey(),
+                payer.pubkey(),
+            )
+        ))
+    return instructions
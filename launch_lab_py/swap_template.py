@@ -0,0 +1,227 @@
+import base64
+import os
+import struct
+from collections import OrderedDict
+from typing import Optional
+
+from solders.compute_budget import ID as COMPUTE_BUDGET_PROGRAM_ID, set_compute_unit_limit  # type: ignore
+from solders.hash import Hash  # type: ignore
+from solders.keypair import Keypair  # type: ignore
+from solders.message import MessageV0, to_bytes_versioned  # type: ignore
+from solders.pubkey import Pubkey  # type: ignore
+from solders.signature import Signature  # type: ignore
+from solders.transaction import VersionedTransaction  # type: ignore
+
+from config import payer_keypair, UNIT_BUDGET, UNIT_PRICE
+from constants import *
+from fee_oracle import fee_accounts
+from lookup_table import lookup_table_cache
+from pool_state import PoolState
+from spans import tracer
+from swap_instructions import (
+    build_buy_instructions,
+    build_persistent_buy_instructions,
+    build_persistent_sell_instructions,
+    build_sell_instructions,
+)
+
+MAX_SWAP_TEMPLATES = 1024
+U64 = struct.Struct("<Q")
+SYSTEM_TRANSFER = struct.pack("<I", 2)
+SET_COMPUTE_UNIT_LIMIT = struct.Struct("<BI")
+
+def random_u64() -> int:
+    return int.from_bytes(os.urandom(7), "little") + 1
+
+def random_seed() -> str:
+    return base64.urlsafe_b64encode(os.urandom(24)).decode("utf-8")
+
+def find_unique(message: bytes, pattern: bytes) -> int:
+    offset = message.find(pattern)
+    if offset < 0 or message.find(pattern, offset + 1) >= 0:
+        raise ValueError("Template field is not unique in the compiled message")
+    return offset
+
+class SwapTemplate:
+    def __init__(
+        self,
+        pool_state: PoolState,
+        discriminator: bytes,
+        token_account: Optional[Pubkey] = None,
+        close_token_account: bool = False,
+        payer: Keypair = payer_keypair,
+        persistent_wsol: bool = False,
+        top_up: bool = False,
+    ):
+        self.payer = payer
+        self.payer_pubkey = payer.pubkey()
+        self.discriminator = discriminator
+        self.persistent_wsol = persistent_wsol
+        self.shape = (discriminator, token_account is None, close_token_account, persistent_wsol, top_up)
+        self.pool = pool_state.pool
+        self.platform_config = pool_state.platform_config
+        self.fee_accounts = fee_accounts(pool_state)
+        self.unit_limit = UNIT_BUDGET
+        self.profiled = False
+
+        amount, threshold, balance_needed = random_u64(), random_u64(), random_u64()
+        seed = random_seed()
+        blockhash = Hash(os.urandom(32))
+
+        if persistent_wsol and discriminator in (BUY_EXACT_IN, BUY_EXACT_OUT):
+            instructions = build_persistent_buy_instructions(
+                pool_state, amount, threshold, token_account, balance_needed if top_up else 0,
+                exact_out=discriminator == BUY_EXACT_OUT, payer=payer,
+            )
+        elif persistent_wsol:
+            instructions = build_persistent_sell_instructions(
+                pool_state, amount, threshold, close_token_account,
+                exact_out=discriminator == SELL_EXACT_OUT, payer=payer,
+            )
+        elif discriminator in (BUY_EXACT_IN, BUY_EXACT_OUT):
+            instructions = build_buy_instructions(
+                pool_state, amount, threshold, token_account, balance_needed,
+                exact_out=discriminator == BUY_EXACT_OUT, payer=payer, seed=seed,
+            )
+        else:
+            instructions = build_sell_instructions(
+                pool_state, amount, threshold, balance_needed, close_token_account,
+                exact_out=discriminator == SELL_EXACT_OUT, payer=payer, seed=seed,
+            )
+
+        with tracer.span("compile"):
+            compiled_message = MessageV0.try_compile(
+                self.payer_pubkey, instructions, lookup_table_cache.tables(), blockhash
+            )
+        message = to_bytes_versioned(compiled_message)
+
+        swap_data = find_unique(message, discriminator + U64.pack(amount) + U64.pack(threshold))
+        self.amount_offset = swap_data + 8
+        self.threshold_offset = swap_data + 16
+        self.seed_offset = None
+        self.lamports_offset = None
+        self.wsol_offset = None
+        if persistent_wsol:
+            if top_up:
+                self.lamports_offset = find_unique(message, SYSTEM_TRANSFER + U64.pack(balance_needed)) + 4
+        else:
+            wsol_token_account = Pubkey.create_with_seed(self.payer_pubkey, seed, TOKEN_PROGRAM_ID)
+            self.seed_offset = find_unique(message, seed.encode("utf-8"))
+            self.lamports_offset = self.seed_offset + len(seed)
+            self.wsol_offset = find_unique(message, bytes(wsol_token_account))
+        # program index, no accounts, 5 bytes of data, then the SetComputeUnitLimit payload
+        compute_budget_index = list(compiled_message.account_keys).index(COMPUTE_BUDGET_PROGRAM_ID)
+        self.unit_limit_offset = find_unique(
+            message, bytes([compute_budget_index, 0, 5]) + SET_COMPUTE_UNIT_LIMIT.pack(2, UNIT_BUDGET)
+        ) + 4
+        self.unit_price_offset = find_unique(
+            message, bytes([compute_budget_index, 0, 9, 3]) + U64.pack(UNIT_PRICE)
+        ) + 4
+        self.blockhash_offset = find_unique(message, bytes(blockhash))
+        self.message = bytes(message)
+
+    def set_unit_limit(self, units: int) -> None:
+        message = bytearray(self.message)
+        struct.pack_into("<I", message, self.unit_limit_offset, units)
+        self.message = bytes(message)
+        self.unit_limit = units
+
+    def sign(
+        self,
+        amount: int,
+        other_amount_threshold: int,
+        lamports: int,
+        blockhash: Hash,
+        unit_price: Optional[int] = None,
+    ) -> tuple:
+        message = bytearray(self.message)
+
+        U64.pack_into(message, self.amount_offset, amount)
+        U64.pack_into(message, self.threshold_offset, other_amount_threshold)
+        if unit_price is not None:
+            U64.pack_into(message, self.unit_price_offset, unit_price)
+        if self.lamports_offset is not None:
+            U64.pack_into(message, self.lamports_offset, lamports)
+        if self.seed_offset is not None:
+            seed = random_seed()
+            wsol_token_account = Pubkey.create_with_seed(self.payer_pubkey, seed, TOKEN_PROGRAM_ID)
+            message[self.seed_offset:self.seed_offset + len(seed)] = seed.encode("utf-8")
+            message[self.wsol_offset:self.wsol_offset + 32] = bytes(wsol_token_account)
+        message[self.blockhash_offset:self.blockhash_offset + 32] = bytes(blockhash)
+
+        message = bytes(message)
+        signature: Signature = self.payer.sign_message(message)
+        return b"\x01" + bytes(signature) + message, signature
+
+swap_templates: "OrderedDict[tuple, SwapTemplate]" = OrderedDict()
+
+def get_swap_template(
+    pool_state: PoolState,
+    discriminator: bytes,
+    token_account: Optional[Pubkey] = None,
+    close_token_account: bool = False,
+    payer: Keypair = payer_keypair,
+    persistent_wsol: bool = False,
+    top_up: bool = False,
+) -> SwapTemplate:
+    # Load and verify the cached table first, so the key carries the version the template compiles against.
+    lookup_table_cache.tables()
+    key = (
+        pool_state.pool, discriminator, token_account, close_token_account, payer.pubkey(), persistent_wsol, top_up,
+        lookup_table_cache.version,
+    )
+    template = swap_templates.get(key)
+    if template is not None:
+        swap_templates.move_to_end(key)
+        return template
+
+    template = SwapTemplate(
+        pool_state, discriminator, token_account, close_token_account, payer, persistent_wsol, top_up
+    )
+    swap_templates[key] = template
+    if len(swap_templates) > MAX_SWAP_TEMPLATES:
+        swap_templates.popitem(last=False)
+    return template
+
+def sign_instructions(
+    instructions: list, blockhash: Hash, payer: Keypair = payer_keypair, lookup_tables: Optional[list] = None
+) -> tuple:
+    if lookup_tables is None:
+        lookup_tables = lookup_table_cache.tables()
+    with tracer.span("compile"):
+        message = MessageV0.try_compile(payer.pubkey(), instructions, lookup_tables, blockhash)
+    txn = VersionedTransaction(message, [payer])
+    return bytes(txn), txn.signatures[0]
+
+def transaction_size(instructions: list, payer: Keypair = payer_keypair) -> int:
+    message = MessageV0.try_compile(payer.pubkey(), instructions, lookup_table_cache.tables(), Hash.default())
+    return 1 + 64 * message.header.num_required_signatures + len(to_bytes_versioned(message))
+
+def assemble_instructions(groups: list, header: list, footer: list, units: int) -> list:
+    instructions = [set_compute_unit_limit(min(units, MAX_COMPUTE_UNIT_LIMIT))] + header
+    for group in groups:
+        instructions.extend(group)
+    return instructions + footer
+
+def pack_instructions(groups: list, header: list, footer: list, units_per_group: int = UNIT_BUDGET, payer: Keypair = payer_keypair) -> list:
+    # Greedily fills each transaction with as many instruction groups as fit the size and compute limits.
+    packed = []
+    current = []
+
+    def build(indexes: list, units: int) -> list:
+        return assemble_instructions([groups[index] for index in indexes], header, footer, units)
+
+    for index in range(len(groups)):
+        candidate = current + [index]
+        fits = (
+            units_per_group * len(candidate) <= MAX_COMPUTE_UNIT_LIMIT
+            and transaction_size(build(candidate, MAX_COMPUTE_UNIT_LIMIT), payer) <= MAX_TRANSACTION_SIZE
+        )
+        if fits or not current:
+            current = candidate
+            continue
+        packed.append((build(current, units_per_group * len(current)), current))
+        current = [index]
+    if current:
+        packed.append((build(current, units_per_group * len(current)), current))
+    return packed
@@ -0,0 +1,136 @@
+import asyncio
+import time
+from typing import Dict, Optional, Set
+
+from solana.rpc.commitment import Confirmed
+
+from config import async_client, MAX_CONCURRENT_REQUESTS
+from idl_decoders import POOL_STATUS
+from launchlab_ws import LaunchLabListener
+from pool_utils import PoolState, chunk_pool_pubkeys, decode_pool_accounts
+
+MAX_POOL_AGE = 30
+
+class TradeFeed:
+    def __init__(self, track_new_pools: bool = False, listener: Optional[LaunchLabListener] = None):
+        self.track_new_pools = track_new_pools
+        self.pools: Dict[str, PoolState] = {}
+        self.synced_slots: Dict[str, int] = {}
+        self.updated_at: Dict[str, float] = {}
+        self.applied = 0
+        self.duplicates = 0
+        self.resyncs = 0
+        self.stale = 0
+        self._pending: Set[str] = set()
+        self._resync_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.listener = listener or LaunchLabListener()
+        self.listener.on_trade = self.apply_trade
+        self.listener.on_resubscribe = self.resync_all
+
+    def get(self, pool_str: str) -> Optional[PoolState]:
+        if pool_str in self._pending:
+            return None
+        pool_state = self.pools.get(pool_str)
+        if pool_state is not None and time.monotonic() - self.updated_at[pool_str] > MAX_POOL_AGE:
+            # A quiet pool and a stalled stream look the same from here, so fetch it again rather than quote from it.
+            self.stale += 1
+            self.resync(pool_str)
+            return None
+        return pool_state
+
+    async def watch(self, pool_strs: list) -> None:
+        self._loop = asyncio.get_running_loop()
+        pool_strs = [pool_str for pool_str in pool_strs if pool_str not in self.pools]
+        if pool_strs:
+            await self._fetch(pool_strs)
+
+    def unwatch(self, pool_str: str) -> None:
+        self.pools.pop(pool_str, None)
+        self.synced_slots.pop(pool_str, None)
+        self.updated_at.pop(pool_str, None)
+        self._pending.discard(pool_str)
+
+    def apply_trade(self, event: dict) -> bool:
+        pool_str = event["pool_state"]
+        pool_state = self.pools.get(pool_str)
+        if pool_state is None:
+            if self.track_new_pools:
+                self.resync(pool_str)
+            return False
+        if pool_str in self._pending:
+            return False
+        # Already included in the account fetched at this slot.
+        slot = event.get("slot")
+        if slot is not None and slot <= self.synced_slots.get(pool_str, -1):
+            self.duplicates += 1
+            return False
+
+        reserves = (pool_state.real_base, pool_state.real_quote)
+        if reserves == (event["real_base_after"], event["real_quote_after"]):
+            self.duplicates += 1
+            return False
+        if reserves != (event["real_base_before"], event["real_quote_before"]):
+            # A trade was missed (skipped slot, dropped notification); reload the account.
+            self.resync(pool_str)
+            return False
+
+        pool_state.total_base_sell = event["total_base_sell"]
+        pool_state.virtual_base = event["virtual_base"]
+        pool_state.virtual_quote = event["virtual_quote"]
+        pool_state.real_base = event["real_base_after"]
+        pool_state.real_quote = event["real_quote_after"]
+        pool_state.status = POOL_STATUS.index(event["pool_status"])
+        self.updated_at[pool_str] = time.monotonic()
+        self.applied += 1
+        return True
+
+    def resync(self, pool_str: str) -> None:
+        self._pending.add(pool_str)
+        # get() may be called from a thread, so the fetch is always scheduled on the feed's own loop.
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._start_flush)
+
+    def _start_flush(self) -> None:
+        if self._pending and (self._resync_task is None or self._resync_task.done()):
+            self._resync_task = self._loop.create_task(self._flush())
+
+    def resync_all(self) -> None:
+        for pool_str in list(self.pools):
+            self.resync(pool_str)
+
+    async def _flush(self) -> None:
+        while self._pending:
+            pool_strs = list(self._pending)
+            self.resyncs += 1
+            try:
+                await self._fetch(pool_strs)
+            except Exception as e:
+                print(f"Error resyncing pool states: {e}")
+                await asyncio.sleep(1)
+                continue
+            self._pending.difference_update(pool_strs)
+
+    async def _fetch(self, pool_strs: list) -> None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        # Same commitment as the listener, so the context slot orders the snapshot against the stream.
+        async def fetch_chunk(pool_pubkeys: list) -> None:
+            async with semaphore:
+                response = await async_client.get_multiple_accounts(pool_pubkeys, commitment=Confirmed)
+            for pool_str, pool_state in decode_pool_accounts(pool_pubkeys, response.value).items():
+                if pool_state is None:
+                    self.unwatch(pool_str)
+                    continue
+                self.pools[pool_str] = pool_state
+                self.synced_slots[pool_str] = response.context.slot
+                self.updated_at[pool_str] = time.monotonic()
+
+        await asyncio.gather(*map(fetch_chunk, chunk_pool_pubkeys(pool_strs)))
+
+    async def run(self, pool_strs: Optional[list] = None) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._start_flush()
+        if pool_strs:
+            await self.watch(pool_strs)
+        await self.listener.run()
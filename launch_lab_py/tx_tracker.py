@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from solders.signature import Signature  # type: ignore
+from solders.transaction_status import TransactionConfirmationStatus  # type: ignore
+
+from config import client, CONFIRM_POLL_INTERVAL
+from constants import MAX_SIGNATURE_STATUSES
+from blockhash_cache import blockhash_cache
+
+COMMITMENT_LEVELS = {
+    "processed": 0,
+    "confirmed": 1,
+    "finalized": 2,
+}
+
+STATUS_LEVELS = (
+    TransactionConfirmationStatus.Processed,
+    TransactionConfirmationStatus.Confirmed,
+    TransactionConfirmationStatus.Finalized,
+)
+
+@dataclass
+class Confirmation:
+    signature: Signature
+    success: Optional[bool]
+    err: Any
+    slot: Optional[int]
+    elapsed: float
+    source: str
+
+@dataclass
+class TrackedTx:
+    signature: Signature
+    commitment: str
+    last_valid_block_height: Optional[int]
+    future: Future
+    started_at: float = field(default_factory=time.monotonic)
+
+    def resolve(self, success: Optional[bool], err, slot: Optional[int], source: str) -> bool:
+        if self.future.done():
+            return False
+        confirmation = Confirmation(self.signature, success, err, slot, time.monotonic() - self.started_at, source)
+        try:
+            self.future.set_result(confirmation)
+        except Exception:
+            return False
+        return True
+
+class TxTracker:
+    def __init__(self, client=client, poll_interval: float = CONFIRM_POLL_INTERVAL):
+        self.client = client
+        self.poll_interval = poll_interval
+        self.entries: Dict[Signature, TrackedTx] = {}
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="tx-tracker", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def track(
+        self,
+        signature: Signature,
+        last_valid_block_height: Optional[int] = None,
+        commitment: str = "confirmed",
+        callback: Optional[Callable[[Confirmation], None]] = None,
+    ) -> Future:
+        with self._lock:
+            entry = self.entries.get(signature)
+            if entry is None:
+                entry = TrackedTx(signature, commitment, last_valid_block_height, Future())
+                self.entries[signature] = entry
+        if callback:
+            entry.future.add_done_callback(lambda future: future.cancelled() or callback(future.result()))
+        self.start()
+        self._wake.set()
+        return entry.future
+
+    def async_track(
+        self,
+        signature: Signature,
+        last_valid_block_height: Optional[int] = None,
+        commitment: str = "confirmed",
+    ) -> asyncio.Future:
+        return asyncio.wrap_future(self.track(signature, last_valid_block_height, commitment))
+
+    def resolve(self, signature: Signature, success: Optional[bool], err, slot: Optional[int], source: str) -> None:
+        with self._lock:
+            entry = self.entries.pop(signature, None)
+        if entry is not None:
+            entry.resolve(success, err, slot, source)
+
+    def untrack(self, signature: Signature) -> None:
+        with self._lock:
+            entry = self.entries.pop(signature, None)
+        if entry is not None:
+            entry.future.cancel()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if not self.entries:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            self._stop.wait(self.poll_interval)
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Error polling signature statuses: {e}")
+
+    def poll(self) -> None:
+        with self._lock:
+            entries = list(self.entries.values())
+
+        for i in range(0, len(entries), MAX_SIGNATURE_STATUSES):
+            chunk = entries[i:i + MAX_SIGNATURE_STATUSES]
+            self.requests += 1
+            statuses = self.client.get_signature_statuses([entry.signature for entry in chunk]).value
+            for entry, status in zip(chunk, statuses):
+                self._apply_status(entry, status)
+
+        # Statuses are checked first so a transaction landing in the final valid block is not expired.
+        expiring = [entry for entry in entries if entry.last_valid_block_height is not None and not entry.future.done()]
+        if expiring and blockhash_cache.is_expired(min(entry.last_valid_block_height for entry in expiring)):
+            for entry in expiring:
+                if blockhash_cache.block_height > entry.last_valid_block_height:
+                    self.resolve(entry.signature, None, None, None, "expired")
+
+    def _apply_status(self, entry: TrackedTx, status) -> None:
+        if status is None:
+            return
+        # rooted statuses may omit confirmation_status
+        level = STATUS_LEVELS.index(status.confirmation_status) if status.confirmation_status is not None else 2
+        if status.err is None and level < COMMITMENT_LEVELS[entry.commitment]:
+            return
+        self.resolve(entry.signature, status.err is None, status.err, status.slot, "status")
+
+tx_tracker = TxTracker()
@@ -0,0 +1,184 @@
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from solana.rpc.commitment import Processed
+
+from solders.keypair import Keypair  # type: ignore
+from solders.pubkey import Pubkey  # type: ignore
+
+from config import client, payer_keypair, RPC, WSS, WALLET_KEYS, WALLET_WORKERS, WALLET_FEE_RESERVE
+
+logger = logging.getLogger(__name__)
+
+MAX_ACCOUNTS_PER_REQUEST = 100
+
+@dataclass
+class Wallet:
+    keypair: Keypair
+    shard: int
+    balance: Optional[int] = None
+    reserved: int = 0
+    in_flight: int = 0
+
+    @property
+    def pubkey(self) -> Pubkey:
+        return self.keypair.pubkey()
+
+    @property
+    def available(self) -> int:
+        return (self.balance or 0) - self.reserved
+
+worker_payers: Dict[bytes, Keypair] = {}
+
+def init_worker(rpc: str, wss: str) -> None:
+    # Runs in a fresh process, so the clients and caches below belong to this worker alone.
+    from solana.rpc.api import Client
+    from solana.rpc.async_api import AsyncClient
+    import config
+
+    config.RPC, config.WSS = rpc, wss
+    config.client = Client(rpc)
+    config.async_client = AsyncClient(rpc)
+
+    from blockhash_cache import blockhash_cache
+    from confirmation import signature_confirmer
+    from fee_oracle import fee_oracle
+    from pool_cache import pool_state_cache
+
+    blockhash_cache.start()
+    signature_confirmer.start()
+    pool_state_cache.start()
+    if config.DYNAMIC_PRIORITY_FEE:
+        fee_oracle.start()
+
+def run_trade(side: str, secret: bytes, pool_str: str, amount: float, slippage: int) -> tuple:
+    import config
+    import launch_lab
+
+    payer = worker_payers.get(secret)
+    if payer is None:
+        payer = worker_payers[secret] = Keypair.from_bytes(secret)
+    confirmed = getattr(launch_lab, side)(pool_str, amount, slippage, payer=payer)
+    try:
+        balance = config.client.get_balance(payer.pubkey(), commitment=Processed).value
+    except Exception as e:
+        logger.error("Error fetching balance for %s: %s", payer.pubkey(), e)
+        balance = None
+    return confirmed, balance
+
+class WalletPool:
+    def __init__(
+        self,
+        keypairs: Optional[List[Keypair]] = None,
+        workers: int = WALLET_WORKERS,
+        rpc: str = RPC,
+        wss: str = WSS,
+        fee_reserve: float = WALLET_FEE_RESERVE,
+    ):
+        if keypairs is None:
+            keypairs = [payer_keypair] + [Keypair.from_base58_string(key) for key in WALLET_KEYS]
+        self.workers = max(1, min(workers, len(keypairs)))
+        # Each wallet always trades from the same worker so its WSOL account and templates stay in one cache.
+        self.wallets: Dict[Pubkey, Wallet] = {
+            keypair.pubkey(): Wallet(keypair, index % self.workers) for index, keypair in enumerate(keypairs)
+        }
+        self.rpc = rpc
+        self.wss = wss
+        self.fee_reserve = int(fee_reserve * 1e9)
+        self.shards: List[ProcessPoolExecutor] = []
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        if self.shards:
+            return
+        context = multiprocessing.get_context("spawn")
+        self.shards = [
+            ProcessPoolExecutor(1, mp_context=context, initializer=init_worker, initargs=(self.rpc, self.wss))
+            for _ in range(self.workers)
+        ]
+        self.refresh_balances()
+
+    def stop(self) -> None:
+        for shard in self.shards:
+            shard.shutdown(wait=True)
+        self.shards = []
+
+    def refresh_balances(self) -> None:
+        pubkeys = list(self.wallets)
+        for start in range(0, len(pubkeys), MAX_ACCOUNTS_PER_REQUEST):
+            chunk = pubkeys[start:start + MAX_ACCOUNTS_PER_REQUEST]
+            try:
+                accounts = client.get_multiple_accounts(chunk, commitment=Processed).value
+            except Exception as e:
+                logger.error("Error fetching wallet balances: %s", e)
+                continue
+            with self._lock:
+                for pubkey, account in zip(chunk, accounts):
+                    self.wallets[pubkey].balance = account.lamports if account else 0
+
+    def shard_loads(self) -> List[int]:
+        loads = [0] * self.workers
+        for wallet in self.wallets.values():
+            loads[wallet.shard] += wallet.in_flight
+        return loads
+
+    def _acquire(self, wallet: Wallet, lamports: int) -> Wallet:
+        wallet.in_flight += 1
+        wallet.reserved += lamports
+        return wallet
+
+    def pick(self, lamports: int = 0) -> Optional[Wallet]:
+        with self._lock:
+            loads = self.shard_loads()
+            candidates = [
+                wallet for wallet in self.wallets.values() if wallet.available - self.fee_reserve >= lamports
+            ]
+            if not candidates:
+                return None
+            wallet = min(candidates, key=lambda wallet: (wallet.in_flight, loads[wallet.shard], -wallet.available))
+            return self._acquire(wallet, lamports)
+
+    def _settle(self, wallet: Wallet, lamports: int, result: Future, future: Future) -> None:
+        confirmed, balance = False, None
+        try:
+            confirmed, balance = future.result()
+        except Exception as e:
+            logger.error("Error running trade for %s: %s", wallet.pubkey, e)
+        with self._lock:
+            wallet.in_flight -= 1
+            wallet.reserved -= lamports
+            if balance is not None:
+                wallet.balance = balance
+        result.set_result(confirmed)
+
+    def submit(self, side: str, wallet: Wallet, pool_str: str, amount: float, slippage: int, lamports: int = 0) -> Future:
+        result = Future()
+        try:
+            future = self.shards[wallet.shard].submit(
+                run_trade, side, bytes(wallet.keypair), pool_str, amount, slippage
+            )
+        except Exception as e:
+            future = Future()
+            future.set_exception(e)
+        future.add_done_callback(lambda future: self._settle(wallet, lamports, result, future))
+        return result
+
+    def buy(self, pool_str: str, sol_in: float = 0.1, slippage: int = 5) -> Optional[Future]:
+        lamports = int(sol_in * 1e9)
+        wallet = self.pick(lamports)
+        if wallet is None:
+            logger.warning("No wallet has %s SOL available, skipping buy.", sol_in)
+            return None
+        return self.submit("buy", wallet, pool_str, sol_in, slippage, lamports)
+
+    def sell(self, pool_str: str, wallet: Pubkey, percentage: int = 100, slippage: int = 5) -> Future:
+        with self._lock:
+            wallet = self._acquire(self.wallets[wallet], 0)
+        return self.submit("sell", wallet, pool_str, percentage, slippage)
+
+    def sell_all(self, pool_str: str, percentage: int = 100, slippage: int = 5) -> List[Future]:
+        return [self.sell(pool_str, wallet, percentage, slippage) for wallet in list(self.wallets)]
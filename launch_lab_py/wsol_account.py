@@ -0,0 +1,99 @@
+import struct
+import threading
+from typing import Dict, Optional
+
+from solana.rpc.commitment import Processed
+
+from solders.keypair import Keypair  # type: ignore
+from solders.pubkey import Pubkey  # type: ignore
+
+from config import client, async_client, payer_keypair
+from swap_instructions import get_wsol_ata
+
+TOKEN_ACCOUNT_AMOUNT = struct.Struct("<64xQ")
+
+class WsolAccount:
+    def __init__(self, payer: Keypair = payer_keypair):
+        self.payer = payer
+        self.address = get_wsol_ata(payer)
+        self.opened: Optional[bool] = None
+        self.balance: Optional[int] = None
+        self.in_flight = 0
+        self.stale = False
+        self._lock = threading.Lock()
+
+    def _apply_account(self, account) -> int:
+        with self._lock:
+            # Reservations in flight are not on chain yet, so the local balance wins until they settle.
+            if self.balance is None or not self.in_flight:
+                if account is None:
+                    self.opened, self.balance = False, 0
+                else:
+                    self.opened, self.balance = True, TOKEN_ACCOUNT_AMOUNT.unpack_from(bytes(account.data))[0]
+            return self.balance
+
+    def refresh(self) -> int:
+        return self._apply_account(client.get_account_info(self.address, commitment=Processed).value)
+
+    async def async_refresh(self) -> int:
+        return self._apply_account((await async_client.get_account_info(self.address, commitment=Processed)).value)
+
+    def is_open(self) -> bool:
+        if self.opened is None:
+            self.refresh()
+        return self.opened
+
+    def reserve(self, max_amount_in: int) -> int:
+        if self.balance is None:
+            self.refresh()
+        return self._reserve(max_amount_in)
+
+    async def async_reserve(self, max_amount_in: int) -> int:
+        if self.balance is None:
+            await self.async_refresh()
+        return self._reserve(max_amount_in)
+
+    def _reserve(self, max_amount_in: int) -> int:
+        # Debit the maximum input up front so concurrent buys never count the same lamports twice.
+        with self._lock:
+            # Reset by a settle since the caller refreshed it: count it as empty, which only over-funds.
+            balance = self.balance or 0
+            top_up = max(0, max_amount_in - balance)
+            self.balance = balance + top_up - max_amount_in
+            self.in_flight += 1
+            return top_up
+
+    def settle(self, confirmed: Optional[bool], refund: int = 0, credit: int = 0, reserved: bool = False) -> None:
+        with self._lock:
+            if reserved:
+                self.in_flight -= 1
+            if confirmed is None:
+                # Keep this transaction's debit; the chain is only reread once no other reservation is in flight.
+                self.stale = True
+            elif self.balance is None:
+                self.opened = self.opened or confirmed
+            elif confirmed:
+                self.opened = True
+                self.balance += credit
+            else:
+                self.balance += refund
+            if self.stale and not self.in_flight:
+                self.opened, self.balance, self.stale = None, None, False
+
+    def settle_unwrap(self, confirmed: Optional[bool]) -> None:
+        with self._lock:
+            if confirmed:
+                self.opened, self.balance = False, 0
+            elif confirmed is None and self.in_flight:
+                self.stale = True
+            elif confirmed is None:
+                self.opened, self.balance = None, None
+
+wsol_account = WsolAccount()
+wsol_accounts: Dict[Pubkey, WsolAccount] = {payer_keypair.pubkey(): wsol_account}
+
+def get_wsol_account(payer: Keypair = payer_keypair) -> WsolAccount:
+    account = wsol_accounts.get(payer.pubkey())
+    if account is None:
+        account = wsol_accounts[payer.pubkey()] = WsolAccount(payer)
+    return account